@@ -0,0 +1,30 @@
+import asyncio
+
+from batch_analysis import SKILL_METHODS, plan_requests, prepare
+from result_cache import store_results
+
+
+async def run_skill_async(ai_client, skill, batch, semaphore):
+    # The semaphore bounds how many requests are in flight at the same time
+    async with semaphore:
+        method = getattr(ai_client, SKILL_METHODS[skill])
+        return skill, await method(documents=batch)
+
+
+async def analyze_documents_async(ai_client, documents, skills=None, max_concurrency=4,
+                                  cache=None, model_version='latest'):
+    # Same contract as batch_analysis.analyze_documents, but uses the aio client.
+    # Requests complete in any order; results are keyed by document id so callers
+    # can print them in a stable order afterwards.
+    results, pending = prepare(documents, skills, cache, model_version)
+    semaphore = asyncio.Semaphore(max_concurrency)
+    tasks = [asyncio.create_task(run_skill_async(ai_client, skill, batch, semaphore))
+             for skill, batch in plan_requests(pending)]
+
+    for finished in asyncio.as_completed(tasks):
+        skill, batch_results = await finished
+        for result in batch_results:
+            results[result.id][skill] = result
+        store_results(cache, documents, skill, model_version, batch_results)
+
+    return results
@@ -0,0 +1,76 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from result_cache import split_cached, store_results
+
+# Maximum number of documents the Language service accepts in one request for each skill
+SKILL_BATCH_LIMITS = {
+    'language': 1000,
+    'sentiment': 10,
+    'key_phrases': 10,
+    'entities': 5,
+    'linked_entities': 5,
+}
+
+# TextAnalyticsClient method used for each skill
+SKILL_METHODS = {
+    'language': 'detect_language',
+    'sentiment': 'analyze_sentiment',
+    'key_phrases': 'extract_key_phrases',
+    'entities': 'recognize_entities',
+    'linked_entities': 'recognize_linked_entities',
+}
+
+
+def make_batches(documents, batch_size):
+    # Split a list of documents into consecutive batches of at most batch_size
+    for start in range(0, len(documents), batch_size):
+        yield documents[start:start + batch_size]
+
+
+def plan_requests(pending):
+    # Build the (skill, batch) pairs needed to run each skill over its pending documents.
+    # pending maps a skill to {doc_id: text}
+    requests = []
+    for skill, documents in pending.items():
+        inputs = [{'id': doc_id, 'text': text} for doc_id, text in documents.items()]
+        requests.extend((skill, batch) for batch in make_batches(inputs, SKILL_BATCH_LIMITS[skill]))
+    return requests
+
+
+def prepare(documents, skills=None, cache=None, model_version='latest'):
+    # Fill results from the cache and work out which documents still need each skill
+    results = {doc_id: {} for doc_id in documents}
+    pending = {}
+    for skill in skills or list(SKILL_BATCH_LIMITS):
+        found, missing = split_cached(cache, documents, skill, model_version)
+        for doc_id, result in found.items():
+            results[doc_id][skill] = result
+        if missing:
+            pending[skill] = missing
+    return results, pending
+
+
+def run_skill(ai_client, skill, batch):
+    method = getattr(ai_client, SKILL_METHODS[skill])
+    return skill, method(documents=batch)
+
+
+def analyze_documents(ai_client, documents, skills=None, max_workers=5, cache=None, model_version='latest'):
+    # documents maps a document id (the file name) to its text. Every skill runs over
+    # service-sized batches of documents, and the batches are sent concurrently.
+    # Documents found in the cache are not sent again.
+    # Results are mapped back by document id: {doc_id: {skill: result}}
+    results, pending = prepare(documents, skills, cache, model_version)
+    requests = plan_requests(pending)
+    if not requests:
+        return results
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(run_skill, ai_client, skill, batch) for skill, batch in requests]
+        for future in futures:
+            skill, batch_results = future.result()
+            for result in batch_results:
+                results[result.id][skill] = result
+            store_results(cache, documents, skill, model_version, batch_results)
+
+    return results
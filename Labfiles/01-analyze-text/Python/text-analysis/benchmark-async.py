@@ -0,0 +1,44 @@
+import argparse
+import asyncio
+import time
+
+from async_analysis import analyze_documents_async
+from fakes import FakeAsyncTextAnalyticsClient
+
+# Measures how the async review pipeline scales with the number of in-flight requests,
+# using a fake client that waits a fixed latency for every request
+
+
+async def run_once(documents, concurrency, latency):
+    client = FakeAsyncTextAnalyticsClient(latency=latency)
+    start = time.perf_counter()
+    async with client:
+        await analyze_documents_async(client, documents, max_concurrency=concurrency)
+    return client, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the async text analysis pipeline')
+    parser.add_argument('--files', type=int, default=200, help='number of synthetic reviews')
+    parser.add_argument('--latency', type=float, default=0.05, help='seconds per fake request')
+    parser.add_argument('--max-concurrency', type=int, default=32)
+    args = parser.parse_args()
+
+    documents = {'review{}.txt'.format(i): 'Good hotel, friendly staff, review number {}'.format(i)
+                 for i in range(args.files)}
+
+    print('{:>11} {:>9} {:>10} {:>11} {:>10} {:>8}'.format(
+        'concurrency', 'requests', 'seconds', 'requests/s', 'files/s', 'speedup'))
+    baseline = None
+    concurrency = 1
+    while concurrency <= args.max_concurrency:
+        client, elapsed = asyncio.run(run_once(documents, concurrency, args.latency))
+        baseline = baseline or elapsed
+        print('{:>11} {:>9} {:>10.3f} {:>11.1f} {:>10.1f} {:>7.1f}x'.format(
+            client.max_in_flight, client.total_calls(), elapsed,
+            client.total_calls() / elapsed, args.files / elapsed, baseline / elapsed))
+        concurrency *= 2
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+import asyncio
+from collections import Counter
+from types import SimpleNamespace
+
+# Local stand-ins for the TextAnalyticsClient, so the analysis code can be run and
+# measured without an Azure AI Language resource
+
+
+def fake_result(skill, doc_id, text):
+    result = SimpleNamespace(id=doc_id, is_error=False, error=None)
+    words = text.split()
+    if skill == 'language':
+        result.primary_language = SimpleNamespace(name='English', iso6391_name='en', confidence_score=1.0)
+    elif skill == 'sentiment':
+        result.sentiment = 'positive' if 'good' in text.lower() else 'neutral'
+    elif skill == 'key_phrases':
+        result.key_phrases = words[:3]
+    elif skill == 'entities':
+        result.entities = [SimpleNamespace(text=word, category='Skill') for word in words[:2]]
+    elif skill == 'linked_entities':
+        result.entities = [SimpleNamespace(name=word, url='https://example.com/' + word) for word in words[:1]]
+    return result
+
+
+class FakeTextAnalyticsClient:
+    # Counts calls and documents per method so batching can be checked
+
+    def __init__(self):
+        self.calls = Counter()
+        self.documents = Counter()
+
+    def _analyze(self, skill, method, documents):
+        self.calls[method] += 1
+        self.documents[method] += len(documents)
+        return [fake_result(skill, doc['id'], doc['text']) for doc in documents]
+
+    def detect_language(self, documents, **kwargs):
+        return self._analyze('language', 'detect_language', documents)
+
+    def analyze_sentiment(self, documents, **kwargs):
+        return self._analyze('sentiment', 'analyze_sentiment', documents)
+
+    def extract_key_phrases(self, documents, **kwargs):
+        return self._analyze('key_phrases', 'extract_key_phrases', documents)
+
+    def recognize_entities(self, documents, **kwargs):
+        return self._analyze('entities', 'recognize_entities', documents)
+
+    def recognize_linked_entities(self, documents, **kwargs):
+        return self._analyze('linked_entities', 'recognize_linked_entities', documents)
+
+    def total_calls(self):
+        return sum(self.calls.values())
+
+
+class FakeAsyncTextAnalyticsClient(FakeTextAnalyticsClient):
+    # Async version that waits a fixed latency per request to simulate the network round trip
+
+    def __init__(self, latency=0.05):
+        super().__init__()
+        self.latency = latency
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def _analyze_async(self, skill, method, documents):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.latency)
+            return self._analyze(skill, method, documents)
+        finally:
+            self.in_flight -= 1
+
+    async def detect_language(self, documents, **kwargs):
+        return await self._analyze_async('language', 'detect_language', documents)
+
+    async def analyze_sentiment(self, documents, **kwargs):
+        return await self._analyze_async('sentiment', 'analyze_sentiment', documents)
+
+    async def extract_key_phrases(self, documents, **kwargs):
+        return await self._analyze_async('key_phrases', 'extract_key_phrases', documents)
+
+    async def recognize_entities(self, documents, **kwargs):
+        return await self._analyze_async('entities', 'recognize_entities', documents)
+
+    async def recognize_linked_entities(self, documents, **kwargs):
+        return await self._analyze_async('linked_entities', 'recognize_linked_entities', documents)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        pass
@@ -1,11 +1,36 @@
 from dotenv import load_dotenv
+import argparse
+import asyncio
 import os
 
 # Import namespaces
 from azure.core.credentials import AzureKeyCredential
 from azure.ai.textanalytics import TextAnalyticsClient
+from azure.ai.textanalytics.aio import TextAnalyticsClient as AsyncTextAnalyticsClient
+
+from async_analysis import analyze_documents_async
+from batch_analysis import analyze_documents
+from document_loader import load_batches
+from result_cache import API_VERSION, ResultCache
 
 def main():
+    parser = argparse.ArgumentParser(description='Analyze the reviews with Azure AI Language')
+    parser.add_argument('--async', dest='use_async', action='store_true',
+                        help='send requests concurrently with the asyncio client')
+    parser.add_argument('--concurrency', type=int, default=4,
+                        help='maximum number of requests in flight in async mode')
+    parser.add_argument('--cache', default='language-cache.sqlite',
+                        help='result cache file (reviews that have not changed are not sent again)')
+    parser.add_argument('--cache-ttl', type=float, default=None,
+                        help='seconds before a cached result expires')
+    parser.add_argument('--no-cache', action='store_true', help='always call the service')
+    parser.add_argument('--folder', default='reviews', help='folder of text files to analyze')
+    parser.add_argument('--pattern', default='*.txt', help='glob filter for file names')
+    parser.add_argument('--recursive', action='store_true', help='include subfolders')
+    parser.add_argument('--batch-size', type=int, default=100,
+                        help='number of files read and analyzed at a time')
+    args = parser.parse_args()
+
     # Se limina el contenido de la consol previa
     os.system('cls' if os.name == 'nt' else 'clear')
 
@@ -14,43 +39,79 @@ def main():
     ai_endpoint = os.getenv('AI_SERVICE_ENDPOINT')
     ai_key = os.getenv('AI_SERVICE_KEY')
 
+    # Stream the text files in the reviews folder a batch at a time
+    batches = load_batches(args.folder, max_documents=args.batch_size, pattern=args.pattern,
+                           recursive=args.recursive)
+
     # Create client using endpoint and key
     credential = AzureKeyCredential(ai_key)
-    ai_client = TextAnalyticsClient(endpoint=ai_endpoint, credential=credential)
-
-    # Analyze each text file in the reviews folder
-    reviews_folder = 'reviews'
-    for file_name in os.listdir(reviews_folder):
-        # Read the file contents
-        print('\n-------------\n' + file_name)
-        text = open(os.path.join(reviews_folder, file_name), encoding='utf8').read()
-        print('\n' + text)
-
-        # Get language
-        detected_language = ai_client.detect_language(documents=[text])[0]
+    cache = None if args.no_cache else ResultCache(args.cache, ttl=args.cache_ttl)
+
+    # Analyze the reviews in service-sized batches, running every skill together
+    if args.use_async:
+        asyncio.run(analyze_reviews_async(ai_endpoint, credential, batches, args.concurrency, cache))
+    else:
+        ai_client = TextAnalyticsClient(endpoint=ai_endpoint, credential=credential, api_version=API_VERSION)
+        for documents in batches:
+            print_batch(documents, analyze_documents(ai_client, documents, cache=cache))
+
+    if cache:
+        print('\nCache: {hits} hits, {misses} misses, {entries} entries ({bytes} bytes)'.format(**cache.stats()))
+        cache.close()
+
+
+async def analyze_reviews_async(ai_endpoint, credential, batches, concurrency, cache=None):
+    ai_client = AsyncTextAnalyticsClient(endpoint=ai_endpoint, credential=credential, api_version=API_VERSION)
+    async with ai_client:
+        for documents in batches:
+            results = await analyze_documents_async(ai_client, documents, max_concurrency=concurrency, cache=cache)
+            print_batch(documents, results)
+
+
+def print_batch(documents, results):
+    # Requests may finish in any order, but results are printed in the order the files were read
+    for file_name, text in documents.items():
+        print_results(file_name, text, results[file_name])
+
+
+def print_results(file_name, text, result):
+    print('\n-------------\n' + file_name)
+    print('\n' + text)
+
+    # Show any per-document errors returned by the service
+    for skill, skill_result in result.items():
+        if skill_result.is_error:
+            print('\n{} error: {}'.format(skill, skill_result.error.message))
+
+    # Get language
+    detected_language = result['language']
+    if not detected_language.is_error:
         print('\nLanguage: ' + detected_language.primary_language.name + ' (' + detected_language.primary_language.iso6391_name + ')')
 
-        # Get sentiment
-        sentiment = ai_client.analyze_sentiment(documents=[text])[0]
+    # Get sentiment
+    sentiment = result['sentiment']
+    if not sentiment.is_error:
         print('\nSentiment: ' + sentiment.sentiment)
 
-        # Get key phrases
-        key_phrases = ai_client.extract_key_phrases(documents=[text])[0].key_phrases
+    # Get key phrases
+    if not result['key_phrases'].is_error:
+        key_phrases = result['key_phrases'].key_phrases
         if len(key_phrases) > 0:
             print("\nKey Phrases:")
             for phrase in key_phrases:
                 print('\t{}'.format(phrase))
 
-        # Get entities
-        entities = ai_client.recognize_entities(documents=[text])[0].entities
+    # Get entities
+    if not result['entities'].is_error:
+        entities = result['entities'].entities
         if len(entities) > 0:
             print("\nEntities:")
             for entity in entities:
                 print('\t{}: {}'.format(entity.text, entity.category))
 
-
-        # Get linked entities
-        entities = ai_client.recognize_linked_entities(documents=[text])[0].entities
+    # Get linked entities
+    if not result['linked_entities'].is_error:
+        entities = result['linked_entities'].entities
         if len(entities) > 0:
             print("\nLinks")
             for linked_entity in entities:
@@ -0,0 +1,194 @@
+import csv
+import json
+import math
+import re
+import time
+
+import numpy as np
+
+# Local answer layer for the question answering app. Questions already answered by the
+# service (and question/answer pairs exported from the knowledge base) are kept in:
+# - an exact cache keyed by the normalized question (case, punctuation and spacing
+#   removed), and
+# - a TF-IDF index: each question is a sparse vector of log-scaled term frequencies
+#   times inverse document frequencies, normalized to unit length. The index is stored
+#   as NumPy arrays of postings (term -> question ids and weights), so scoring a query
+#   touches only the questions that share a term with it.
+# A question whose best cosine similarity reaches `threshold` is answered locally;
+# anything else goes to the service.
+# New questions are found by the exact cache straight away; the index is rebuilt once
+# enough of them have accumulated (a tenth of the index, at least `rebuild_after`), so
+# learning answers one at a time doesn't rebuild it on every question.
+# Only answers learned from the service are saved by save_jsonl; pairs from the knowledge
+# base export aren't, so an updated export always replaces them.
+
+NON_WORD = re.compile(r"[^\w\s]+")
+STOP_WORDS = {'a', 'an', 'the', 'is', 'are', 'do', 'does', 'i', 'you', 'to', 'of', 'in', 'on', 'for', 'can', 'my',
+              'me', 'it', 'what', 'how', 'please'}
+
+
+def normalize(question):
+    return ' '.join(NON_WORD.sub(' ', question.lower()).split())
+
+
+def terms(question):
+    words = normalize(question).split()
+    kept = [word for word in words if word not in STOP_WORDS]
+    return kept or words
+
+
+class AnswerIndex:
+
+    def __init__(self, threshold=0.8, rebuild_after=16):
+        self.threshold = threshold
+        self.rebuild_after = rebuild_after
+        self.questions = []      # normalized questions, by id
+        self.answers = []        # {'answer', 'confidence', 'source'}, by id
+        self.learned = set()     # ids of answers learned from the service
+        self.exact = {}          # normalized question -> id
+        self.indexed = 0         # questions covered by the postings
+        self.vocabulary = {}
+        self.idf = np.zeros(0)
+        self.postings = {}       # term id -> (question ids, weights)
+        self.exact_hits = 0
+        self.index_hits = 0
+        self.misses = 0
+        self.local_seconds = 0.0
+        self.remote_seconds = 0.0
+        self.remote_calls = 0
+
+    def add(self, question, answer, confidence=1.0, source=None, learned=False):
+        key = normalize(question)
+        if not key:
+            return
+        entry = {'answer': answer, 'confidence': confidence, 'source': source}
+        question_id = self.exact.get(key)
+        if question_id is None:
+            question_id = self.exact[key] = len(self.questions)
+            self.questions.append(key)
+            self.answers.append(entry)
+        else:
+            self.answers[question_id] = entry
+        if learned:
+            self.learned.add(question_id)
+        else:
+            self.learned.discard(question_id)
+
+    def build(self):
+        # Rebuild the postings over every question added so far
+        vocabulary = {}
+        rows = []
+        for question in self.questions:
+            counts = {}
+            for term in terms(question):
+                term_id = vocabulary.setdefault(term, len(vocabulary))
+                counts[term_id] = counts.get(term_id, 0) + 1
+            rows.append(counts)
+
+        document_frequency = np.zeros(len(vocabulary))
+        for counts in rows:
+            document_frequency[list(counts)] += 1
+        count = len(rows)
+        idf = np.log((count + 1) / (document_frequency + 1)) + 1
+
+        postings = {}
+        for question_id, counts in enumerate(rows):
+            term_ids = np.fromiter(counts, dtype=np.int64, count=len(counts))
+            weights = (1 + np.log(np.fromiter(counts.values(), dtype=np.float64, count=len(counts)))) * idf[term_ids]
+            weights /= np.linalg.norm(weights) or 1.0
+            for term_id, weight in zip(term_ids.tolist(), weights.tolist()):
+                postings.setdefault(term_id, ([], []))
+                postings[term_id][0].append(question_id)
+                postings[term_id][1].append(weight)
+
+        self.vocabulary = vocabulary
+        self.idf = idf
+        self.postings = {term_id: (np.array(ids, dtype=np.int64), np.array(weights))
+                         for term_id, (ids, weights) in postings.items()}
+        self.indexed = count
+
+    def search(self, question):
+        # (question id, cosine similarity) of the closest known question, or None
+        pending = len(self.questions) - self.indexed
+        if pending and (not self.indexed or pending >= max(self.rebuild_after, self.indexed // 10)):
+            self.build()
+        counts = {}
+        for term in terms(question):
+            term_id = self.vocabulary.get(term)
+            if term_id is not None:
+                counts[term_id] = counts.get(term_id, 0) + 1
+        if not counts:
+            return None
+
+        query_ids = list(counts)
+        query = (1 + np.log(np.array(list(counts.values()), dtype=np.float64))) * self.idf[query_ids]
+        # Terms the index hasn't seen still count towards the query's length
+        unknown = len(terms(question)) - sum(counts.values())
+        norm = math.sqrt(float(query @ query) + unknown * float(self.idf.max()) ** 2)
+        scores = np.zeros(self.indexed)
+        for term_id, weight in zip(query_ids, query / norm):
+            ids, weights = self.postings[term_id]
+            scores[ids] += weight * weights
+        best = int(scores.argmax())
+        return best, float(scores[best])
+
+    def lookup(self, question):
+        # {'answer', 'confidence', 'source', 'match', 'similarity'} answered locally, or None
+        start = time.perf_counter()
+        found = None
+        question_id = self.exact.get(normalize(question))
+        if question_id is not None:
+            found = dict(self.answers[question_id], match='exact', similarity=1.0)
+            self.exact_hits += 1
+        elif self.questions:
+            best = self.search(question)
+            if best and best[1] >= self.threshold:
+                found = dict(self.answers[best[0]], match='index', similarity=best[1])
+                self.index_hits += 1
+        if found is None:
+            self.misses += 1
+        self.local_seconds += time.perf_counter() - start
+        return found
+
+    def record_remote(self, seconds):
+        self.remote_calls += 1
+        self.remote_seconds += seconds
+
+    def load(self, path):
+        # Question/answer pairs from a knowledge base export (.tsv with Question, Answer and
+        # Source columns) or learned answers from save_jsonl. Returns the number of pairs read.
+        # A pair replaces any loaded before it with the same question.
+        count = 0
+        with open(path, encoding='utf8', newline='') as in_file:
+            if path.lower().endswith('.tsv'):
+                for row in csv.DictReader(in_file, delimiter='\t'):
+                    if row.get('Question') and row.get('Answer'):
+                        self.add(row['Question'], row['Answer'], 1.0, row.get('Source'))
+                        count += 1
+            else:
+                for line in in_file:
+                    if line.strip():
+                        pair = json.loads(line)
+                        self.add(pair['question'], pair['answer'], pair.get('confidence', 1.0), pair.get('source'),
+                                 learned=True)
+                        count += 1
+        return count
+
+    def save_jsonl(self, path):
+        with open(path, 'w', encoding='utf8') as out_file:
+            for question_id in sorted(self.learned):
+                question, entry = self.questions[question_id], self.answers[question_id]
+                out_file.write(json.dumps(dict(question=question, **entry), ensure_ascii=False) + '\n')
+
+    def metrics(self):
+        local = self.exact_hits + self.index_hits
+        lookups = local + self.misses
+        return {
+            'questions': len(self.questions),
+            'exact_hits': self.exact_hits,
+            'index_hits': self.index_hits,
+            'misses': self.misses,
+            'hit_rate': local / lookups if lookups else 0.0,
+            'lookup_mean_us': self.local_seconds / lookups * 1e6 if lookups else 0.0,
+            'remote_mean_ms': self.remote_seconds / self.remote_calls * 1000 if self.remote_calls else 0.0,
+        }
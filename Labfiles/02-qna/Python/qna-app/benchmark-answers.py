@@ -0,0 +1,93 @@
+import argparse
+import random
+import time
+
+from answer_index import AnswerIndex
+
+# Replays a stream of user questions (repeats, rephrasings and new questions about a
+# generated FAQ) through the local answer layer, with a fake service that takes
+# --service-ms per question and learns every service answer, and reports the hit rate
+# and the latency of local versus service answers
+
+VERBS = ['create', 'delete', 'rename', 'share', 'export', 'restore', 'archive', 'move']
+NOUNS = ['collection', 'learning path', 'profile', 'certification', 'badge', 'transcript', 'module', 'challenge']
+
+
+def make_faq():
+    return {'How do I {} a {}?'.format(verb, noun): 'To {} a {}, open settings and choose {}.'.format(verb, noun, verb)
+            for verb in VERBS for noun in NOUNS}
+
+
+def rephrase(question, rng):
+    words = question.rstrip('?').split()
+    style = rng.randrange(4)
+    if style == 0:
+        return question.upper()
+    if style == 1:
+        return 'Please, ' + question.lower().rstrip('?') + '??'
+    if style == 2:
+        return ' '.join(words[:2] + ['actually'] + words[2:]) + '?'
+    return 'Can you tell me how to {}'.format(' '.join(words[3:]))
+
+
+def make_stream(faq, count, seed=1):
+    rng = random.Random(seed)
+    questions = list(faq)
+    stream = []
+    for _ in range(count):
+        roll = rng.random()
+        question = rng.choice(questions[:len(questions) // 2])  # users ask about a subset
+        if roll < 0.4:
+            stream.append(question)
+        elif roll < 0.8:
+            stream.append(rephrase(question, rng))
+        else:
+            stream.append('Where can I find {} number {}?'.format(rng.choice(NOUNS), rng.randrange(1000)))
+    return stream
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the local answer layer')
+    parser.add_argument('--questions', type=int, default=2000)
+    parser.add_argument('--service-ms', type=float, default=5)
+    parser.add_argument('--threshold', type=float, default=0.8)
+    parser.add_argument('--preload', action='store_true', help='load the whole FAQ up front (a KB export)')
+    args = parser.parse_args()
+
+    faq = make_faq()
+    stream = make_stream(faq, args.questions)
+    index = AnswerIndex(threshold=args.threshold)
+    if args.preload:
+        for question, answer in faq.items():
+            index.add(question, answer, 1.0, 'faq')
+
+    wrong = 0
+    start = time.perf_counter()
+    for question in stream:
+        local = index.lookup(question)
+        if local:
+            # Check the local answer against the question it rephrases
+            expected = [answer for known, answer in faq.items()
+                        if ' '.join(known.lower().rstrip('?').split()[3:]) in question.lower()]
+            wrong += bool(expected) and local['answer'] not in expected
+            continue
+        service_start = time.perf_counter()
+        time.sleep(args.service_ms / 1000)
+        answer = next((answer for known, answer in faq.items()
+                       if ' '.join(known.lower().rstrip('?').split()[3:]) in question.lower()), None)
+        index.record_remote(time.perf_counter() - service_start)
+        if answer:
+            index.add(question, answer, 0.9, 'faq')
+    elapsed = time.perf_counter() - start
+
+    metrics = index.metrics()
+    print('{} questions, {} known after the run'.format(args.questions, metrics['questions']))
+    print('  hit rate {:.1%} ({} exact, {} index, {} service), {} wrong local answers'.format(
+        metrics['hit_rate'], metrics['exact_hits'], metrics['index_hits'], metrics['misses'], wrong))
+    print('  local lookup {:.1f} us, service {:.1f} ms'.format(metrics['lookup_mean_us'], metrics['remote_mean_ms']))
+    print('  total {:.2f} s vs {:.2f} s sending every question'.format(
+        elapsed, args.questions * metrics['remote_mean_ms'] / 1000))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+
+from azure.core.credentials import AzureKeyCredential
+from azure.ai.language.questionanswering.aio import QuestionAnsweringClient
+
+from bulk_answers import answer_all, write_jsonl
+from latency_stats import summarize
+from stand_in_server import StandInServer
+
+# Load test of the bulk runner against a local question answering stand-in: questions
+# per second and tail latency at several concurrency levels, and the response bytes
+# saved by sending top/confidence_threshold instead of filtering candidates locally
+
+
+async def run(endpoint, questions, concurrency, top, threshold, output):
+    async with QuestionAnsweringClient(endpoint=endpoint, credential=AzureKeyCredential('key')) as ai_client:
+        start = time.perf_counter()
+        latencies = await write_jsonl(
+            answer_all(ai_client, questions, 'LearnFAQ', 'production',
+                       top=top, confidence_threshold=threshold, concurrency=concurrency),
+            output)
+        return latencies, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Load test the bulk question answering runner')
+    parser.add_argument('--questions', type=int, default=400)
+    parser.add_argument('--service-ms', type=float, default=40)
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 8, 32])
+    args = parser.parse_args()
+
+    questions = [(i + 1, 'What is Microsoft Learn? ({})'.format(i)) for i in range(args.questions)]
+    server = StandInServer(request_delay=args.service_ms / 1000).start()
+    with tempfile.TemporaryDirectory() as folder:
+        output = os.path.join(folder, 'answers.jsonl')
+        print('{:>12} {:>8} {:>8} {:>8} {:>8} {:>10}'.format('concurrency', 'qps', 'p50 ms', 'p95 ms', 'p99 ms',
+                                                             'bytes/q'))
+        for concurrency in args.concurrency:
+            for top, threshold in ((None, None), (1, 0.5)):
+                before = server.bytes_sent
+                latencies, elapsed = asyncio.run(run(server.endpoint, questions, concurrency, top, threshold, output))
+                stats = summarize(latencies)
+                label = '{}{}'.format(concurrency, '' if top else ' (all)')
+                print('{:>12} {:>8.1f} {:>8.0f} {:>8.0f} {:>8.0f} {:>10.0f}'.format(
+                    label, len(latencies) / elapsed, stats['p50'], stats['p95'], stats['p99'],
+                    (server.bytes_sent - before) / len(latencies)))
+    server.stop()
+
+
+if __name__ == "__main__":
+    main()
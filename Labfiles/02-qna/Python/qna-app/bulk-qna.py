@@ -0,0 +1,53 @@
+import argparse
+import asyncio
+import os
+import time
+
+from dotenv import load_dotenv
+from azure.core.credentials import AzureKeyCredential
+from azure.ai.language.questionanswering.aio import QuestionAnsweringClient
+
+from bulk_answers import load_questions, answer_all, write_jsonl
+from latency_stats import summarize
+
+
+async def run(args):
+    # Get Configuration Settings
+    load_dotenv()
+    ai_endpoint = os.getenv('AI_SERVICE_ENDPOINT')
+    ai_key = os.getenv('AI_SERVICE_KEY')
+    ai_project_name = os.getenv('QA_PROJECT_NAME')
+    ai_deployment_name = os.getenv('QA_DEPLOYMENT_NAME')
+
+    questions = load_questions(args.questions)
+    async with QuestionAnsweringClient(endpoint=ai_endpoint, credential=AzureKeyCredential(ai_key)) as ai_client:
+        start = time.perf_counter()
+        latencies = await write_jsonl(
+            answer_all(ai_client, questions, ai_project_name, ai_deployment_name,
+                       top=args.top, confidence_threshold=args.threshold, concurrency=args.concurrency),
+            args.output)
+        elapsed = time.perf_counter() - start
+
+    stats = summarize(latencies)
+    print('{} questions answered to {} in {:.1f} s ({:.1f} questions/s)'.format(
+        len(latencies), args.output, elapsed, len(latencies) / elapsed if elapsed else 0.0))
+    print('Latency ms: mean {mean:.0f}, p50 {p50:.0f}, p95 {p95:.0f}, p99 {p99:.0f}'.format(**stats))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Answer a file of questions')
+    parser.add_argument('questions', help='text file (one question per line), .jsonl or .csv')
+    parser.add_argument('--output', default='answers-bulk.jsonl')
+    parser.add_argument('--concurrency', type=int, default=8, help='requests in flight at once')
+    parser.add_argument('--top', type=int, default=1, help='answers returned per question')
+    parser.add_argument('--threshold', type=float, default=0.5, help='minimum answer confidence')
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(run(args))
+    except Exception as ex:
+        print(ex)
+
+
+if __name__ == "__main__":
+    main()
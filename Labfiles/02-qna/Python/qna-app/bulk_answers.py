@@ -0,0 +1,79 @@
+import asyncio
+import csv
+import json
+import time
+
+# Answers a file of questions with the async QuestionAnsweringClient. At most
+# `concurrency` requests are in flight at once; `top` and `confidence_threshold` are sent
+# with each request, so the service drops low-confidence candidates instead of returning
+# them to be thrown away. Results are yielded as they complete.
+
+
+def load_questions(path):
+    # [(id, question)] from a text file (one question per line), a JSONL file with
+    # "question" (and optional "id") fields, or a CSV file with a "question" column
+    questions = []
+    with open(path, encoding='utf8', newline='') as in_file:
+        if path.lower().endswith('.jsonl'):
+            for line in in_file:
+                if line.strip():
+                    item = json.loads(line)
+                    questions.append((item.get('id', len(questions) + 1), item['question']))
+        elif path.lower().endswith('.csv'):
+            for row in csv.DictReader(in_file):
+                questions.append((row.get('id') or len(questions) + 1, row['question']))
+        else:
+            for line in in_file:
+                if line.strip():
+                    questions.append((len(questions) + 1, line.strip()))
+    return questions
+
+
+async def answer_question(ai_client, semaphore, question_id, question, project_name, deployment_name,
+                          top, confidence_threshold):
+    async with semaphore:
+        start = time.perf_counter()
+        try:
+            response = await ai_client.get_answers(question=question,
+                                                   project_name=project_name,
+                                                   deployment_name=deployment_name,
+                                                   top=top,
+                                                   confidence_threshold=confidence_threshold)
+            answers = [{'answer': candidate.answer,
+                        'confidence': candidate.confidence,
+                        'source': candidate.source} for candidate in response.answers]
+            error = None
+        except Exception as ex:
+            answers = []
+            error = str(ex)
+        return {
+            'id': question_id,
+            'question': question,
+            'answers': answers,
+            'latency_ms': (time.perf_counter() - start) * 1000,
+            'error': error,
+        }
+
+
+async def answer_all(ai_client, questions, project_name, deployment_name, top=1, confidence_threshold=0.5,
+                     concurrency=8):
+    semaphore = asyncio.Semaphore(concurrency)
+    tasks = [asyncio.ensure_future(answer_question(ai_client, semaphore, question_id, question, project_name,
+                                                   deployment_name, top, confidence_threshold))
+             for question_id, question in questions]
+    try:
+        for task in asyncio.as_completed(tasks):
+            yield await task
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+async def write_jsonl(results, output):
+    # Writes each result as it arrives and returns the results' latencies
+    latencies = []
+    with open(output, 'w', encoding='utf8') as out_file:
+        async for result in results:
+            out_file.write(json.dumps(result, ensure_ascii=False) + '\n')
+            latencies.append(result['latency_ms'])
+    return latencies
@@ -0,0 +1,22 @@
+import math
+
+# Latency summaries shared by the question answering reports
+
+
+def percentile(values, fraction):
+    # Nearest-rank percentile of a list of numbers
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, math.ceil(fraction * len(ordered)) - 1))
+    return ordered[rank]
+
+
+def summarize(latencies):
+    return {
+        'count': len(latencies),
+        'mean': sum(latencies) / len(latencies) if latencies else 0.0,
+        'p50': percentile(latencies, 0.50),
+        'p95': percentile(latencies, 0.95),
+        'p99': percentile(latencies, 0.99),
+    }
@@ -1,10 +1,20 @@
 from dotenv import load_dotenv
 import os
+import time
 
 # Import namespaces
 from azure.core.credentials import AzureKeyCredential
 from azure.ai.language.questionanswering import QuestionAnsweringClient
 
+from answer_index import AnswerIndex
+
+# Answers the service gave with at least this confidence are kept for local reuse
+LEARN_CONFIDENCE = 0.5
+# Similarity a question needs to a known question to be answered locally
+LOCAL_THRESHOLD = 0.8
+KNOWLEDGE_BASE_EXPORT = 'knowledge-base.tsv'
+LEARNED_ANSWERS = 'answers.jsonl'
+
 def main():
     try:
         # Get Configuration Settings
@@ -18,18 +28,45 @@ def main():
         credential = AzureKeyCredential(ai_key)
         ai_client = QuestionAnsweringClient(endpoint=ai_endpoint, credential=credential)
 
+        # Local answers: answers learned in earlier sessions, then the exported knowledge base
+        # (loaded last, so its current answers replace any stale learned copies)
+        local_answers = AnswerIndex(threshold=LOCAL_THRESHOLD)
+        for path in (LEARNED_ANSWERS, KNOWLEDGE_BASE_EXPORT):
+            if os.path.exists(path):
+                print('Loaded {} answers from {}'.format(local_answers.load(path), path))
+
         # Submit a question and display the answer
         user_question = ''
         while user_question.lower() != 'quit':
             user_question = input('\nQuestion:\n')
+            if user_question.lower() == 'quit':
+                break
+
+            local = local_answers.lookup(user_question)
+            if local:
+                print(local['answer'])
+                print("Similarity: {:.2f} (answered locally, {} match)".format(local['similarity'], local['match']))
+                print("Source: {}".format(local['source']))
+                continue
+
+            start = time.perf_counter()
             response = ai_client.get_answers(question=user_question,
                                             project_name=ai_project_name,
                                             deployment_name=ai_deployment_name)
+            local_answers.record_remote(time.perf_counter() - start)
             for candidate in response.answers:
                 print(candidate.answer)
                 print("Confidence: {}".format(candidate.confidence))
                 print("Source: {}".format(candidate.source))
 
+            # Remember a confident answer (the service's "no answer" has no source)
+            best = max(response.answers, key=lambda candidate: candidate.confidence, default=None)
+            if best and best.confidence >= LEARN_CONFIDENCE and best.source:
+                local_answers.add(user_question, best.answer, best.confidence, best.source, learned=True)
+
+        local_answers.save_jsonl(LEARNED_ANSWERS)
+        print(local_answers.metrics())
+
 
     except Exception as ex:
         print(ex)
@@ -0,0 +1,89 @@
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse
+
+# A local HTTP stand-in for the question answering (query-knowledgebases) endpoint, used
+# to load test the bulk runner without an Azure resource. Every question gets
+# `candidates` answers with falling confidence; like the service, `top` and
+# `confidenceScoreThreshold` in the request limit what is returned.
+# request_delay is the mean service time, with +/- jitter (a fraction of it).
+
+ANSWER = ('Microsoft Learn is a free, online training platform that provides interactive learning '
+          'for Microsoft products and more. ')
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+
+    def setup(self):
+        super().setup()
+        with self.server.lock:
+            self.server.connections += 1
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        request = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))))
+        delay = self.server.request_delay * (1 + self.server.jitter * (2 * random.random() - 1))
+        time.sleep(max(0.0, delay))
+
+        if not url.path.endswith(':query-knowledgebases'):
+            self.send_error(404)
+            return
+        answers = []
+        for rank in range(self.server.candidates):
+            confidence = round(0.95 / (rank + 1), 4)
+            if confidence < request.get('confidenceScoreThreshold', 0):
+                break
+            answers.append({
+                'questions': [request['question']],
+                'answer': ANSWER * (rank + 1),
+                'confidenceScore': confidence,
+                'id': rank + 1,
+                'source': 'faq-{}.md'.format(rank + 1),
+                'metadata': {},
+            })
+        answers = answers[:request.get('top') or len(answers)]
+
+        payload = json.dumps({'answers': answers}).encode('utf8')
+        with self.server.lock:
+            self.server.requests += 1
+            self.server.bytes_sent += len(payload)
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+class StandInServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 128
+
+    def __init__(self, request_delay=0.0, jitter=0.5, candidates=5, port=0):
+        super().__init__(('127.0.0.1', port), StandInHandler)
+        self.request_delay = request_delay
+        self.jitter = jitter
+        self.candidates = candidates
+        self.lock = threading.Lock()
+        self.connections = 0
+        self.requests = 0
+        self.bytes_sent = 0
+
+    @property
+    def endpoint(self):
+        return 'http://127.0.0.1:{}'.format(self.server_address[1])
+
+    def start(self):
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
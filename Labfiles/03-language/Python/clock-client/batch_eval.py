@@ -0,0 +1,151 @@
+import asyncio
+import csv
+import json
+import time
+from collections import Counter, defaultdict
+
+from conversation_session import build_task
+from latency_stats import summarize
+
+# Offline evaluation of the Clock model: labeled utterances are sent concurrently
+# through the async conversations client (with a rate limit), and the predictions are
+# compared with the expected intents and entities.
+
+
+def load_examples(path):
+    # JSONL: {"text": ..., "intent": ..., "entities": [{"category": ..., "text": ...}]}
+    # CSV: text,intent,entities where entities is "Category=text;Category=text"
+    examples = []
+    with open(path, encoding='utf8', newline='') as examples_file:
+        if path.lower().endswith('.csv'):
+            for row in csv.DictReader(examples_file):
+                entities = []
+                for pair in filter(None, (row.get('entities') or '').split(';')):
+                    category, _, text = pair.partition('=')
+                    entities.append({'category': category.strip(), 'text': text.strip()})
+                examples.append({'text': row['text'], 'intent': row['intent'], 'entities': entities})
+        else:
+            for line in examples_file:
+                if line.strip():
+                    example = json.loads(line)
+                    example.setdefault('entities', [])
+                    examples.append(example)
+    return examples
+
+
+class RateLimiter:
+    # Spaces out request starts to at most `rate` per second (None means unlimited)
+
+    def __init__(self, rate=None):
+        self.interval = 1.0 / rate if rate else 0.0
+        self.next_start = 0.0
+        self.lock = asyncio.Lock()
+
+    async def wait(self):
+        if not self.interval:
+            return
+        async with self.lock:
+            now = time.perf_counter()
+            delay = self.next_start - now
+            self.next_start = max(now, self.next_start) + self.interval
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+def entity_keys(entities):
+    return Counter((entity['category'], entity['text'].strip().lower()) for entity in entities)
+
+
+async def predict(client, template, example, semaphore, limiter):
+    async with semaphore:
+        await limiter.wait()
+        start = time.perf_counter()
+        try:
+            result = await client.analyze_conversation(task=build_task(template, example['text']))
+            prediction = result["result"]["prediction"]
+            intent, entities, error = prediction["topIntent"], prediction["entities"], None
+        except Exception as ex:
+            intent, entities, error = None, [], str(ex)
+        latency = time.perf_counter() - start
+
+    return {
+        'text': example['text'],
+        'expected': example['intent'],
+        'predicted': intent,
+        'expected_entities': example['entities'],
+        'predicted_entities': [{'category': e['category'], 'text': e['text']} for e in entities],
+        'latency': latency,
+        'error': error,
+    }
+
+
+async def evaluate(client, template, examples, concurrency=8, rate=None):
+    semaphore = asyncio.Semaphore(concurrency)
+    limiter = RateLimiter(rate)
+    start = time.perf_counter()
+    outcomes = await asyncio.gather(*(predict(client, template, example, semaphore, limiter)
+                                      for example in examples))
+    return list(outcomes), time.perf_counter() - start
+
+
+def score(outcomes, elapsed):
+    confusion = defaultdict(Counter)
+    entity_hits = entity_expected = entity_predicted = 0
+    for outcome in outcomes:
+        confusion[outcome['expected']][outcome['predicted'] or 'ERROR'] += 1
+        expected = entity_keys(outcome['expected_entities'])
+        predicted = entity_keys(outcome['predicted_entities'])
+        entity_hits += sum((expected & predicted).values())
+        entity_expected += sum(expected.values())
+        entity_predicted += sum(predicted.values())
+
+    labels = sorted(set(confusion) | {label for row in confusion.values() for label in row})
+    per_intent = {}
+    for label in labels:
+        true_positives = confusion[label][label]
+        predicted = sum(row[label] for row in confusion.values())
+        actual = sum(confusion[label].values())
+        per_intent[label] = {
+            'precision': true_positives / predicted if predicted else 0.0,
+            'recall': true_positives / actual if actual else 0.0,
+            'support': actual,
+        }
+
+    latencies = [outcome['latency'] for outcome in outcomes]
+    return {
+        'labels': labels,
+        'confusion': {label: dict(confusion[label]) for label in labels},
+        'per_intent': per_intent,
+        'accuracy': sum(confusion[label][label] for label in labels) / len(outcomes) if outcomes else 0.0,
+        'entity_precision': entity_hits / entity_predicted if entity_predicted else 0.0,
+        'entity_recall': entity_hits / entity_expected if entity_expected else 0.0,
+        'errors': sum(1 for outcome in outcomes if outcome['error']),
+        'elapsed': elapsed,
+        'throughput': len(outcomes) / elapsed if elapsed else 0.0,
+        'latency': summarize(latencies),
+    }
+
+
+def print_report(report):
+    labels = report['labels']
+    width = max([len(label) for label in labels] + [8])
+
+    print('Confusion matrix (rows = expected, columns = predicted)')
+    print(' ' * width + ''.join(' {:>{w}}'.format(label, w=width) for label in labels))
+    for label in labels:
+        row = report['confusion'][label]
+        print('{:<{w}}'.format(label, w=width) + ''.join(' {:>{w}}'.format(row.get(column, 0), w=width)
+                                                       for column in labels))
+
+    print('\n{:<{w}} {:>9} {:>9} {:>9}'.format('intent', 'precision', 'recall', 'support', w=width))
+    for label, metrics in report['per_intent'].items():
+        print('{:<{w}} {:>9.3f} {:>9.3f} {:>9}'.format(
+            label, metrics['precision'], metrics['recall'], metrics['support'], w=width))
+
+    latency = report['latency']
+    print('\naccuracy: {:.3f}'.format(report['accuracy']))
+    print('entities: precision {:.3f}, recall {:.3f}'.format(report['entity_precision'], report['entity_recall']))
+    print('requests: {} in {:.2f}s ({:.1f}/s), {} errors'.format(
+        latency['count'], report['elapsed'], report['throughput'], report['errors']))
+    print('latency: mean {:.1f} ms, p50 {:.1f} ms, p95 {:.1f} ms, p99 {:.1f} ms'.format(
+        latency['mean'] * 1000, latency['p50'] * 1000, latency['p95'] * 1000, latency['p99'] * 1000))
@@ -0,0 +1,71 @@
+import argparse
+import random
+import time
+from datetime import date, timedelta
+
+from date_resolver import get_date, get_day, resolve_dates, resolve_days
+
+# Per-item cost of resolving Date/Weekday entities one at a time (get_day/get_date)
+# against the bulk NumPy API, and a check that both give the same answers
+
+
+def make_workload(rows, seed=1):
+    random.seed(seed)
+    start = date(1900, 1, 1)
+    dates = []
+    for _ in range(rows):
+        roll = random.random()
+        if roll < 0.9:
+            day = start + timedelta(days=random.randrange(200 * 365))
+            dates.append('{}/{}/{}'.format(day.month, day.day, day.year) if roll < 0.3 else day.strftime('%m/%d/%Y'))
+        elif roll < 0.95:
+            dates.append('02/{}/{}'.format(random.randint(28, 31), random.randint(1999, 2025)))
+        else:
+            dates.append(random.choice(['tomorrow', '2025-01-02', '13/01/2025', '']))
+    names = ['Monday', 'tuesday', 'WEDNESDAY', 'thursday', 'Friday', 'saturday', 'sunday', 'today', 'someday']
+    days = [random.choice(names) for _ in range(rows)]
+    return dates, days
+
+
+def per_item(seconds, rows):
+    return seconds / rows * 1e9
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark bulk date resolution')
+    parser.add_argument('--rows', type=int, default=1000000)
+    parser.add_argument('--scalar-rows', type=int, default=100000,
+                        help='rows timed with the scalar functions (they are slow)')
+    args = parser.parse_args()
+
+    dates, days = make_workload(args.rows)
+    today = date.today()
+
+    start = time.perf_counter()
+    bulk_days = resolve_days(dates)
+    bulk_days_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    bulk_dates = resolve_dates(days, today)
+    bulk_dates_seconds = time.perf_counter() - start
+
+    sample = args.scalar_rows
+    start = time.perf_counter()
+    scalar_days = [get_day(value) for value in dates[:sample]]
+    scalar_days_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    scalar_dates = [get_date(value, today) for value in days[:sample]]
+    scalar_dates_seconds = time.perf_counter() - start
+
+    assert list(bulk_days[:sample]) == scalar_days, 'resolve_days differs from get_day'
+    assert list(bulk_dates[:sample]) == scalar_dates, 'resolve_dates differs from get_date'
+
+    print('{:<14} {:>14} {:>14} {:>9}'.format('', 'scalar ns/row', 'bulk ns/row', 'speedup'))
+    for name, scalar, bulk in [('GetDay', scalar_days_seconds, bulk_days_seconds),
+                               ('GetDate', scalar_dates_seconds, bulk_dates_seconds)]:
+        scalar_ns, bulk_ns = per_item(scalar, sample), per_item(bulk, args.rows)
+        print('{:<14} {:>14.0f} {:>14.0f} {:>8.1f}x'.format(name, scalar_ns, bulk_ns, scalar_ns / bulk_ns))
+    print('{} rows; the first {} also resolved with the scalar functions and compared'.format(args.rows, sample))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+import argparse
+import random
+import timeit
+from datetime import datetime, timedelta, timezone
+
+from time_resolver import TimeZoneResolver
+
+# Microbenchmark: the previous GetTime if/elif chain (fixed UTC offsets) against the
+# table-driven TimeZoneResolver
+
+
+def legacy_get_time(location):
+    if location.lower() == 'local':
+        now = datetime.now()
+        time_string = '{}:{:02d}'.format(now.hour,now.minute)
+    elif location.lower() == 'london':
+        utc = datetime.now(timezone.utc)
+        time_string = '{}:{:02d}'.format(utc.hour,utc.minute)
+    elif location.lower() == 'sydney':
+        time = datetime.now(timezone.utc) + timedelta(hours=11)
+        time_string = '{}:{:02d}'.format(time.hour,time.minute)
+    elif location.lower() == 'new york':
+        time = datetime.now(timezone.utc) + timedelta(hours=-5)
+        time_string = '{}:{:02d}'.format(time.hour,time.minute)
+    elif location.lower() == 'nairobi':
+        time = datetime.now(timezone.utc) + timedelta(hours=3)
+        time_string = '{}:{:02d}'.format(time.hour,time.minute)
+    elif location.lower() == 'tokyo':
+        time = datetime.now(timezone.utc) + timedelta(hours=9)
+        time_string = '{}:{:02d}'.format(time.hour,time.minute)
+    elif location.lower() == 'delhi':
+        time = datetime.now(timezone.utc) + timedelta(hours=5.5)
+        time_string = '{}:{:02d}'.format(time.hour,time.minute)
+    else:
+        time_string = "I don't know what time it is in {}".format(location)
+    return time_string
+
+
+def resolver_get_time(resolver, location):
+    now = resolver.now(location)
+    if now is None:
+        return "I don't know what time it is in {}".format(location)
+    return '{}:{:02d}'.format(now.hour, now.minute)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark GetTime implementations')
+    parser.add_argument('--lookups', type=int, default=100000)
+    args = parser.parse_args()
+
+    resolver = TimeZoneResolver()
+    cities = ['London', 'Sydney', 'New York', 'Nairobi', 'Tokyo', 'Delhi', 'Narnia']
+    random.seed(1)
+    workload = [random.choice(cities) for _ in range(args.lookups)]
+
+    print('{} locations in the resolver table'.format(len(resolver.table)))
+    timings = [
+        ('if/elif chain', lambda: [legacy_get_time(city) for city in workload]),
+        ('resolver', lambda: [resolver_get_time(resolver, city) for city in workload]),
+        ('resolver (misspelled)', lambda: [resolver_get_time(resolver, city.replace('o', 'oo', 1))
+                                           for city in workload]),
+    ]
+    for name, run in timings:
+        seconds = min(timeit.repeat(run, number=1, repeat=3))
+        print('{:<22} {:>8.2f} us/lookup'.format(name, seconds / args.lookups * 1e6))
+
+    # Offsets the chain gets wrong while daylight saving time is in effect
+    for city in cities[:-1]:
+        print('{:<10} chain {:>6}  resolver {:>6}'.format(
+            city, legacy_get_time(city), resolver_get_time(resolver, city)))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,14 +1,29 @@
 from dotenv import load_dotenv
+import argparse
 import os
 import json
-from datetime import datetime, timedelta, date, timezone
+import time
+from datetime import date
 from dateutil.parser import parse as is_date
 
 # Import namespaces
-from azure.core.credentials import AzureKeyCredential
-from azure.ai.language.conversations import ConversationAnalysisClient
+from conversation_session import ConversationSession
+from date_resolver import WEEKDAYS, get_date, get_day
+from local_router import LocalRouter
+from time_resolver import TimeZoneResolver
+
+# Locations GetTime knows about and the weekday numbers used by GetDate
+TIME_ZONES = TimeZoneResolver()
+LOCATIONS = ['local'] + TIME_ZONES.names
 
 def main():
+    parser = argparse.ArgumentParser(description='Clock client for the Clock conversational language model')
+    parser.add_argument('--prewarm', action='store_true',
+                        help='open the connection to the Language service at startup')
+    parser.add_argument('--no-local', action='store_true',
+                        help='send every utterance to the Language service')
+    parser.add_argument('--metrics-file', help='write the local routing metrics to this JSON file')
+    args = parser.parse_args()
 
     try:
         # Get Configuration Settings
@@ -16,172 +31,122 @@ def main():
         ls_prediction_endpoint = os.getenv('LS_CONVERSATIONS_ENDPOINT')
         ls_prediction_key = os.getenv('LS_CONVERSATIONS_KEY')
 
+        # Create one client for the Language service model and reuse its pooled
+        # connection for every utterance
+        session = ConversationSession(ls_prediction_endpoint, ls_prediction_key,
+                                      project_name='Clock', deployment_name='production')
+        if args.prewarm:
+            session.prewarm()
+
+        # Utterances with well-known phrasings are resolved locally, without a service call
+        router = None if args.no_local else LocalRouter(LOCATIONS, WEEKDAYS)
+
         # Get user input (until they enter "quit")
         userText = ''
         while userText.lower() != 'quit':
             userText = input('\nEnter some text ("quit" to stop)\n')
             if userText.lower() != 'quit':
 
-                # Create a client for the Language service model
-                client = ConversationAnalysisClient(
-                    ls_prediction_endpoint, AzureKeyCredential(ls_prediction_key)
-                )
-                # Call the Language service model to get intent and entities
-                cls_project = 'Clock'
-                deployment_slot = 'production'
-
-                with client:
-                    query = userText
-                    result = client.analyze_conversation(
-                        task={
-                            "kind": "Conversation",
-                            "analysisInput": {
-                                "conversationItem": {
-                                    "participantId": "1",
-                                    "id": "1",
-                                    "modality": "text",
-                                    "language": "en",
-                                    "text": query
-                                },
-                                "isLoggingEnabled": False
-                            },
-                            "parameters": {
-                                "projectName": cls_project,
-                                "deploymentName": deployment_slot,
-                                "verbose": True
-                            }
-                        }
-                    )
-
-                top_intent = result["result"]["prediction"]["topIntent"]
-                entities = result["result"]["prediction"]["entities"]
-
-                print("view top intent:")
-                print("\ttop intent: {}".format(result["result"]["prediction"]["topIntent"]))
-                print("\tcategory: {}".format(result["result"]["prediction"]["intents"][0]["category"]))
-                print("\tconfidence score: {}\n".format(result["result"]["prediction"]["intents"][0]["confidenceScore"]))
-
-                print("view entities:")
-                for entity in entities:
-                    print("\tcategory: {}".format(entity["category"]))
-                    print("\ttext: {}".format(entity["text"]))
-                    print("\tconfidence score: {}".format(entity["confidenceScore"]))
-
-                print("query: {}".format(result["result"]["query"]))
-                
-                # Apply the appropriate action
-                if top_intent == 'GetTime':
-                    location = 'local'
-                    # Check for entities
-                    if len(entities) > 0:
-                        # Check for a location entity
-                        for entity in entities:
-                            if 'Location' == entity["category"]:
-                                # ML entities are strings, get the first one
-                                location = entity["text"]
-                    # Get the time for the specified location
-                    print(GetTime(location))
-
-                elif top_intent == 'GetDay':
-                    date_string = date.today().strftime("%m/%d/%Y")
-                    # Check for entities
-                    if len(entities) > 0:
-                        # Check for a Date entity
-                        for entity in entities:
-                            if 'Date' == entity["category"]:
-                                # Regex entities are strings, get the first one
-                                date_string = entity["text"]
-                    # Get the day for the specified date
-                    print(GetDay(date_string))
-
-                elif top_intent == 'GetDate':
-                    day = 'today'
-                    # Check for entities
-                    if len(entities) > 0:
-                        # Check for a Weekday entity
-                        for entity in entities:
-                            if 'Weekday' == entity["category"]:
-                            # List entities are lists
-                                day = entity["text"]
-                    # Get the date for the specified day
-                    print(GetDate(day))
-
+                routed = router.route(userText) if router else None
+                if routed:
+                    top_intent, entities = routed
+                    print("resolved locally: {}".format(top_intent))
                 else:
-                    # Some other intent (for example, "None") was predicted
-                    print('Try asking me for the time, the day, or the date.')
+                    # Call the Language service model to get intent and entities
+                    start = time.perf_counter()
+                    result = session.analyze(userText)
+                    if router:
+                        router.record_remote(time.perf_counter() - start)
+
+                    top_intent = result["result"]["prediction"]["topIntent"]
+                    entities = result["result"]["prediction"]["entities"]
+
+                    print("view top intent:")
+                    print("\ttop intent: {}".format(result["result"]["prediction"]["topIntent"]))
+                    print("\tcategory: {}".format(result["result"]["prediction"]["intents"][0]["category"]))
+                    print("\tconfidence score: {}\n".format(result["result"]["prediction"]["intents"][0]["confidenceScore"]))
+
+                    print("view entities:")
+                    for entity in entities:
+                        print("\tcategory: {}".format(entity["category"]))
+                        print("\ttext: {}".format(entity["text"]))
+                        print("\tconfidence score: {}".format(entity["confidenceScore"]))
+
+                    print("query: {}".format(result["result"]["query"]))
+
+                ApplyIntent(top_intent, entities)
+
+        if router:
+            metrics = router.metrics()
+            print('\n{local} of {queries} queries resolved locally ({local_share:.0%}), '
+                  'about {latency_saved_ms:.0f} ms saved'.format(**metrics))
+            if args.metrics_file:
+                with open(args.metrics_file, 'w', encoding='utf8') as metrics_file:
+                    json.dump(metrics, metrics_file, indent=2)
+        session.close()
     except Exception as ex:
         print(ex)
 
 
-def GetTime(location):
-    time_string = ''
-
-    # Note: To keep things simple, we'll ignore daylight savings time and support only a few cities.
-    # In a real app, you'd likely use a web service API (or write  more complex code!)
-    # Hopefully this simplified example is enough to get the the idea that you
-    # use LU to determine the intent and entities, then implement the appropriate logic
-
-    if location.lower() == 'local':
-        now = datetime.now()
-        time_string = '{}:{:02d}'.format(now.hour,now.minute)
-    elif location.lower() == 'london':
-        utc = datetime.now(timezone.utc)
-        time_string = '{}:{:02d}'.format(utc.hour,utc.minute)
-    elif location.lower() == 'sydney':
-        time = datetime.now(timezone.utc) + timedelta(hours=11)
-        time_string = '{}:{:02d}'.format(time.hour,time.minute)
-    elif location.lower() == 'new york':
-        time = datetime.now(timezone.utc) + timedelta(hours=-5)
-        time_string = '{}:{:02d}'.format(time.hour,time.minute)
-    elif location.lower() == 'nairobi':
-        time = datetime.now(timezone.utc) + timedelta(hours=3)
-        time_string = '{}:{:02d}'.format(time.hour,time.minute)
-    elif location.lower() == 'tokyo':
-        time = datetime.now(timezone.utc) + timedelta(hours=9)
-        time_string = '{}:{:02d}'.format(time.hour,time.minute)
-    elif location.lower() == 'delhi':
-        time = datetime.now(timezone.utc) + timedelta(hours=5.5)
-        time_string = '{}:{:02d}'.format(time.hour,time.minute)
+def ApplyIntent(top_intent, entities):
+    # Apply the appropriate action
+    if top_intent == 'GetTime':
+        location = 'local'
+        # Check for entities
+        if len(entities) > 0:
+            # Check for a location entity
+            for entity in entities:
+                if 'Location' == entity["category"]:
+                    # ML entities are strings, get the first one
+                    location = entity["text"]
+        # Get the time for the specified location
+        print(GetTime(location))
+
+    elif top_intent == 'GetDay':
+        date_string = date.today().strftime("%m/%d/%Y")
+        # Check for entities
+        if len(entities) > 0:
+            # Check for a Date entity
+            for entity in entities:
+                if 'Date' == entity["category"]:
+                    # Regex entities are strings, get the first one
+                    date_string = entity["text"]
+        # Get the day for the specified date
+        print(GetDay(date_string))
+
+    elif top_intent == 'GetDate':
+        day = 'today'
+        # Check for entities
+        if len(entities) > 0:
+            # Check for a Weekday entity
+            for entity in entities:
+                if 'Weekday' == entity["category"]:
+                # List entities are lists
+                    day = entity["text"]
+        # Get the date for the specified day
+        print(GetDate(day))
+
     else:
-        time_string = "I don't know what time it is in {}".format(location)
-    
-    return time_string
+        # Some other intent (for example, "None") was predicted
+        print('Try asking me for the time, the day, or the date.')
+
+
+def GetTime(location):
+    # Look up the location's time zone (daylight saving time is taken into account)
+    found = TIME_ZONES.resolve(location)
+    if found is None:
+        return "I don't know what time it is in {}".format(location)
+    now = TIME_ZONES.now(location)
+    if found[0] == 'local':
+        return '{}:{:02d}'.format(now.hour, now.minute)
+    # Name the place that was used, in case the location was misspelled or is ambiguous
+    return '{}:{:02d} in {}'.format(now.hour, now.minute, found[1])
 
 def GetDate(day):
-    date_string = 'I can only determine dates for today or named days of the week.'
-
-    weekdays = {
-        "monday":0,
-        "tuesday":1,
-        "wednesday":2,
-        "thursday":3,
-        "friday":4,
-        "saturday":5,
-        "sunday":6
-    }
-
-    today = date.today()
-
-    # To keep things simple, assume the named day is in the current week (Sunday to Saturday)
-    day = day.lower()
-    if day == 'today':
-        date_string = today.strftime("%m/%d/%Y")
-    elif day in weekdays:
-        todayNum = today.weekday()
-        weekDayNum = weekdays[day]
-        offset = weekDayNum - todayNum
-        date_string = (today + timedelta(days=offset)).strftime("%m/%d/%Y")
-
-    return date_string
+    return get_date(day)
 
 def GetDay(date_string):
-    # Note: To keep things simple, dates must be entered in US format (MM/DD/YYYY)
-    try:
-        date_object = datetime.strptime(date_string, "%m/%d/%Y")
-        day_string = date_object.strftime("%A")
-    except:
-        day_string = 'Enter a date in MM/DD/YYYY format.'
-    return day_string
+    return get_day(date_string)
 
 if __name__ == "__main__":
     os.chdir(os.path.dirname(os.path.abspath(__file__)))
@@ -0,0 +1,92 @@
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from azure.core.credentials import AzureKeyCredential
+from azure.core.pipeline.transport import RequestsTransport
+from azure.ai.language.conversations import ConversationAnalysisClient
+
+# A long-lived ConversationAnalysisClient on top of a pooled, keep-alive HTTP session,
+# so every utterance reuses the same connection instead of paying for a new TLS
+# handshake and connection setup
+
+
+def create_session(pool_size=10):
+    session = requests.Session()
+    # The Azure SDK pipeline already retries, so the adapter must not
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size,
+                          max_retries=Retry(total=False, redirect=False, raise_on_status=False))
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
+class ConversationSession:
+
+    def __init__(self, endpoint, key, project_name='Clock', deployment_name='production', pool_size=10):
+        self.endpoint = endpoint
+        self.project_name = project_name
+        self.deployment_name = deployment_name
+        self.task_template = make_task_template(project_name, deployment_name)
+        self.session = create_session(pool_size)
+        self.client = ConversationAnalysisClient(
+            endpoint, AzureKeyCredential(key),
+            transport=RequestsTransport(session=self.session, session_owner=False)
+        )
+
+    def prewarm(self):
+        # Open the connection (TCP + TLS) up front so the first utterance doesn't pay for it.
+        # Any HTTP response will do; only the pooled connection matters.
+        try:
+            self.session.head(self.endpoint, timeout=10)
+        except requests.RequestException:
+            pass
+
+    def analyze(self, text):
+        return self.client.analyze_conversation(task=build_task(self.task_template, text))
+
+    def close(self):
+        self.client.close()
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+def make_task_template(project_name, deployment_name):
+    # Built once per session; only the utterance text changes between calls
+    return {
+        "kind": "Conversation",
+        "analysisInput": {
+            "conversationItem": {
+                "participantId": "1",
+                "id": "1",
+                "modality": "text",
+                "language": "en",
+                "text": ""
+            },
+            "isLoggingEnabled": False
+        },
+        "parameters": {
+            "projectName": project_name,
+            "deploymentName": deployment_name,
+            "verbose": True
+        }
+    }
+
+
+def build_task(template, text):
+    # Copy only the nested dicts on the path to the text; the rest is shared
+    analysis_input = dict(template["analysisInput"])
+    analysis_input["conversationItem"] = dict(analysis_input["conversationItem"], text=text)
+    return dict(template, analysisInput=analysis_input)
+
+
+def analyze_once(endpoint, key, text, project_name='Clock', deployment_name='production'):
+    # The non-pooled path: a new client (and connection) for every utterance
+    client = ConversationAnalysisClient(endpoint, AzureKeyCredential(key))
+    with client:
+        return client.analyze_conversation(task=build_task(make_task_template(project_name, deployment_name), text))
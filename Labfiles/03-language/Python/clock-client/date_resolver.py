@@ -0,0 +1,104 @@
+import re
+from datetime import date, datetime, timedelta
+
+import numpy as np
+
+# Day/date resolution for the GetDay and GetDate intents.
+# get_day and get_date handle one entity; resolve_days and resolve_dates handle whole
+# arrays (for example Date/Weekday entities from a log replay) with NumPy datetime64
+# arithmetic. Each distinct input string is parsed only once, and the results are
+# identical to the scalar functions.
+
+WEEKDAYS = {
+    "monday":0,
+    "tuesday":1,
+    "wednesday":2,
+    "thursday":3,
+    "friday":4,
+    "saturday":5,
+    "sunday":6
+}
+
+DAY_NAMES = np.array(['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday'])
+INVALID_DATE = 'Enter a date in MM/DD/YYYY format.'
+UNKNOWN_DAY = 'I can only determine dates for today or named days of the week.'
+
+# What datetime.strptime accepts for "%m/%d/%Y"
+US_DATE = re.compile(r'(1[0-2]|0[1-9]|[1-9])/(3[01]|[12]\d|0[1-9]|[1-9]| [1-9])/(\d\d\d\d)', re.IGNORECASE)
+
+
+def get_day(date_string):
+    # Note: To keep things simple, dates must be entered in US format (MM/DD/YYYY)
+    try:
+        date_object = datetime.strptime(date_string, "%m/%d/%Y")
+        day_string = date_object.strftime("%A")
+    except ValueError:
+        day_string = INVALID_DATE
+    return day_string
+
+
+def get_date(day, today=None):
+    # To keep things simple, assume the named day is in the current week (Sunday to Saturday)
+    today = today or date.today()
+    day = day.lower()
+    if day == 'today':
+        return today.strftime("%m/%d/%Y")
+    if day in WEEKDAYS:
+        return (today + timedelta(days=WEEKDAYS[day] - today.weekday())).strftime("%m/%d/%Y")
+    return UNKNOWN_DAY
+
+
+def distinct(values):
+    # (distinct values, index of each input value in the distinct array)
+    index = {}
+    codes = np.fromiter((index.setdefault(value, len(index)) for value in values),
+                        dtype=np.int64, count=len(values))
+    return np.array(list(index), dtype=str), codes
+
+
+def resolve_days(date_strings):
+    # Day names for an array of MM/DD/YYYY strings (INVALID_DATE where get_day would fail)
+    if len(date_strings) == 0:
+        return np.array([], dtype=str)
+    uniques, inverse = distinct(date_strings)
+
+    parts = np.zeros((len(uniques), 3), dtype=np.int64)
+    matched = np.zeros(len(uniques), dtype=bool)
+    for i, value in enumerate(uniques):
+        match = US_DATE.fullmatch(value)
+        if match:
+            parts[i] = [int(match.group(1)), int(match.group(2)), int(match.group(3))]
+            matched[i] = True
+    months, days, years = parts.T
+
+    # Months since 1970-01 -> first day of the month -> the date itself. Invalid days
+    # (such as 02/30) roll into the next month, which the round trip check catches.
+    month_index = (years - 1970) * 12 + (months - 1)
+    first_days = month_index.astype('datetime64[M]').astype('datetime64[D]')
+    dates = first_days + (days - 1).astype('timedelta64[D]')
+    valid = matched & (years >= 1) & (dates.astype('datetime64[M]').astype(np.int64) == month_index)
+
+    # 1970-01-01 was a Thursday (weekday 3)
+    weekdays = (dates.astype(np.int64) + 3) % 7
+    names = np.where(valid, DAY_NAMES[weekdays], INVALID_DATE)
+    return names[inverse]
+
+
+def resolve_dates(day_names, today=None):
+    # MM/DD/YYYY dates for an array of weekday names (or 'today'), relative to the
+    # current week; UNKNOWN_DAY for anything else
+    if len(day_names) == 0:
+        return np.array([], dtype=str)
+    today = np.datetime64(today or date.today(), 'D')
+    today_weekday = (today.astype(np.int64) + 3) % 7
+    uniques, inverse = distinct(day_names)
+
+    lowered = np.char.lower(uniques)
+    offsets = np.array([WEEKDAYS.get(name, today_weekday if name == 'today' else -1) for name in lowered])
+    known = offsets >= 0
+    dates = today + (np.where(known, offsets, today_weekday) - today_weekday).astype('timedelta64[D]')
+
+    # Only a handful of distinct dates exist, so formatting happens once per distinct value
+    formatted = [d.item().strftime("%m/%d/%Y") for d in dates]
+    results = np.where(known, formatted, UNKNOWN_DAY)
+    return results[inverse]
@@ -0,0 +1,62 @@
+from dotenv import load_dotenv
+import argparse
+import asyncio
+import json
+import os
+
+from azure.core.credentials import AzureKeyCredential
+from azure.ai.language.conversations.aio import ConversationAnalysisClient
+
+from batch_eval import evaluate, load_examples, print_report, score
+from conversation_session import make_task_template
+from stand_in_server import StandInServer
+
+# Regression test for the Clock model: sends a file of labeled utterances concurrently
+# and reports a confusion matrix, per-intent precision/recall, and throughput/latency.
+#   python evaluate-intents.py utterances.jsonl --concurrency 8 --rate 20
+
+
+async def run(endpoint, key, examples, args):
+    template = make_task_template(args.project, args.deployment)
+    client = ConversationAnalysisClient(endpoint, AzureKeyCredential(key))
+    async with client:
+        return await evaluate(client, template, examples, args.concurrency, args.rate)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Evaluate the Clock model on labeled utterances')
+    parser.add_argument('input', help='JSONL or CSV file of utterances with expected intents/entities')
+    parser.add_argument('--concurrency', type=int, default=8, help='maximum requests in flight')
+    parser.add_argument('--rate', type=float, default=None, help='maximum requests per second')
+    parser.add_argument('--project', default='Clock')
+    parser.add_argument('--deployment', default='production')
+    parser.add_argument('--output', help='write each prediction to this JSONL file')
+    parser.add_argument('--stand-in', action='store_true',
+                        help='use a local stand-in for the Language service instead of Azure')
+    args = parser.parse_args()
+
+    load_dotenv()
+    endpoint = os.getenv('LS_CONVERSATIONS_ENDPOINT')
+    key = os.getenv('LS_CONVERSATIONS_KEY')
+    server = None
+    if args.stand_in:
+        server = StandInServer(request_delay=0.02).start()
+        endpoint, key = server.endpoint, 'stand-in-key'
+
+    try:
+        examples = load_examples(args.input)
+        outcomes, elapsed = asyncio.run(run(endpoint, key, examples, args))
+    finally:
+        if server:
+            server.stop()
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf8') as output_file:
+            for outcome in outcomes:
+                output_file.write(json.dumps(outcome) + '\n')
+
+    print_report(score(outcomes, elapsed))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+import argparse
+import time
+
+from conversation_session import ConversationSession, analyze_once
+from latency_stats import summarize
+from stand_in_server import StandInServer
+
+# Compares per-request latency of the pooled (one long-lived client) and non-pooled
+# (new client per utterance) modes against a local stand-in for the conversations endpoint
+
+UTTERANCES = ['What time is it in London?', 'What day is 01/02/2025?', 'What is the date on Friday?',
+              'Hello', 'What time is it?']
+
+
+def measure(call, requests):
+    latencies = []
+    for i in range(requests):
+        start = time.perf_counter()
+        call(UTTERANCES[i % len(UTTERANCES)])
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Latency report for the clock client')
+    parser.add_argument('--requests', type=int, default=200)
+    parser.add_argument('--connect-ms', type=float, default=20,
+                        help='simulated connection setup (TLS handshake) cost')
+    parser.add_argument('--service-ms', type=float, default=5, help='simulated service time')
+    args = parser.parse_args()
+
+    server = StandInServer(args.connect_ms / 1000, args.service_ms / 1000).start()
+    key = 'stand-in-key'
+    try:
+        modes = []
+
+        connections = server.connections
+        modes.append(('non-pooled', measure(lambda text: analyze_once(server.endpoint, key, text), args.requests),
+                      server.connections - connections))
+
+        for prewarm in (False, True):
+            connections = server.connections
+            with ConversationSession(server.endpoint, key) as session:
+                if prewarm:
+                    session.prewarm()
+                latencies = measure(session.analyze, args.requests)
+            modes.append(('pooled + prewarm' if prewarm else 'pooled', latencies, server.connections - connections))
+
+        print('{:<18} {:>8} {:>11} {:>9} {:>9} {:>9}'.format(
+            'mode', 'requests', 'connections', 'first ms', 'p50 ms', 'p95 ms'))
+        for name, latencies, connections in modes:
+            stats = summarize(latencies)
+            print('{:<18} {:>8} {:>11} {:>9.2f} {:>9.2f} {:>9.2f}'.format(
+                name, stats['count'], connections, latencies[0] * 1000, stats['p50'] * 1000, stats['p95'] * 1000))
+    finally:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+import re
+import time
+
+# Local fast path for the Clock app: utterances that match well-known phrasings
+# ("what time is it in Tokyo", "what day is 01/02/2025", "what is the date on Friday")
+# are resolved without calling the Language service. Anything else returns None, so the
+# caller falls back to analyze_conversation.
+
+
+def alternation(words):
+    # Longest first, so "new york" wins over a shorter prefix
+    return '|'.join(re.escape(word) for word in sorted(words, key=len, reverse=True))
+
+
+class LocalRouter:
+
+    def __init__(self, locations, weekdays):
+        # The location table has tens of thousands of names, so the pattern captures any
+        # place name and it's checked against the set afterwards
+        self.locations = {location.lower() for location in locations}
+        weekdays = alternation(weekday.lower() for weekday in weekdays)
+        end = r'[\s?.!]*$'
+        self.patterns = [
+            ('GetTime', re.compile(
+                r"^(?:what(?:'s| is)? the time|what time is it|tell me the time)(?: now| right now)?"
+                r"(?: in (?P<Location>[\w][\w .'-]*?))?" + end)),
+            ('GetDay', re.compile(
+                r"^what day (?:is|was|will be)(?: it)?(?: on)?(?: (?P<Date>\d{1,2}/\d{1,2}/\d{4}))?(?: today)?" + end)),
+            ('GetDate', re.compile(
+                r"^what(?:'s| is)? (?:the )?date(?: is it)?(?: on)?(?: (?P<Weekday>" + weekdays + r"))?(?: today)?" + end)),
+        ]
+        self.local = 0
+        self.remote = 0
+        self.local_seconds = 0.0
+        self.remote_seconds = 0.0
+
+    def route(self, text):
+        # Returns (intent, entities) in the same shape as the service prediction, or None
+        start = time.perf_counter()
+        query = ' '.join(text.lower().split())
+        routed = None
+        for intent, pattern in self.patterns:
+            match = pattern.match(query)
+            location = match.groupdict().get('Location') if match else None
+            if location is not None and location not in self.locations:
+                # An unknown place goes to the service
+                break
+            if match:
+                entities = [{"category": category, "text": value, "confidenceScore": 1.0}
+                            for category, value in match.groupdict().items() if value]
+                routed = (intent, entities)
+                break
+
+        if routed:
+            self.local += 1
+            self.local_seconds += time.perf_counter() - start
+        return routed
+
+    def record_remote(self, seconds):
+        self.remote += 1
+        self.remote_seconds += seconds
+
+    def metrics(self):
+        total = self.local + self.remote
+        local_mean = self.local_seconds / self.local if self.local else 0.0
+        remote_mean = self.remote_seconds / self.remote if self.remote else 0.0
+        return {
+            'queries': total,
+            'local': self.local,
+            'remote': self.remote,
+            'local_share': self.local / total if total else 0.0,
+            'local_mean_ms': local_mean * 1000,
+            'remote_mean_ms': remote_mean * 1000,
+            # Estimated from the mean service round trip seen in this session
+            'latency_saved_ms': self.local * max(remote_mean - local_mean, 0.0) * 1000,
+        }
@@ -0,0 +1,95 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# A local HTTP stand-in for the Language service conversations endpoint, used to measure
+# the client without an Azure resource. It answers every analyze-conversations request
+# with a prediction for the Clock project based on a few keywords.
+# connect_delay simulates the cost of setting up a new (TLS) connection and
+# request_delay the service processing time.
+
+
+def predict(text):
+    lowered = text.lower()
+    if 'time' in lowered:
+        intent, category = 'GetTime', 'Location'
+    elif 'what day' in lowered:
+        intent, category = 'GetDay', 'Date'
+    elif 'date' in lowered:
+        intent, category = 'GetDate', 'Weekday'
+    else:
+        intent, category = 'None', None
+
+    entities = []
+    if category and ' in ' in lowered:
+        entity_text = text[lowered.rindex(' in ') + 4:].strip(' ?')
+        entities.append({"category": category, "text": entity_text,
+                         "offset": text.index(entity_text), "length": len(entity_text),
+                         "confidenceScore": 1})
+    return {
+        "kind": "ConversationResult",
+        "result": {
+            "query": text,
+            "prediction": {
+                "topIntent": intent,
+                "projectKind": "Conversation",
+                "intents": [{"category": intent, "confidenceScore": 0.95}],
+                "entities": entities
+            }
+        }
+    }
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+
+    def setup(self):
+        super().setup()
+        self.server.connections += 1
+        time.sleep(self.server.connect_delay)
+
+    def do_HEAD(self):
+        self.send_response(200)
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        task = json.loads(body)
+        time.sleep(self.server.request_delay)
+        self.server.requests += 1
+        text = task["analysisInput"]["conversationItem"]["text"]
+        payload = json.dumps(predict(text)).encode('utf8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+class StandInServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, connect_delay=0.0, request_delay=0.0, port=0):
+        super().__init__(('127.0.0.1', port), StandInHandler)
+        self.connect_delay = connect_delay
+        self.request_delay = request_delay
+        self.connections = 0
+        self.requests = 0
+
+    @property
+    def endpoint(self):
+        return 'http://127.0.0.1:{}'.format(self.server_address[1])
+
+    def start(self):
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
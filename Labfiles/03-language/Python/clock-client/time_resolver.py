@@ -0,0 +1,200 @@
+import re
+import unicodedata
+from datetime import datetime
+from functools import lru_cache
+from zoneinfo import ZoneInfo, available_timezones
+
+# Resolves a location name to its IANA time zone with a precomputed table, so lookups
+# are a single dict access and daylight saving time is handled by zoneinfo.
+# The table holds the GeoNames cities with at least MIN_POPULATION people (about 32,000
+# names, from the geonamescache package; where several cities share a name the largest
+# wins), then every city in the tz database that isn't already there (for example
+# "America/New_York" gives "new york"), then the aliases below. Legacy tz links named after
+# a country's regions ("US/Pacific", "Canada/Central", "Australia/North", ...) and
+# GENERIC_NAMES are left out, so words like "central" or "north" aren't taken for places.
+# Misspelled names (from speech or entity recognition) fall back to the closest name that
+# starts with the same letter, within an edit distance that grows with the name's length;
+# resolve() returns the name that was used, so the caller can tell the user.
+# Resolved names are memoized.
+
+try:
+    import geonamescache
+except ImportError:
+    geonamescache = None
+
+MIN_POPULATION = 15000
+
+ALIASES = {
+    'delhi': 'Asia/Kolkata',
+    'new delhi': 'Asia/Kolkata',
+    'mumbai': 'Asia/Kolkata',
+    'bangalore': 'Asia/Kolkata',
+    'beijing': 'Asia/Shanghai',
+    'nyc': 'America/New_York',
+    'washington': 'America/New_York',
+    'boston': 'America/New_York',
+    'san francisco': 'America/Los_Angeles',
+    'seattle': 'America/Los_Angeles',
+    'las vegas': 'America/Los_Angeles',
+    'dallas': 'America/Chicago',
+    'houston': 'America/Chicago',
+    'barcelona': 'Europe/Madrid',
+    'milan': 'Europe/Rome',
+    'munich': 'Europe/Berlin',
+    'frankfurt': 'Europe/Berlin',
+    'geneva': 'Europe/Zurich',
+    'osaka': 'Asia/Tokyo',
+    'kyoto': 'Asia/Tokyo',
+    'melbourne': 'Australia/Melbourne',
+    'rio de janeiro': 'America/Sao_Paulo',
+    'cape town': 'Africa/Johannesburg',
+    'calcutta': 'Asia/Kolkata',
+    'bombay': 'Asia/Kolkata',
+    'canberra': 'Australia/Sydney',
+    'hawaii': 'Pacific/Honolulu',
+    'alaska': 'America/Anchorage',
+    'arizona': 'America/Phoenix',
+}
+
+# Areas of the tz database that only hold legacy links, and the legacy Australian links
+# (the other Australia/ zones are cities)
+LEGACY_AREAS = ('Etc', 'SystemV', 'US', 'Canada', 'Brazil', 'Mexico', 'Chile')
+LEGACY_AUSTRALIA = {'ACT', 'Canberra', 'Currie', 'LHI', 'NSW', 'North', 'Queensland', 'South', 'Tasmania',
+                    'Victoria', 'West', 'Yancowinna'}
+
+# Town names that are also everyday words, which would otherwise catch phrases like
+# "what time is it in central"
+GENERIC_NAMES = {'central', 'centre', 'center', 'north', 'south', 'east', 'west', 'time', 'date', 'day', 'today',
+                 'now', 'here', 'home', 'general', 'pacific', 'eastern', 'mountain', 'atlantic', 'local'}
+
+# Abbreviations spelled out, so "St. Louis" and "Saint Louis" are the same name
+ABBREVIATIONS = {'st': 'saint', 'ste': 'sainte', 'ft': 'fort', 'mt': 'mount'}
+
+UNRESOLVED = object()
+NON_WORD = re.compile(r"[^\w\s']+|_")
+
+
+def normalize(name):
+    # Lower case, accents and punctuation removed ("São Paulo" -> "sao paulo")
+    name = unicodedata.normalize('NFKD', name).encode('ascii', 'ignore').decode('ascii')
+    words = NON_WORD.sub(' ', name.lower()).split()
+    return ' '.join(ABBREVIATIONS.get(word, word) for word in words)
+
+
+def max_distance(name):
+    # Names shorter than 7 characters must match exactly: too many real towns are a
+    # single edit apart ("delphi" and "delhi")
+    return min(len(name) // 7, 2)
+
+
+def edit_distance(a, b, limit):
+    # Levenshtein distance, or limit + 1 once it's certain to be above limit
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        for j, char_b in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (char_a != char_b)))
+        if min(current) > limit:
+            return limit + 1
+        previous = current
+    return previous[-1]
+
+
+@lru_cache(maxsize=None)
+def get_zone(key):
+    return ZoneInfo(key)
+
+
+def city_names(min_population=MIN_POPULATION):
+    # {normalized name: (zone key, display name, population)}, the largest city for each name
+    cities = {}
+    if geonamescache is None:
+        return cities
+    for city in geonamescache.GeonamesCache(min_city_population=min_population).get_cities().values():
+        name = normalize(city['name'])
+        if not name or not city['timezone'] or name in GENERIC_NAMES:
+            continue
+        if name not in cities or city['population'] > cities[name][2]:
+            display = '{}, {}'.format(city['name'], city['countrycode'])
+            cities[name] = (city['timezone'], display, city['population'])
+    return cities
+
+
+def build_table(aliases=ALIASES, min_population=MIN_POPULATION):
+    # {normalized name: (zone key, display name)}, largest cities first (so the fuzzy match
+    # prefers them when several names are equally close)
+    cities = sorted(city_names(min_population).items(), key=lambda item: -item[1][2])
+    table = {name: (key, display) for name, (key, display, _) in cities}
+    for key in sorted(available_timezones()):
+        area, _, city = key.rpartition('/')
+        if not area or area.split('/')[0] in LEGACY_AREAS:
+            continue
+        if area == 'Australia' and city in LEGACY_AUSTRALIA:
+            continue
+        table.setdefault(normalize(city), (key, city.replace('_', ' ')))
+    for alias, key in aliases.items():
+        table[normalize(alias)] = (key, alias.upper() if len(alias) <= 3 else alias.title())
+    return table
+
+
+class TimeZoneResolver:
+
+    def __init__(self, aliases=ALIASES, min_population=MIN_POPULATION, max_cached=10000):
+        self.table = build_table(aliases, min_population)
+        self.names = list(self.table)
+        # Names by first letter, for the fuzzy match
+        self.by_letter = {}
+        for name in self.names:
+            self.by_letter.setdefault(name[0], []).append(name)
+        self.max_cached = max_cached
+        # Raw location text -> (zone key, name used), so repeated queries skip normalizing
+        self.resolved = {}
+
+    def closest(self, name):
+        # The known name closest to a misspelled one, or None
+        limit = max_distance(name)
+        best, best_distance = None, limit + 1
+        if limit:
+            for candidate in self.by_letter.get(name[0], ()):
+                distance = edit_distance(name, candidate, min(limit, best_distance))
+                if distance < best_distance:
+                    best, best_distance = candidate, distance
+        return best
+
+    def resolve(self, location):
+        # (zone key, name of the place used) for a location, or None if unknown.
+        # 'local' is this computer's time zone.
+        found = self.resolved.get(location, UNRESOLVED)
+        if found is not UNRESOLVED:
+            return found
+
+        name = normalize(location)
+        if name == 'local':
+            found = ('local', 'local')
+        elif name:
+            match = name if name in self.table else self.closest(name)
+            found = self.table[match] if match else None
+        else:
+            found = None
+
+        if len(self.resolved) >= self.max_cached:
+            self.resolved.clear()
+        self.resolved[location] = found
+        return found
+
+    def zone_key(self, location):
+        found = self.resolve(location)
+        return found[0] if found else None
+
+    def zone(self, location):
+        key = self.zone_key(location)
+        return get_zone(key) if key and key != 'local' else None
+
+    def now(self, location):
+        # Current time at the location ('local' is this computer's time), or None if unknown
+        key = self.zone_key(location)
+        if key == 'local':
+            return datetime.now()
+        return datetime.now(get_zone(key)) if key else None
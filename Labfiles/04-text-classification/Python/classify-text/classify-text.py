@@ -2,7 +2,12 @@ from dotenv import load_dotenv
 import os
 
 # Import namespaces
+from azure.core.credentials import AzureKeyCredential
+from azure.ai.textanalytics import TextAnalyticsClient
 
+from document_loader import load_batches, read_document
+from job_manager import ClassificationJobManager
+from result_cache import API_VERSION, ResultCache, split_cached, store_results
 
 def main():
     try:
@@ -12,26 +17,58 @@ def main():
         ai_key = os.getenv('AI_SERVICE_KEY')
         project_name = os.getenv('PROJECT')
         deployment_name = os.getenv('DEPLOYMENT')
+        max_jobs = int(os.getenv('MAX_JOBS', '4'))
 
         # Create client using endpoint and key
+        credential = AzureKeyCredential(ai_key)
+        ai_client = TextAnalyticsClient(endpoint=ai_endpoint, credential=credential, api_version=API_VERSION)
 
+        # Articles classified by this project/deployment on a previous run come from the cache
+        skill = 'single_label_classify'
+        model = '{}/{}'.format(project_name, deployment_name)
+        cache = ResultCache()
+        submitted = {}
 
-        # Read each text file in the articles folder
-        batchedDocuments = []
+        # Stream the text files in the articles folder in batches the service accepts per job
         articles_folder = 'articles'
-        files = os.listdir(articles_folder)
-        for file_name in files:
-            # Read the file contents
-            text = open(os.path.join(articles_folder, file_name), encoding='utf8').read()
-            batchedDocuments.append(text)
 
-        # Get Classifications
+        def uncached_batches():
+            for documents in load_batches(articles_folder, max_documents=25):
+                cached, missing = split_cached(cache, documents, skill, model)
+                for doc, classification_result in cached.items():
+                    PrintClassification(doc, classification_result)
+                submitted.update(missing)
+                if missing:
+                    yield missing
 
+        # Get Classifications, keeping several jobs in flight and printing each job's results as it finishes
+        job_manager = ClassificationJobManager(ai_client, project_name, deployment_name, max_jobs=max_jobs)
+        for doc, classification_result in job_manager.run(uncached_batches()):
+            # Jobs resumed from a previous run were read before the crash, so read them again
+            text = submitted.pop(doc, None)
+            if text is None:
+                text = read_document(os.path.join(articles_folder, doc))
+            store_results(cache, {doc: text}, skill, model, [classification_result])
+            PrintClassification(doc, classification_result)
 
+        print('\nCache: {hits} hits, {misses} misses'.format(**cache.stats()))
+        cache.close()
 
     except Exception as ex:
         print(ex)
 
 
+def PrintClassification(doc, classification_result):
+    if classification_result.is_error is True:
+        print("{} has an error with code '{}' and message '{}'".format(
+            doc, classification_result.error.code, classification_result.error.message)
+        )
+    elif classification_result.kind == "CustomDocumentClassification":
+        classification = classification_result.classifications[0]
+        print("{} was classified as '{}' with confidence score {}.".format(
+            doc, classification.category, classification.confidence_score)
+        )
+
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
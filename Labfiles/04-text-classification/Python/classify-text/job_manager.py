@@ -0,0 +1,146 @@
+import json
+import os
+import time
+
+from azure.ai.textanalytics import DocumentError, TextAnalyticsError
+
+# Runs custom text classification over a large corpus as many long-running jobs.
+# Up to max_jobs jobs are in flight at once, and the results of each job are streamed out
+# as soon as it finishes. Each poller calls the service from its own thread at the
+# polling_interval it was created with, which adapts to how long jobs take: new jobs poll
+# about polls_per_job times over the recent mean job duration (between min_interval and
+# max_interval). A running poller's thread can't be stopped, so re-creating it to change
+# its interval would only add a second poller; the interval is chosen once per job.
+# The pollers' done() flags are checked locally (no service call) with a backoff.
+# The continuation token of every in-flight job is saved to a state file, so after a
+# crash the jobs can be picked up again instead of being resubmitted. A job that fails
+# is dropped from the state file and its documents are returned as errors.
+
+
+class ClassificationJobManager:
+
+    def __init__(self, ai_client, project_name, deployment_name, max_jobs=4,
+                 state_path='classify-jobs.json', min_interval=1.0, max_interval=30.0, polls_per_job=8):
+        self.ai_client = ai_client
+        self.project_name = project_name
+        self.deployment_name = deployment_name
+        self.max_jobs = max_jobs
+        self.state_path = state_path
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.polls_per_job = polls_per_job
+        self.interval = min_interval
+        self.durations = []        # seconds taken by recent jobs submitted by this run
+        self.in_flight = {}
+        self.next_job = 0
+        self.submitted = 0
+        self.resumed = 0
+
+    def submit(self, documents):
+        # documents maps a document id to its text
+        batch = [{'id': doc_id, 'text': text} for doc_id, text in documents.items()]
+        poller = self.ai_client.begin_single_label_classify(
+            batch,
+            project_name=self.project_name,
+            deployment_name=self.deployment_name,
+            polling_interval=self.polling_interval()
+        )
+        self.track(list(documents), poller, time.perf_counter())
+        self.submitted += 1
+
+    def resume(self, continuation_token, doc_ids):
+        poller = self.ai_client.begin_single_label_classify(
+            None,
+            project_name=self.project_name,
+            deployment_name=self.deployment_name,
+            continuation_token=continuation_token,
+            polling_interval=self.polling_interval()
+        )
+        self.track(doc_ids, poller)
+        self.resumed += 1
+
+    def track(self, doc_ids, poller, started=None):
+        job_id = str(self.next_job)
+        self.next_job += 1
+        self.in_flight[job_id] = {'documents': doc_ids, 'poller': poller, 'started': started}
+        self.save_state()
+
+    def polling_interval(self):
+        # Seconds between service polls for a new poller
+        if not self.durations:
+            return self.min_interval
+        recent = self.durations[-10:]
+        interval = sum(recent) / len(recent) / self.polls_per_job
+        return min(max(interval, self.min_interval), self.max_interval)
+
+    def load_state(self):
+        # Reattach to the jobs that were still running when the state file was written
+        if not os.path.exists(self.state_path):
+            return set()
+        with open(self.state_path, encoding='utf8') as state_file:
+            state = json.load(state_file)
+        resumed_ids = set()
+        for job in state['jobs']:
+            self.resume(job['continuation_token'], job['documents'])
+            resumed_ids.update(job['documents'])
+        return resumed_ids
+
+    def save_state(self):
+        jobs = [{'documents': job['documents'], 'continuation_token': job['poller'].continuation_token()}
+                for job in self.in_flight.values()]
+        temp_path = self.state_path + '.tmp'
+        with open(temp_path, 'w', encoding='utf8') as state_file:
+            json.dump({'jobs': jobs}, state_file)
+        os.replace(temp_path, self.state_path)
+
+    def finished_jobs(self):
+        # Wait until at least one job is done, backing off while none are
+        while True:
+            finished = [job_id for job_id, job in self.in_flight.items() if job['poller'].done()]
+            if finished:
+                self.interval = self.min_interval
+                return finished
+            time.sleep(self.interval)
+            self.interval = min(self.interval * 2, self.max_interval)
+
+    def job_results(self, job):
+        # [(doc_id, result)] for a finished job; a failed job gives an error per document
+        try:
+            return list(zip(job['documents'], job['poller'].result()))
+        except Exception as ex:
+            code = getattr(getattr(ex, 'error', None), 'code', None) or type(ex).__name__
+            return [(doc_id, DocumentError(id=doc_id, error=TextAnalyticsError(code=code, message=str(ex))))
+                    for doc_id in job['documents']]
+
+    def run(self, batches):
+        # batches yields {doc_id: text} dicts (one job each). Yields (doc_id, result) pairs
+        # as jobs finish. Documents that belong to resumed jobs are not submitted again.
+        resumed_ids = self.load_state()
+        batches = iter(batches)
+        exhausted = False
+
+        while True:
+            while not exhausted and len(self.in_flight) < self.max_jobs:
+                documents = next(batches, None)
+                if documents is None:
+                    exhausted = True
+                    break
+                documents = {doc_id: text for doc_id, text in documents.items() if doc_id not in resumed_ids}
+                if documents:
+                    self.submit(documents)
+
+            if not self.in_flight:
+                break
+
+            for job_id in self.finished_jobs():
+                job = self.in_flight.pop(job_id)
+                if job['started'] is not None:
+                    # Resumed jobs started before this run, so their duration isn't known
+                    self.durations.append(time.perf_counter() - job['started'])
+                results = self.job_results(job)
+                self.save_state()
+                for doc_id, result in results:
+                    yield doc_id, result
+
+        if os.path.exists(self.state_path):
+            os.remove(self.state_path)
@@ -0,0 +1,141 @@
+import hashlib
+import json
+import os
+import pickle
+import sqlite3
+import time
+
+# Persistent cache for Language service results, so documents that have not changed
+# since the last run are not sent (and paid for) again.
+# Entries are keyed by a hash of the document text, the skill, the model (or custom
+# project/deployment) and the API version. The store is a SQLite database in WAL mode,
+# so several processes can read and write the same cache file at once.
+
+API_VERSION = '2023-04-01'
+
+
+def make_key(text, skill, model, api_version=API_VERSION):
+    payload = json.dumps([text, skill, model, api_version], ensure_ascii=False)
+    return hashlib.sha256(payload.encode('utf8')).hexdigest()
+
+
+class ResultCache:
+
+    def __init__(self, path='language-cache.sqlite', max_bytes=64 * 1024 * 1024, ttl=None):
+        # max_bytes bounds the total size of the stored results (least recently used
+        # entries are evicted first); ttl is an optional lifetime in seconds
+        self.path = path
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        folder = os.path.dirname(os.path.abspath(path))
+        os.makedirs(folder, exist_ok=True)
+        self.connection = sqlite3.connect(path, timeout=30, isolation_level=None)
+        self.connection.execute('PRAGMA journal_mode=WAL')
+        self.connection.execute('PRAGMA synchronous=NORMAL')
+        self.connection.execute('''
+            CREATE TABLE IF NOT EXISTS results (
+                key TEXT PRIMARY KEY,
+                value BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                created REAL NOT NULL,
+                accessed REAL NOT NULL
+            )''')
+        self.connection.execute('CREATE INDEX IF NOT EXISTS results_accessed ON results (accessed)')
+
+    def get(self, key):
+        row = self.connection.execute(
+            'SELECT value, created FROM results WHERE key = ?', (key,)).fetchone()
+        now = time.time()
+        if row is None or (self.ttl is not None and now - row[1] > self.ttl):
+            if row is not None:
+                self.connection.execute('DELETE FROM results WHERE key = ?', (key,))
+            self.misses += 1
+            return None
+
+        self.connection.execute('UPDATE results SET accessed = ? WHERE key = ?', (now, key))
+        self.hits += 1
+        return pickle.loads(row[0])
+
+    def put(self, key, value):
+        self.put_many([(key, value)])
+
+    def put_many(self, items):
+        # Store several results in one transaction, then evict down to the size bound
+        now = time.time()
+        rows = []
+        for key, value in items:
+            data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+            rows.append((key, data, len(data), now, now))
+        if not rows:
+            return
+
+        self.connection.execute('BEGIN IMMEDIATE')
+        try:
+            self.connection.executemany(
+                'INSERT OR REPLACE INTO results (key, value, size, created, accessed) VALUES (?, ?, ?, ?, ?)',
+                rows)
+            self._evict()
+            self.connection.execute('COMMIT')
+        except Exception:
+            self.connection.execute('ROLLBACK')
+            raise
+
+    def _evict(self):
+        total = self.connection.execute('SELECT COALESCE(SUM(size), 0) FROM results').fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for key, size in self.connection.execute(
+                'SELECT key, size FROM results ORDER BY accessed').fetchall():
+            if total <= self.max_bytes:
+                break
+            self.connection.execute('DELETE FROM results WHERE key = ?', (key,))
+            total -= size
+            self.evictions += 1
+
+    def stats(self):
+        entries, size = self.connection.execute(
+            'SELECT COUNT(*), COALESCE(SUM(size), 0) FROM results').fetchone()
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'evictions': self.evictions,
+            'entries': entries,
+            'bytes': size,
+        }
+
+    def close(self):
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+def split_cached(cache, documents, skill, model, api_version=API_VERSION):
+    # Look up every document for one skill.
+    # Returns ({doc_id: cached result}, {doc_id: text still to be analyzed})
+    found = {}
+    missing = {}
+    for doc_id, text in documents.items():
+        result = cache.get(make_key(text, skill, model, api_version)) if cache else None
+        if result is None:
+            missing[doc_id] = text
+        else:
+            found[doc_id] = result
+    return found, missing
+
+
+def store_results(cache, documents, skill, model, results, api_version=API_VERSION):
+    # Cache successful results (errors are retried on the next run)
+    if cache is None:
+        return
+    cache.put_many([(make_key(documents[result.id], skill, model, api_version), result)
+                    for result in results if not result.is_error])
@@ -2,7 +2,12 @@ from dotenv import load_dotenv
 import os
 
 # import namespaces
+from azure.core.credentials import AzureKeyCredential
+from azure.ai.textanalytics import TextAnalyticsClient
 
+from document_loader import load_batches
+from entity_store import EntityStore
+from result_cache import API_VERSION, ResultCache, split_cached, store_results
 
 def main():
     try:
@@ -14,21 +19,55 @@ def main():
         deployment_name = os.getenv('DEPLOYMENT')
 
         # Create client using endpoint and key
+        credential = AzureKeyCredential(ai_key)
+        ai_client = TextAnalyticsClient(endpoint=ai_endpoint, credential=credential, api_version=API_VERSION)
 
+        # Ads analyzed by this project/deployment on a previous run come from the cache
+        skill = 'recognize_custom_entities'
+        model = '{}/{}'.format(project_name, deployment_name)
+        cache = ResultCache()
 
-        # Read each text file in the ads folder
-        batchedDocuments = []
+        # Recognized entities are also written to a columnar store with an inverted index
+        # (query it with query-ads.py)
+        entity_store = EntityStore('entity-store')
+
+        # Stream the text files in the ads folder in batches the service accepts per job
         ads_folder = 'ads'
-        files = os.listdir(ads_folder)
-        for file_name in files:
-            # Read the file contents
-            text = open(os.path.join(ads_folder, file_name), encoding='utf8').read()
-            batchedDocuments.append(text)
+        for documents in load_batches(ads_folder, max_documents=25):
+            document_results, missing = split_cached(cache, documents, skill, model)
+            batchedDocuments = [{'id': file_name, 'text': text} for file_name, text in missing.items()]
+
+            # Extract entities
+            if batchedDocuments:
+                operation = ai_client.begin_recognize_custom_entities(
+                    batchedDocuments,
+                    project_name=project_name,
+                    deployment_name=deployment_name
+                )
+                new_results = list(operation.result())
+                store_results(cache, documents, skill, model, new_results)
+                document_results.update({result.id: result for result in new_results})
 
-        # Extract entities
-        
-        
+            for doc in documents:
+                custom_entities_result = document_results[doc]
+                print(doc)
+                if custom_entities_result.is_error is True:
+                    print("\tError with code '{}' and message '{}'".format(
+                        custom_entities_result.error.code, custom_entities_result.error.message
+                        )
+                    )
+                elif custom_entities_result.kind == "CustomEntityRecognition":
+                    entity_store.add(doc, custom_entities_result.entities, documents[doc])
+                    for entity in custom_entities_result.entities:
+                        print(
+                            "\tEntity '{}' has category '{}' with confidence score of '{}'".format(
+                                entity.text, entity.category, entity.confidence_score
+                            )
+                        )
 
+        entity_store.close()
+        print('\nCache: {hits} hits, {misses} misses'.format(**cache.stats()))
+        cache.close()
 
     except Exception as ex:
         print(ex)
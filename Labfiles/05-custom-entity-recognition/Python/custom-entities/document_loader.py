@@ -0,0 +1,48 @@
+import fnmatch
+import os
+
+# Streams text documents from a folder in request-sized batches, so memory use and open
+# file handles stay flat however many files the folder holds
+
+
+def scan_documents(folder, pattern='*', recursive=False, root=None):
+    # Yield (document id, path) for each file matching the glob pattern, in file name order.
+    # The document id is the path relative to the top folder, with '/' separators.
+    # Only the names (and types) of one folder's entries are held at a time, for sorting.
+    root = root or folder
+    with os.scandir(folder) as entries:
+        names = sorted((entry.name, entry.is_dir(follow_symlinks=False)) for entry in entries
+                       if entry.is_dir(follow_symlinks=False) or
+                       (entry.is_file() and fnmatch.fnmatch(entry.name, pattern)))
+    for name, is_dir in names:
+        path = os.path.join(folder, name)
+        if is_dir:
+            if recursive:
+                yield from scan_documents(path, pattern, recursive, root)
+        else:
+            doc_id = os.path.relpath(path, root).replace(os.sep, '/')
+            yield doc_id, path
+
+
+def read_document(path, encoding='utf8'):
+    with open(path, encoding=encoding) as document_file:
+        return document_file.read()
+
+
+def load_batches(folder, max_documents=25, max_characters=125000, pattern='*', recursive=False, encoding='utf8'):
+    # Yield dicts of {document id: text} that respect the per-request document count and
+    # total character limits. A document longer than max_characters is sent on its own
+    # (the service reports the error for that document only).
+    batch = {}
+    characters = 0
+    for doc_id, path in scan_documents(folder, pattern, recursive):
+        text = read_document(path, encoding)
+        if batch and (len(batch) >= max_documents or characters + len(text) > max_characters):
+            yield batch
+            batch = {}
+            characters = 0
+        batch[doc_id] = text
+        characters += len(text)
+
+    if batch:
+        yield batch
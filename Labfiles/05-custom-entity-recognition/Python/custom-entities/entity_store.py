@@ -0,0 +1,291 @@
+import hashlib
+import json
+import os
+import re
+from array import array
+
+# Columnar store for recognized entities, plus an inverted index so ads can be queried
+# by entity category and text (or numeric value) without re-reading them or calling the
+# service again.
+# Rows are written as Parquet part files when pyarrow is installed; otherwise they are
+# appended to compact array-backed column files. The format is recorded in store.json
+# when the store is created, and an existing store is always opened with its own format.
+# Each ad is stored under the hash of its text. When an ad's text changes, its entities
+# are replaced in the index, and its old rows (kept in the append-only files) are
+# skipped by read().
+# The index is a JSON lines log with one record per stored ad, appended on each flush and
+# replayed on open; it's rewritten (compacted) once most of its records are out of date.
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+COLUMNS = ('doc_id', 'doc_hash', 'category', 'text', 'offset', 'length', 'confidence')
+NUMBER = re.compile(r'\d[\d,]*(?:\.\d+)?')
+
+
+def normalize(text):
+    return ' '.join(text.lower().split()).strip('.,;:!?"\'')
+
+
+def text_hash(text):
+    return hashlib.sha256(text.encode('utf8')).hexdigest()
+
+
+def parse_number(text):
+    match = NUMBER.search(text)
+    return float(match.group().replace(',', '')) if match else None
+
+
+class ParquetColumns:
+    # One Parquet file per flush, so new rows never rewrite old ones
+
+    def __init__(self, folder):
+        self.folder = folder
+        self.parts = len([name for name in os.listdir(folder) if name.endswith('.parquet')])
+
+    def write(self, rows):
+        table = pyarrow.table({column: rows[column] for column in COLUMNS})
+        path = os.path.join(self.folder, 'part-{:05d}.parquet'.format(self.parts))
+        pyarrow.parquet.write_table(table, path)
+        self.parts += 1
+
+    def read(self):
+        paths = sorted(os.path.join(self.folder, name) for name in os.listdir(self.folder)
+                       if name.endswith('.parquet'))
+        if not paths:
+            return {column: [] for column in COLUMNS}
+        table = pyarrow.concat_tables([pyarrow.parquet.read_table(path) for path in paths])
+        return table.to_pydict()
+
+
+class ArrayColumns:
+    # Numeric columns are raw typed arrays; string columns are a UTF-8 data file plus an
+    # array of end offsets (the same layout Arrow uses). All files are opened for append.
+    # The typecodes have the same size on every platform, so the files can be copied between hosts.
+    NUMERIC = {'offset': 'q', 'length': 'q', 'confidence': 'd'}
+
+    def __init__(self, folder):
+        self.folder = folder
+
+    def path(self, name):
+        return os.path.join(self.folder, name)
+
+    def write(self, rows):
+        for column in COLUMNS:
+            if column in self.NUMERIC:
+                with open(self.path(column + '.bin'), 'ab') as column_file:
+                    array(self.NUMERIC[column], rows[column]).tofile(column_file)
+                continue
+
+            data_path = self.path(column + '.data')
+            end = os.path.getsize(data_path) if os.path.exists(data_path) else 0
+            ends = array('q')
+            with open(data_path, 'ab') as data_file:
+                for value in rows[column]:
+                    encoded = value.encode('utf8')
+                    data_file.write(encoded)
+                    end += len(encoded)
+                    ends.append(end)
+            with open(self.path(column + '.ends'), 'ab') as ends_file:
+                ends.tofile(ends_file)
+
+    def read(self):
+        columns = {}
+        for column in COLUMNS:
+            if column in self.NUMERIC:
+                columns[column] = self.read_array(self.NUMERIC[column], column + '.bin').tolist()
+                continue
+
+            ends = self.read_array('q', column + '.ends')
+            data = b''
+            if ends:
+                with open(self.path(column + '.data'), 'rb') as data_file:
+                    data = data_file.read()
+            start = 0
+            values = []
+            for end in ends:
+                values.append(data[start:end].decode('utf8'))
+                start = end
+            columns[column] = values
+        return columns
+
+    def read_array(self, typecode, name):
+        values = array(typecode)
+        if os.path.exists(self.path(name)):
+            with open(self.path(name), 'rb') as column_file:
+                values.frombytes(column_file.read())
+        return values
+
+
+class EntityIndex:
+    # Maps "category|normalized text" to doc ids, and keeps the numeric value of each
+    # entity per category for range queries (for example Price below a limit).
+    # documents maps each indexed doc id to the hash of its text, and entities keeps each
+    # doc's (category, text) pairs, so a changed doc can be removed and the log rewritten.
+
+    def __init__(self):
+        self.postings = {}
+        self.numbers = {}
+        self.documents = {}
+        self.entities = {}
+        self.records = 0           # records in the log, including out-of-date ones
+
+    @staticmethod
+    def key(category, text):
+        return '{}|{}'.format(category, normalize(text))
+
+    def add(self, doc_id, doc_hash, entities):
+        # entities: [(category, text)]
+        if doc_id in self.documents:
+            self.remove(doc_id)
+        self.documents[doc_id] = doc_hash
+        self.entities[doc_id] = entities
+        for category, text in entities:
+            self.postings.setdefault(self.key(category, text), set()).add(doc_id)
+            value = parse_number(text)
+            if value is not None:
+                self.numbers.setdefault(category, {}).setdefault(doc_id, []).append(value)
+
+    def remove(self, doc_id):
+        # Forget a document's entities (only needed when its text has changed)
+        for category, text in self.entities.pop(doc_id, []):
+            key = self.key(category, text)
+            if key in self.postings:
+                self.postings[key].discard(doc_id)
+                if not self.postings[key]:
+                    del self.postings[key]
+            values = self.numbers.get(category)
+            if values is not None:
+                values.pop(doc_id, None)
+                if not values:
+                    del self.numbers[category]
+        self.documents.pop(doc_id, None)
+
+    def find(self, category, text):
+        return set(self.postings.get(self.key(category, text), ()))
+
+    def below(self, category, limit):
+        return {doc_id for doc_id, values in self.numbers.get(category, {}).items()
+                if min(values) <= limit}
+
+    def above(self, category, limit):
+        return {doc_id for doc_id, values in self.numbers.get(category, {}).items()
+                if max(values) >= limit}
+
+    def record(self, doc_id):
+        return json.dumps({'doc_id': doc_id, 'doc_hash': self.documents[doc_id],
+                           'entities': self.entities[doc_id]}, ensure_ascii=False) + '\n'
+
+    def append(self, path, doc_ids):
+        # Log the current state of the given docs
+        with open(path, 'a', encoding='utf8') as index_file:
+            for doc_id in doc_ids:
+                index_file.write(self.record(doc_id))
+        self.records += len(doc_ids)
+
+    def compact(self, path):
+        # Rewrite the log with one record per current doc
+        temp_path = path + '.tmp'
+        with open(temp_path, 'w', encoding='utf8') as index_file:
+            for doc_id in self.documents:
+                index_file.write(self.record(doc_id))
+        os.replace(temp_path, path)
+        self.records = len(self.documents)
+
+    @classmethod
+    def load(cls, path):
+        index = cls()
+        if os.path.exists(path):
+            with open(path, encoding='utf8') as index_file:
+                for line in index_file:
+                    if line.strip():
+                        entry = json.loads(line)
+                        index.add(entry['doc_id'], entry['doc_hash'], [tuple(pair) for pair in entry['entities']])
+                        index.records += 1
+        return index
+
+
+def open_columns(folder):
+    # The column backend named in the store's metadata; a new store gets Parquet when
+    # pyarrow is installed
+    metadata_path = os.path.join(folder, 'store.json')
+    if os.path.exists(metadata_path):
+        with open(metadata_path, encoding='utf8') as metadata_file:
+            store_format = json.load(metadata_file)['format']
+    else:
+        store_format = 'parquet' if pyarrow else 'arrays'
+        with open(metadata_path, 'w', encoding='utf8') as metadata_file:
+            json.dump({'format': store_format, 'columns': COLUMNS}, metadata_file)
+    if store_format == 'parquet':
+        if pyarrow is None:
+            raise RuntimeError('{} is a Parquet entity store; install pyarrow to open it'.format(folder))
+        return ParquetColumns(folder)
+    return ArrayColumns(folder)
+
+
+class EntityStore:
+
+    def __init__(self, folder='entity-store', flush_rows=10000, compact_after=1000):
+        self.folder = folder
+        self.flush_rows = flush_rows
+        self.compact_after = compact_after
+        os.makedirs(folder, exist_ok=True)
+        self.columns = open_columns(folder)
+        self.index_path = os.path.join(folder, 'index.jsonl')
+        self.index = EntityIndex.load(self.index_path)
+        self.rows = {column: [] for column in COLUMNS}
+        self.pending = 0
+        self.pending_docs = []
+
+    def add(self, doc_id, entities, text):
+        # Documents that are already stored with the same text (for example, served from
+        # the result cache on a re-run) are not appended again; a changed document
+        # replaces its earlier entities
+        doc_hash = text_hash(text)
+        if self.index.documents.get(doc_id) == doc_hash:
+            return False
+        self.index.add(doc_id, doc_hash, [(entity.category, entity.text) for entity in entities])
+        self.pending_docs.append(doc_id)
+        for entity in entities:
+            self.rows['doc_id'].append(doc_id)
+            self.rows['doc_hash'].append(doc_hash)
+            self.rows['category'].append(entity.category)
+            self.rows['text'].append(entity.text)
+            self.rows['offset'].append(entity.offset)
+            self.rows['length'].append(entity.length)
+            self.rows['confidence'].append(entity.confidence_score)
+            self.pending += 1
+        if self.pending >= self.flush_rows:
+            self.flush()
+        return True
+
+    def flush(self):
+        if self.pending:
+            self.columns.write(self.rows)
+            self.rows = {column: [] for column in COLUMNS}
+            self.pending = 0
+        if self.pending_docs:
+            self.index.append(self.index_path, list(dict.fromkeys(self.pending_docs)))
+            self.pending_docs = []
+        stale = self.index.records - len(self.index.documents)
+        if stale > max(self.compact_after, len(self.index.documents)):
+            self.index.compact(self.index_path)
+
+    def read(self):
+        # Current rows only: rows of documents whose text has since changed are left out
+        columns = self.columns.read()
+        current = [i for i, (doc_id, doc_hash) in enumerate(zip(columns['doc_id'], columns['doc_hash']))
+                   if self.index.documents.get(doc_id) == doc_hash]
+        return {column: [values[i] for i in current] for column, values in columns.items()}
+
+    def close(self):
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
@@ -0,0 +1,38 @@
+import argparse
+
+from entity_store import EntityStore
+
+# Query the entities saved by custom-entities.py without re-reading the ads or calling
+# the Language service, for example:
+#   python query-ads.py ItemForSale=bike --below Price=300
+
+
+def parse_condition(condition):
+    category, _, value = condition.partition('=')
+    return category, value
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Find ads by recognized entities')
+    parser.add_argument('matches', nargs='*', help='Category=text conditions (all must match)')
+    parser.add_argument('--below', action='append', default=[], help='Category=number upper bound')
+    parser.add_argument('--above', action='append', default=[], help='Category=number lower bound')
+    parser.add_argument('--store', default='entity-store', help='entity store folder')
+    args = parser.parse_args()
+
+    index = EntityStore(args.store).index
+    doc_ids = set(index.documents)
+    for category, text in map(parse_condition, args.matches):
+        doc_ids &= index.find(category, text)
+    for category, limit in map(parse_condition, args.below):
+        doc_ids &= index.below(category, float(limit))
+    for category, limit in map(parse_condition, args.above):
+        doc_ids &= index.above(category, float(limit))
+
+    for doc_id in sorted(doc_ids):
+        print(doc_id)
+    print('{} matching ads'.format(len(doc_ids)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+import argparse
+import os
+import tempfile
+import time
+
+from document_loader import load_batches
+from stand_in_server import StandInServer
+from translation_memory import TranslationMemory
+from translator_client import TranslatorClient
+
+# Translates the reviews folder (repeated --copies times, each copy with a changed
+# first line and a shared boilerplate signature, as real review exports have) against
+# the local stand-in, with and without the translation memory, and reports the billed
+# characters sent and the requests made
+
+SIGNATURE = ('Merci pour votre avis. Cet avis est la opinion subjective du client et non celle de la société.\n'
+             'Envoyé depuis mon téléphone.')
+
+
+def load_reviews(folder, copies):
+    reviews = []
+    for documents in load_batches(folder):
+        for doc_id, text in documents.items():
+            for copy in range(copies):
+                reviews.append('Review {} of {}\n{}\n{}'.format(copy, doc_id, text, SIGNATURE))
+    return reviews
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the translation memory against a local stand-in')
+    parser.add_argument('--copies', type=int, default=40)
+    parser.add_argument('--request-ms', type=float, default=30)
+    args = parser.parse_args()
+
+    folder = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'reviews')
+    reviews = load_reviews(folder, args.copies)
+    server = StandInServer(request_delay=args.request_ms / 1000).start()
+    translator = TranslatorClient(server.endpoint, 'key', 'region')
+    print('{} reviews, {} characters'.format(len(reviews), sum(len(text) for text in reviews)))
+
+    def translate_sentences(sentences, target_language, source_language=None):
+        results = translator.translate_texts(sentences, to=target_language, source_language=source_language)
+        return [(result['translation'], result['language']) for result in results]
+
+    def report(name, run):
+        requests, characters = server.requests, server.characters
+        start = time.perf_counter()
+        run()
+        print('{:>24}: {:4} requests, {:8} characters sent, {:6.2f} s'.format(
+            name, server.requests - requests, server.characters - characters, time.perf_counter() - start))
+
+    report('whole reviews', lambda: list(translator.translate_documents(dict(enumerate(reviews)))))
+    with tempfile.TemporaryDirectory() as temp:
+        memory = TranslationMemory(os.path.join(temp, 'memory.sqlite'))
+        report('memory (first run)', lambda: memory.translate(reviews, 'en', translate_sentences))
+        report('memory (second run)', lambda: memory.translate(reviews, 'en', translate_sentences))
+        stats = memory.stats()
+        print('hit rate {:.1%}, {} characters saved, {} sentences stored'.format(
+            stats['hit_rate'], stats['characters_saved'], stats['entries']))
+
+        # A second host starting from an exported memory
+        exported = os.path.join(temp, 'memory.jsonl')
+        memory.export_jsonl(exported)
+        shared = TranslationMemory(os.path.join(temp, 'shared.sqlite'))
+        shared.import_jsonl(exported)
+        report('imported memory', lambda: shared.translate(reviews, 'en', translate_sentences))
+        memory.close()
+        shared.close()
+
+    translator.close()
+    server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+import argparse
+import os
+import time
+
+import requests
+
+from document_loader import load_batches
+from stand_in_server import StandInServer
+from translator_client import TranslatorClient
+
+# Translates the reviews folder (repeated --copies times) against a local Translator
+# stand-in, comparing one /detect plus one /translate request per review without a
+# session with the batched, pooled TranslatorClient
+
+HEADERS = {'Ocp-Apim-Subscription-Key': 'key', 'Ocp-Apim-Subscription-Region': 'region',
+           'Content-type': 'application/json'}
+
+
+def load_reviews(folder, copies):
+    reviews = {}
+    for documents in load_batches(folder):
+        for doc_id, text in documents.items():
+            for copy in range(copies):
+                reviews['{}#{}'.format(doc_id, copy)] = text
+    return reviews
+
+
+def per_review(endpoint, reviews):
+    translations = {}
+    for doc_id, text in reviews.items():
+        response = requests.post(endpoint + '/detect', params={'api-version': '3.0'},
+                                 headers=HEADERS, json=[{'text': text}])
+        language = response.json()[0]['language']
+        if language != 'en':
+            response = requests.post(endpoint + '/translate',
+                                     params={'api-version': '3.0', 'from': language, 'to': 'en'},
+                                     headers=HEADERS, json=[{'text': text}])
+            translations[doc_id] = response.json()[0]['translations'][0]['text']
+    return translations
+
+
+def batched(endpoint, reviews):
+    translator = TranslatorClient(endpoint, 'key', 'region')
+    translations = {}
+    # translate_documents packs the reviews into requests within the service limits
+    for doc_id, result in translator.translate_documents(reviews):
+        if result['language'] != 'en':
+            translations[doc_id] = result['translation']
+    translator.close()
+    return translations
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark batched translation against a local stand-in')
+    parser.add_argument('--copies', type=int, default=40, help='times the reviews folder is repeated')
+    parser.add_argument('--connect-ms', type=float, default=20, help='simulated connection setup time')
+    parser.add_argument('--request-ms', type=float, default=30, help='simulated service time per request')
+    args = parser.parse_args()
+
+    folder = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'reviews')
+    reviews = load_reviews(folder, args.copies)
+    characters = sum(len(text) for text in reviews.values())
+    print('{} reviews, {} characters'.format(len(reviews), characters))
+
+    for name, run in (('detect + translate per review', per_review), ('batched, pooled client', batched)):
+        server = StandInServer(args.connect_ms / 1000, args.request_ms / 1000).start()
+        start = time.perf_counter()
+        translations = run(server.endpoint, reviews)
+        elapsed = time.perf_counter() - start
+        server.stop()
+        print('{:>30}: {:5} requests, {:4} connections, {:8} characters sent, {:7.2f} s, {} translated'.format(
+            name, server.requests, server.connections, server.characters, elapsed, len(translations)))
+
+
+if __name__ == "__main__":
+    main()
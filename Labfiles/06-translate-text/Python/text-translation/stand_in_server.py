@@ -0,0 +1,89 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+# A local HTTP stand-in for the Translator /detect and /translate operations, used to
+# measure the client without an Azure resource. Languages are guessed from a few common
+# words and the "translation" is the text tagged with the target language.
+# connect_delay simulates the cost of setting up a new (TLS) connection and
+# request_delay the service processing time.
+
+MARKERS = {
+    'fr': {'le', 'la', 'les', 'est', 'et', 'très', 'des', 'un', 'une', 'cet'},
+    'es': {'el', 'los', 'es', 'y', 'muy', 'una', 'con', 'pero'},
+    'it': {'il', 'gli', 'è', 'molto', 'della', 'sono'},
+}
+
+
+def detect_language(text):
+    words = set(text.lower().split())
+    scores = {language: len(words & markers) for language, markers in MARKERS.items()}
+    language = max(scores, key=scores.get)
+    return language if scores[language] >= 2 else 'en'
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+
+    def setup(self):
+        super().setup()
+        self.server.connections += 1
+        time.sleep(self.server.connect_delay)
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        params = parse_qs(url.query)
+        elements = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))))
+        time.sleep(self.server.request_delay)
+        self.server.requests += 1
+        self.server.elements += len(elements)
+        self.server.characters += sum(len(element['text']) for element in elements)
+
+        if url.path == '/detect':
+            result = [{'language': detect_language(element['text']), 'score': 1.0} for element in elements]
+        else:
+            result = []
+            for element in elements:
+                item = {'translations': [{'text': '[{}] {}'.format(to, element['text']), 'to': to}
+                                         for to in params.get('to', ['en'])]}
+                if 'from' not in params:
+                    item['detectedLanguage'] = {'language': detect_language(element['text']), 'score': 1.0}
+                result.append(item)
+
+        payload = json.dumps(result, ensure_ascii=False).encode('utf8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+class StandInServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, connect_delay=0.0, request_delay=0.0, port=0):
+        super().__init__(('127.0.0.1', port), StandInHandler)
+        self.connect_delay = connect_delay
+        self.request_delay = request_delay
+        self.connections = 0
+        self.requests = 0
+        self.elements = 0
+        self.characters = 0
+
+    @property
+    def endpoint(self):
+        return 'http://127.0.0.1:{}'.format(self.server_address[1])
+
+    def start(self):
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
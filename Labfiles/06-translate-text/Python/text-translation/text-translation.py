@@ -2,35 +2,53 @@ from dotenv import load_dotenv
 import os
 import requests, json
 
+from document_loader import load_batches
+from translator_client import TranslatorClient, MAX_ELEMENTS, MAX_CHARACTERS
+from translation_memory import TranslationMemory
+
 def main():
     global translator_endpoint
     global cog_key
     global cog_region
+    global translator
+    global memory
 
     try:
         # Get Configuration Settings
         load_dotenv()
         cog_key = os.getenv('COG_SERVICE_KEY')
         cog_region = os.getenv('COG_SERVICE_REGION')
-        translator_endpoint = 'https://api.cognitive.microsofttranslator.com'
+        translator_endpoint = os.getenv('TRANSLATOR_ENDPOINT', 'https://api.cognitive.microsofttranslator.com')
+
+        # One client (and pooled connection) for every request
+        translator = TranslatorClient(translator_endpoint, cog_key, cog_region)
+
+        # Sentences translated before (in this or earlier runs) aren't sent again
+        memory = TranslationMemory('translation-memory.sqlite')
 
-        # Analyze each text file in the reviews folder
+        # Analyze each text file in the reviews folder, streaming the files a batch at a time.
+        # The new sentences of each batch are translated with as few requests as possible, and
+        # the language detected by the translate operation is used instead of a separate
+        # detect request.
         reviews_folder = 'reviews'
-        for file_name in os.listdir(reviews_folder):
-            # Read the file contents
-            print('\n-------------\n' + file_name)
-            text = open(os.path.join(reviews_folder, file_name), encoding='utf8').read()
-            print('\n' + text)
-
-            # Detect the language
-            language = GetLanguage(text)
-            print('Language:',language)
-
-            # Translate if not already English
-            if language != 'en':
-                translation = Translate(text, language)
-                print("\nTranslation:\n{}".format(translation))
-                
+        for documents in load_batches(reviews_folder, max_documents=MAX_ELEMENTS, max_characters=MAX_CHARACTERS):
+            results = memory.translate(list(documents.values()), 'en', TranslateSentences)
+            for file_name, result in zip(documents, results):
+                print('\n-------------\n' + file_name)
+                print('\n' + documents[file_name])
+
+                language = result['language']
+                print('Language:',language)
+
+                # Show the translation if not already English
+                if language != 'en':
+                    print("\nTranslation:\n{}".format(result['translation']))
+
+        print('\nTranslator requests:', translator.requests)
+        print('Translation memory:', memory.stats())
+        translator.close()
+        memory.close()
+
     except Exception as ex:
         print(ex)
 
@@ -39,7 +57,7 @@ def GetLanguage(text):
     language = 'en'
 
     # Use the Azure AI Translator detect function
-
+    language = translator.detect(text)
 
     # Return the language
     return language
@@ -47,11 +65,16 @@ def GetLanguage(text):
 def Translate(text, source_language):
     translation = ''
 
-    # Use the Azure AI Translator translate function
-
+    # Use the Azure AI Translator translate function (through the translation memory)
+    translation = memory.translate([text], 'en', TranslateSentences, source=source_language)[0]['translation']
 
     # Return the translation
     return translation
 
+def TranslateSentences(sentences, target_language, source_language=None):
+    # One translate request for the translation memory: [(translation, detected language)]
+    results = translator.translate_texts(sentences, to=target_language, source_language=source_language)
+    return [(result['translation'], result['language']) for result in results]
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,30 @@
+import argparse
+
+from translation_memory import TranslationMemory
+
+# Share a translation memory between hosts: export it to JSONL on one and import the
+# file on another
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Manage the translation memory')
+    parser.add_argument('--path', default='translation-memory.sqlite', help='translation memory database')
+    commands = parser.add_subparsers(dest='command', required=True)
+    commands.add_parser('stats', help='show the number of sentences stored')
+    export_parser = commands.add_parser('export', help='write every sentence to a JSONL file')
+    export_parser.add_argument('file')
+    import_parser = commands.add_parser('import', help='merge sentences from a JSONL file')
+    import_parser.add_argument('file')
+    args = parser.parse_args()
+
+    with TranslationMemory(args.path) as memory:
+        if args.command == 'export':
+            print('Exported {} sentences to {}'.format(memory.export_jsonl(args.file), args.file))
+        elif args.command == 'import':
+            print('Imported {} sentences from {}'.format(memory.import_jsonl(args.file), args.file))
+        stats = memory.stats()
+        print('{} sentences, {} bytes'.format(stats['entries'], stats['bytes']))
+
+
+if __name__ == "__main__":
+    main()
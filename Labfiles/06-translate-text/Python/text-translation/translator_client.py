@@ -0,0 +1,90 @@
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Azure AI Translator client that packs many texts into each /translate request and
+# reuses pooled keep-alive connections. No `from` language is sent, so the service
+# detects each text's language and returns it inline (detectedLanguage), which makes a
+# separate /detect request unnecessary.
+
+API_VERSION = '3.0'
+# Per-request limits of the /translate operation
+MAX_ELEMENTS = 1000
+MAX_CHARACTERS = 50000
+
+
+def create_session(pool_size=10, retries=3):
+    session = requests.Session()
+    # Retry throttled and transient failures; the request body is the same every time
+    retry = Retry(total=retries, backoff_factor=0.5, status_forcelist=(429, 500, 502, 503, 504),
+                  allowed_methods=None, respect_retry_after_header=True, raise_on_status=False)
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=retry)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
+def make_batches(items, max_elements=MAX_ELEMENTS, max_characters=MAX_CHARACTERS):
+    # Split (id, text) pairs into lists that respect the element and character limits
+    batch = []
+    characters = 0
+    for doc_id, text in items:
+        if batch and (len(batch) >= max_elements or characters + len(text) > max_characters):
+            yield batch
+            batch = []
+            characters = 0
+        batch.append((doc_id, text))
+        characters += len(text)
+    if batch:
+        yield batch
+
+
+class TranslatorClient:
+
+    def __init__(self, endpoint, key, region, pool_size=10, session=None, timeout=30):
+        self.endpoint = endpoint.rstrip('/')
+        self.headers = {
+            'Ocp-Apim-Subscription-Key': key,
+            'Ocp-Apim-Subscription-Region': region,
+            'Content-type': 'application/json',
+        }
+        self.session = session or create_session(pool_size)
+        self.timeout = timeout
+        self.requests = 0
+        self.characters = 0
+
+    def post(self, path, params, texts):
+        self.requests += 1
+        self.characters += sum(len(text) for text in texts)
+        response = self.session.post(self.endpoint + path, params=params, headers=self.headers,
+                                     json=[{'text': text} for text in texts], timeout=self.timeout)
+        response.raise_for_status()
+        return response.json()
+
+    def translate_texts(self, texts, to='en', source_language=None):
+        # One request: [{'language', 'score', 'translation'}] in the same order as texts
+        params = {'api-version': API_VERSION, 'to': to}
+        if source_language:
+            params['from'] = source_language
+        results = []
+        for item in self.post('/translate', params, texts):
+            detected = item.get('detectedLanguage', {})
+            results.append({
+                'language': detected.get('language', source_language),
+                'score': detected.get('score'),
+                'translation': item['translations'][0]['text'],
+            })
+        return results
+
+    def translate_documents(self, documents, to='en'):
+        # documents: {id: text}; yields (id, result) using as few requests as the limits allow
+        for batch in make_batches(documents.items()):
+            results = self.translate_texts([text for _, text in batch], to)
+            for (doc_id, _), result in zip(batch, results):
+                yield doc_id, result
+
+    def detect(self, text):
+        return self.post('/detect', {'api-version': API_VERSION}, [text])[0]['language']
+
+    def close(self):
+        self.session.close()
@@ -2,7 +2,10 @@ from dotenv import load_dotenv
 import os
 
 # import namespaces
+from azure.core.credentials import AzureKeyCredential
+from azure.ai.translation.text import TextTranslationClient
 
+from translation_memory import TranslationMemory
 
 
 def main():
@@ -13,20 +16,53 @@ def main():
         translatorKey = os.getenv('TRANSLATOR_KEY')
 
         # Create client using endpoint and key
-        
+        credential = AzureKeyCredential(translatorKey)
+        client = TextTranslationClient(credential=credential, region=translatorRegion)
 
+        # Sentences translated before (in this or earlier runs) aren't sent again
+        memory = TranslationMemory('translation-memory.sqlite')
+
+        def translate_sentences(sentences, target_language, source_language=None):
+            # One translate request for the translation memory: [(translation, detected language)]
+            response = client.translate(body=sentences, to_language=[target_language], from_language=source_language)
+            return [(item.translations[0].text,
+                     item.detected_language.language if item.detected_language else source_language)
+                    for item in response]
 
-        ## Choose target language
 
+        ## Choose target language
+        languagesResponse = client.get_supported_languages(scope="translation")
+        print("{} languages supported.".format(len(languagesResponse.translation)))
+        print("(See https://learn.microsoft.com/azure/ai-services/translator/language-support#translation)")
+        print("Enter a target language code for translation (for example, 'en'):")
+        targetLanguage = "xx"
+        supportedLanguage = False
+        while supportedLanguage == False:
+            targetLanguage = input()
+            if targetLanguage in languagesResponse.translation.keys():
+                supportedLanguage = True
+            else:
+                print("{} is not a supported language.".format(targetLanguage))
 
 
         # Translate text
+        inputText = ""
+        while inputText.lower() != "quit":
+            inputText = input("Enter text to translate ('quit' to exit):")
+            if inputText != "quit":
+                if not inputText.strip():
+                    # Nothing to translate (and no language to detect)
+                    continue
+                translation = memory.translate([inputText], targetLanguage, translate_sentences)[0]
+                print("'{}' was translated from {} to {} as '{}'.".format(
+                    inputText, translation['language'], targetLanguage, translation['translation']))
 
-
+        print('Translation memory:', memory.stats())
+        memory.close()
 
     except Exception as ex:
         print(ex)
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
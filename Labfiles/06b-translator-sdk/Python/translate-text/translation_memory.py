@@ -0,0 +1,221 @@
+import json
+import os
+import re
+import sqlite3
+import time
+
+# Translation memory: texts are split into sentences, and each sentence's translation is
+# kept in a persistent cache keyed by (source language, target language, normalized
+# sentence). Only sentences that aren't in the memory are sent to the service (once each,
+# however often they repeat), and each text is reassembled from its sentence translations
+# with the original spacing and line breaks.
+# The store is a SQLite database in WAL mode with a size bound; the least recently used
+# sentences are evicted first. Memories can be exported to and imported from JSONL, so a
+# memory built on one host can be shared with others.
+# When the source language isn't given, sentences are keyed with AUTO and the language the
+# service detected is stored with each translation.
+
+AUTO = ''
+SENTENCE_BREAK = re.compile(r'((?<=[.!?。！？])\s+|\s*\n\s*)')
+# Per-request limits of the Translator service
+MAX_ELEMENTS = 1000
+MAX_CHARACTERS = 50000
+
+
+def normalize(sentence):
+    return ' '.join(sentence.split())
+
+
+def split_sentences(text):
+    # [(sentence, separator that follows it)]; joining them gives back the text
+    parts = SENTENCE_BREAK.split(text)
+    parts.append('')
+    return [(parts[i], parts[i + 1]) for i in range(0, len(parts) - 1, 2)]
+
+
+def make_batches(sentences, max_elements=MAX_ELEMENTS, max_characters=MAX_CHARACTERS):
+    batch = []
+    characters = 0
+    for sentence in sentences:
+        if batch and (len(batch) >= max_elements or characters + len(sentence) > max_characters):
+            yield batch
+            batch = []
+            characters = 0
+        batch.append(sentence)
+        characters += len(sentence)
+    if batch:
+        yield batch
+
+
+class TranslationMemory:
+
+    def __init__(self, path='translation-memory.sqlite', max_bytes=64 * 1024 * 1024):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.characters_saved = 0
+        self.characters_sent = 0
+        self.evictions = 0
+
+        folder = os.path.dirname(os.path.abspath(path))
+        os.makedirs(folder, exist_ok=True)
+        self.connection = sqlite3.connect(path, timeout=30, isolation_level=None)
+        self.connection.execute('PRAGMA journal_mode=WAL')
+        self.connection.execute('PRAGMA synchronous=NORMAL')
+        self.connection.execute('''
+            CREATE TABLE IF NOT EXISTS sentences (
+                source TEXT NOT NULL,
+                target TEXT NOT NULL,
+                sentence TEXT NOT NULL,
+                translation TEXT NOT NULL,
+                language TEXT,
+                size INTEGER NOT NULL,
+                accessed REAL NOT NULL,
+                PRIMARY KEY (source, target, sentence)
+            )''')
+        self.connection.execute('CREATE INDEX IF NOT EXISTS sentences_accessed ON sentences (accessed)')
+
+    def lookup(self, source, target, sentences):
+        # {sentence: (translation, detected language)} for the sentences in the memory
+        found = {}
+        sentences = list(sentences)
+        for start in range(0, len(sentences), 500):
+            chunk = sentences[start:start + 500]
+            rows = self.connection.execute(
+                'SELECT sentence, translation, language FROM sentences WHERE source = ? AND target = ? '
+                'AND sentence IN ({})'.format(','.join('?' * len(chunk))),
+                [source, target] + chunk).fetchall()
+            for sentence, translation, language in rows:
+                found[sentence] = (translation, language)
+        if found:
+            now = time.time()
+            self.connection.executemany(
+                'UPDATE sentences SET accessed = ? WHERE source = ? AND target = ? AND sentence = ?',
+                [(now, source, target, sentence) for sentence in found])
+        return found
+
+    def store(self, source, target, translations, accessed=None):
+        # translations: {sentence: (translation, detected language)}
+        now = accessed or time.time()
+        rows = [(source, target, sentence, translation, language,
+                 len(sentence.encode('utf8')) + len(translation.encode('utf8')), now)
+                for sentence, (translation, language) in translations.items()]
+        if not rows:
+            return
+        self.connection.execute('BEGIN IMMEDIATE')
+        try:
+            self.connection.executemany(
+                'INSERT OR REPLACE INTO sentences (source, target, sentence, translation, language, size, accessed) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?)', rows)
+            self._evict()
+            self.connection.execute('COMMIT')
+        except Exception:
+            self.connection.execute('ROLLBACK')
+            raise
+
+    def _evict(self):
+        total = self.connection.execute('SELECT COALESCE(SUM(size), 0) FROM sentences').fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for rowid, size in self.connection.execute(
+                'SELECT rowid, size FROM sentences ORDER BY accessed').fetchall():
+            if total <= self.max_bytes:
+                break
+            self.connection.execute('DELETE FROM sentences WHERE rowid = ?', (rowid,))
+            total -= size
+            self.evictions += 1
+
+    def translate(self, texts, target, translate, source=None):
+        # translate(sentences, target, source) -> [(translation, detected language)] sends one
+        # request (it's called once per batch of at most MAX_ELEMENTS / MAX_CHARACTERS).
+        # Returns [{'language', 'translation'}] in the same order as texts; a text's language
+        # is the language detected for most of its characters.
+        source_key = source or AUTO
+        split_texts = [split_sentences(text) for text in texts]
+        wanted = list(dict.fromkeys(normalize(sentence) for parts in split_texts for sentence, _ in parts
+                                    if sentence.strip()))
+        known = self.lookup(source_key, target, wanted)
+
+        missing = [sentence for sentence in wanted if sentence not in known]
+        translated = {}
+        for batch in make_batches(missing):
+            self.characters_sent += sum(len(sentence) for sentence in batch)
+            for sentence, result in zip(batch, translate(batch, target, source)):
+                translated[sentence] = result
+        self.store(source_key, target, translated)
+        known.update(translated)
+
+        results = []
+        for parts in split_texts:
+            output = []
+            languages = {}
+            for sentence, separator in parts:
+                key = normalize(sentence)
+                if not key:
+                    output.append(sentence + separator)
+                    continue
+                translation, language = known[key]
+                if key in translated:
+                    self.misses += 1
+                    translated.pop(key)
+                else:
+                    self.hits += 1
+                    self.characters_saved += len(key)
+                languages[language] = languages.get(language, 0) + len(key)
+                # The whitespace around the sentence isn't part of its key, so put it back
+                leading = sentence[:len(sentence) - len(sentence.lstrip())]
+                trailing = sentence[len(sentence.rstrip()):]
+                output.append(leading + translation + trailing + separator)
+            language = max(languages, key=languages.get) if languages else source
+            results.append({'language': language, 'translation': ''.join(output)})
+        return results
+
+    def export_jsonl(self, path):
+        # Write every sentence to a JSONL file and return the number written
+        count = 0
+        with open(path, 'w', encoding='utf8') as out_file:
+            for source, target, sentence, translation, language in self.connection.execute(
+                    'SELECT source, target, sentence, translation, language FROM sentences ORDER BY accessed'):
+                out_file.write(json.dumps({'source': source, 'target': target, 'sentence': sentence,
+                                           'translation': translation, 'language': language},
+                                          ensure_ascii=False) + '\n')
+                count += 1
+        return count
+
+    def import_jsonl(self, path):
+        # Merge sentences exported by export_jsonl (imported entries replace local ones)
+        groups = {}
+        with open(path, encoding='utf8') as in_file:
+            for line in in_file:
+                if line.strip():
+                    entry = json.loads(line)
+                    groups.setdefault((entry['source'], entry['target']), {})[normalize(entry['sentence'])] = (
+                        entry['translation'], entry.get('language'))
+        for (source, target), translations in groups.items():
+            self.store(source, target, translations)
+        return sum(len(translations) for translations in groups.values())
+
+    def stats(self):
+        entries, size = self.connection.execute(
+            'SELECT COUNT(*), COALESCE(SUM(size), 0) FROM sentences').fetchone()
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'characters_saved': self.characters_saved,
+            'characters_sent': self.characters_sent,
+            'evictions': self.evictions,
+            'entries': entries,
+            'bytes': size,
+        }
+
+    def close(self):
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
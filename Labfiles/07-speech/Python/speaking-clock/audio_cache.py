@@ -0,0 +1,125 @@
+import hashlib
+import json
+import mmap
+import os
+import re
+import threading
+from collections import OrderedDict
+
+# Disk cache of synthesized audio, so phrases that repeat (greetings, fixed suffixes,
+# the persona's recurring sentences) play without waiting for the Speech service.
+# Each entry is a WAV file named by a hash of the normalized SSML, the voice and the
+# output format. The total size is bounded; the least recently played files are
+# removed first (the file modification time records the last use, so the order
+# survives restarts). Cached audio is read through a memory map instead of being
+# copied into a new buffer.
+
+SPACES = re.compile(r'\s+')
+TAG_SPACES = re.compile(r'\s*(/?>|<)\s*')
+
+
+def normalize_ssml(ssml):
+    # Whitespace between and around tags doesn't change the audio
+    return TAG_SPACES.sub(r'\1', SPACES.sub(' ', ssml)).strip()
+
+
+def make_key(ssml, voice, output_format):
+    payload = json.dumps([normalize_ssml(ssml), voice, str(output_format)], ensure_ascii=False)
+    return hashlib.sha256(payload.encode('utf8')).hexdigest()
+
+
+class AudioCache:
+
+    def __init__(self, folder='audio-cache', max_bytes=64 * 1024 * 1024):
+        self.folder = folder
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.bytes_served = 0
+        os.makedirs(folder, exist_ok=True)
+
+        # key -> size, least recently used first
+        self.entries = OrderedDict()
+        files = []
+        with os.scandir(folder) as scan:
+            for entry in scan:
+                if entry.is_file() and entry.name.endswith('.wav'):
+                    stat = entry.stat()
+                    files.append((stat.st_mtime, entry.name[:-4], stat.st_size))
+        for _, key, size in sorted(files):
+            self.entries[key] = size
+        self.size = sum(self.entries.values())
+
+    def path(self, key):
+        return os.path.join(self.folder, key + '.wav')
+
+    def lookup(self, key):
+        # Path of the cached audio (marked as just used), or None
+        path = self.path(key)
+        with self.lock:
+            size = self.entries.get(key)
+        try:
+            if size is None:
+                raise FileNotFoundError(path)
+            os.utime(path)
+        except FileNotFoundError:
+            with self.lock:
+                # The file may have been removed by another process sharing the folder
+                if self.entries.pop(key, None) is not None:
+                    self.size -= size
+                self.misses += 1
+            return None
+
+        with self.lock:
+            if key in self.entries:
+                self.entries.move_to_end(key)
+            self.hits += 1
+            self.bytes_served += size
+        return path
+
+    def read(self, key):
+        # Cached audio as a read-only memory map, or None
+        path = self.lookup(key)
+        if path is None:
+            return None
+        with open(path, 'rb') as audio_file:
+            return mmap.mmap(audio_file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def put(self, key, audio):
+        # Store audio (bytes) and return the path of the cached file
+        path = self.path(key)
+        temp_path = '{}.{}.{}.tmp'.format(path, os.getpid(), threading.get_ident())
+        with open(temp_path, 'wb') as audio_file:
+            audio_file.write(audio)
+        os.replace(temp_path, path)
+
+        with self.lock:
+            self.size += len(audio) - self.entries.get(key, 0)
+            self.entries[key] = len(audio)
+            self.entries.move_to_end(key)
+            evicted = []
+            while self.size > self.max_bytes and len(self.entries) > 1:
+                old_key, old_size = self.entries.popitem(last=False)
+                self.size -= old_size
+                self.evictions += 1
+                evicted.append(old_key)
+        for old_key in evicted:
+            try:
+                os.remove(self.path(old_key))
+            except FileNotFoundError:
+                pass
+        return path
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            'entries': len(self.entries),
+            'bytes': self.size,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'bytes_served': self.bytes_served,
+            'evictions': self.evictions,
+        }
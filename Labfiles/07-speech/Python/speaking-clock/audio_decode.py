@@ -0,0 +1,81 @@
+import mmap
+import os
+import struct
+import time
+
+import numpy as np
+
+# WAV decoding for batch transcription: 16-bit PCM files of any sample rate and channel
+# count are mixed down to mono and resampled to the rate the recognizer expects.
+# Files larger than MMAP_THRESHOLD are memory-mapped, so the samples are read straight
+# from the page cache instead of being copied into a buffer first.
+# decode_file is a top-level function so it can run in a process pool.
+
+TARGET_RATE = 16000
+MMAP_THRESHOLD = 1024 * 1024
+
+
+def parse_wav(buffer):
+    # (channels, sample rate, bytes per sample, data offset, data size) of a RIFF/WAVE buffer
+    if len(buffer) < 12 or buffer[0:4] != b'RIFF' or buffer[8:12] != b'WAVE':
+        raise ValueError('Not a WAV file')
+    fmt = None
+    offset = 12
+    while offset + 8 <= len(buffer):
+        chunk_id = buffer[offset:offset + 4]
+        chunk_size, = struct.unpack_from('<I', buffer, offset + 4)
+        body = offset + 8
+        if chunk_id == b'fmt ':
+            fmt = struct.unpack_from('<HHIIHH', buffer, body)
+        elif chunk_id == b'data':
+            if fmt is None:
+                raise ValueError('WAV data chunk before fmt chunk')
+            audio_format, channels, rate, _, _, bits = fmt
+            if audio_format not in (1, 0xFFFE) or bits != 16:
+                raise ValueError('Only 16-bit PCM WAV files are supported')
+            # Recorders that stream to disk may leave the size unset
+            size = min(chunk_size, len(buffer) - body)
+            return channels, rate, bits // 8, body, size
+        offset = body + chunk_size + (chunk_size & 1)
+    raise ValueError('WAV file has no data chunk')
+
+
+def to_mono(buffer, channels, offset, size):
+    samples = np.frombuffer(buffer, dtype='<i2', count=size // 2 // channels * channels, offset=offset)
+    if channels == 1:
+        return samples.astype(np.float32)
+    return samples.reshape(-1, channels).mean(axis=1, dtype=np.float32)
+
+
+def resample(samples, rate, target_rate=TARGET_RATE):
+    # Linear interpolation onto the target rate's sample times
+    if rate == target_rate or len(samples) == 0:
+        return samples
+    count = int(len(samples) * target_rate / rate)
+    positions = np.arange(count, dtype=np.float64) * (rate / target_rate)
+    return np.interp(positions, np.arange(len(samples)), samples).astype(np.float32)
+
+
+def decode_file(path, target_rate=TARGET_RATE, mmap_threshold=MMAP_THRESHOLD):
+    # Returns {'path', 'pcm' (16-bit mono bytes at target_rate), 'rate', 'audio_seconds', 'decode_ms'}
+    start = time.perf_counter()
+    with open(path, 'rb') as audio_file:
+        if os.fstat(audio_file.fileno()).st_size >= mmap_threshold:
+            buffer = mmap.mmap(audio_file.fileno(), 0, access=mmap.ACCESS_READ)
+        else:
+            buffer = audio_file.read()
+    try:
+        channels, rate, _, offset, size = parse_wav(buffer)
+        mono = to_mono(buffer, channels, offset, size)
+    finally:
+        if isinstance(buffer, mmap.mmap):
+            buffer.close()
+    samples = resample(mono, rate, target_rate)
+    pcm = np.clip(np.rint(samples), -32768, 32767).astype('<i2').tobytes()
+    return {
+        'path': path,
+        'pcm': pcm,
+        'rate': target_rate,
+        'audio_seconds': len(samples) / target_rate,
+        'decode_ms': (time.perf_counter() - start) * 1000,
+    }
@@ -0,0 +1,56 @@
+import argparse
+import os
+import time
+
+from dotenv import load_dotenv
+import azure.cognitiveservices.speech as speech_sdk
+
+from batch_transcriber import find_wavs, transcribe_files, write_jsonl
+from streaming_recognizer import StreamingTranscriber
+from silence_trim import SilenceTrimmer
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Transcribe a folder of WAV recordings')
+    parser.add_argument('folder', help='folder with the .wav files')
+    parser.add_argument('--pattern', default='*.wav')
+    parser.add_argument('--recursive', action='store_true')
+    parser.add_argument('--output', default='transcripts.jsonl')
+    parser.add_argument('--decoders', type=int, default=None, help='decoding processes (default: one per CPU)')
+    parser.add_argument('--recognizers', type=int, default=4, help='concurrent recognition sessions')
+    parser.add_argument('--trim', action='store_true', help='cut leading and trailing silence before recognition')
+    parser.add_argument('--threshold-db', type=float, default=None,
+                        help='speech level in dBFS (default: relative to each file\'s noise floor)')
+    parser.add_argument('--margin-db', type=float, default=15.0, help='speech level above the noise floor')
+    parser.add_argument('--padding-ms', type=int, default=250, help='audio kept around the speech')
+    args = parser.parse_args()
+
+    try:
+        # Get Configuration Settings
+        load_dotenv()
+        ai_key = os.getenv('SPEECH_KEY')
+        ai_region = os.getenv('SPEECH_REGION')
+
+        # Configure speech service
+        speech_config = speech_sdk.SpeechConfig(ai_key, ai_region)
+        print('Ready to use speech service in:', speech_config.region)
+
+        trimmer = None
+        if args.trim:
+            trimmer = SilenceTrimmer(threshold_db=args.threshold_db, margin_db=args.margin_db,
+                                     padding_ms=args.padding_ms)
+        transcriber = StreamingTranscriber(speech_config, trimmer=trimmer)
+        paths = find_wavs(args.folder, args.pattern, args.recursive)
+        start = time.perf_counter()
+        results = transcribe_files(paths, transcriber, decoders=args.decoders, recognizers=args.recognizers)
+        count = write_jsonl(results, args.output)
+        print('{} files transcribed to {} in {:.1f} s'.format(count, args.output, time.perf_counter() - start))
+        if trimmer:
+            print('Silence removed: {seconds_removed:.1f} of {seconds_in:.1f} s'.format(**trimmer.stats()))
+
+    except Exception as ex:
+        print(ex)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+import fnmatch
+import json
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+
+from audio_decode import TARGET_RATE, decode_file
+
+# Batch transcription of folders of WAV recordings. Files are decoded and resampled in
+# a process pool (so NumPy work on one file doesn't hold up the others) and the decoded
+# audio is handed to a bounded number of concurrent recognizers. At most `window` files
+# are decoded or being recognized at any time, so memory stays bounded however large
+# the folder is. Results are yielded as files finish.
+
+
+def find_wavs(folder, pattern='*.wav', recursive=False):
+    for root, dirs, files in os.walk(folder):
+        for name in sorted(files):
+            if fnmatch.fnmatch(name.lower(), pattern.lower()):
+                yield os.path.join(root, name)
+        if not recursive:
+            break
+        dirs.sort()
+
+
+def transcribe_files(paths, transcriber, decoders=None, recognizers=4, window=None, target_rate=TARGET_RATE):
+    # transcriber is a StreamingTranscriber (transcribe_pcm is called from worker threads)
+    window = window or recognizers * 2
+    paths = iter(paths)
+    submitted = {}
+    decoding = set()
+    recognizing = set()
+
+    with ProcessPoolExecutor(max_workers=decoders) as decode_pool, \
+            ThreadPoolExecutor(max_workers=recognizers) as recognize_pool:
+
+        def fill():
+            while len(decoding) + len(recognizing) < window:
+                path = next(paths, None)
+                if path is None:
+                    return
+                future = decode_pool.submit(decode_file, path, target_rate)
+                submitted[future] = (path, time.perf_counter())
+                decoding.add(future)
+
+        fill()
+        while decoding or recognizing:
+            done, _ = wait(decoding | recognizing, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future in decoding:
+                    decoding.remove(future)
+                    path, started = submitted.pop(future)
+                    try:
+                        decoded = future.result()
+                    except Exception as ex:
+                        yield make_result(path, started, error=str(ex))
+                        continue
+                    recognition = recognize_pool.submit(
+                        transcriber.transcribe_pcm, decoded['pcm'], decoded['rate'], path=path)
+                    submitted[recognition] = (path, started, decoded['decode_ms'])
+                    recognizing.add(recognition)
+                else:
+                    recognizing.remove(future)
+                    path, started, decode_ms = submitted.pop(future)
+                    try:
+                        recognized = future.result()
+                    except Exception as ex:
+                        yield make_result(path, started, decode_ms, error=str(ex))
+                        continue
+                    yield make_result(path, started, decode_ms, recognized)
+            fill()
+
+
+def make_result(path, started, decode_ms=None, recognized=None, error=None):
+    recognized = recognized or {}
+    return {
+        'path': path,
+        'text': recognized.get('text', ''),
+        'audio_seconds': recognized.get('audio_seconds'),
+        'trimmed_seconds': recognized.get('trimmed_seconds'),
+        'decode_ms': decode_ms,
+        'recognize_ms': recognized.get('final_ms'),
+        'latency_ms': (time.perf_counter() - started) * 1000,
+        'error': error or recognized.get('error'),
+    }
+
+
+def write_jsonl(results, output):
+    # Writes each result as it arrives and returns the number written
+    count = 0
+    with open(output, 'w', encoding='utf8') as out_file:
+        for result in results:
+            out_file.write(json.dumps(result, ensure_ascii=False) + '\n')
+            out_file.flush()
+            count += 1
+    return count
@@ -0,0 +1,68 @@
+import argparse
+import random
+import tempfile
+import time
+
+from audio_cache import AudioCache, make_key
+
+# Replays a session in which some phrases repeat (greetings, fixed suffixes, recurring
+# sentences) and compares synthesizing every phrase with serving repeats from the audio
+# cache, using a fake synthesizer that takes --synthesis-ms and returns --audio-kb of audio
+
+VOICE = 'es-ES-IsidoraMultilingualNeural'
+FORMAT = 'Riff24Khz16BitMonoPcm'
+ENVELOPE = "<speak version='1.0' xml:lang='es-ES'><voice name='{}'>{{}}</voice></speak>".format(VOICE)
+
+
+def make_session(phrases, distinct, seed=1):
+    # Popular phrases repeat much more often than the rest (Zipf-like)
+    rng = random.Random(seed)
+    weights = [1 / (rank + 1) for rank in range(distinct)]
+    choices = rng.choices(range(distinct), weights=weights, k=phrases)
+    return [ENVELOPE.format('<prosody rate="medium">Frase recurrente {}</prosody>'.format(i)) for i in choices]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the text-to-speech audio cache')
+    parser.add_argument('--phrases', type=int, default=200)
+    parser.add_argument('--distinct', type=int, default=40)
+    parser.add_argument('--synthesis-ms', type=float, default=250)
+    parser.add_argument('--audio-kb', type=int, default=150)
+    parser.add_argument('--max-mb', type=float, default=64)
+    args = parser.parse_args()
+
+    session = make_session(args.phrases, args.distinct)
+    audio = bytes(args.audio_kb * 1024)
+
+    def synthesize(ssml):
+        time.sleep(args.synthesis_ms / 1000)
+        return audio
+
+    uncached = len(session) * args.synthesis_ms / 1000
+
+    with tempfile.TemporaryDirectory() as folder:
+        cache = AudioCache(folder, max_bytes=int(args.max_mb * 1024 * 1024))
+        served = []
+        start = time.perf_counter()
+        for ssml in session:
+            key = make_key(ssml, VOICE, FORMAT)
+            hit_start = time.perf_counter()
+            data = cache.read(key)
+            if data is None:
+                cache.put(key, synthesize(ssml))
+            else:
+                served.append(time.perf_counter() - hit_start)
+                data.close()
+        cached = time.perf_counter() - start
+        stats = cache.stats()
+
+    print('{} phrases, {} distinct, {:.0f} ms synthesis'.format(args.phrases, args.distinct, args.synthesis_ms))
+    print('  synthesize every phrase: {:8.2f} s'.format(uncached))
+    print('  with audio cache:        {:8.2f} s'.format(cached))
+    print('  hit rate {:.1%}, {:.1f} MB served, {} evictions, {:.3f} ms per hit'.format(
+        stats['hit_rate'], stats['bytes_served'] / 1024 / 1024, stats['evictions'],
+        sum(served) / len(served) * 1000 if served else 0.0))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+import argparse
+import os
+import shutil
+import tempfile
+import time
+import wave
+
+import numpy as np
+
+from batch_transcriber import find_wavs, transcribe_files, write_jsonl
+from fakes import fake_recognizer_factory
+from streaming_recognizer import StreamingTranscriber
+
+# Throughput of the batch transcriber over a folder of generated 48 kHz stereo
+# recordings (plus copies of time.wav), with a fake recognizer so it runs offline.
+# Reports files per second and the real-time factor (processing time / audio time).
+
+
+def write_wav(path, seconds, rate=48000, channels=2, seed=0):
+    rng = np.random.default_rng(seed)
+    t = np.arange(int(seconds * rate)) / rate
+    tone = 3000 * np.sin(2 * np.pi * 220 * t) + rng.normal(0, 200, len(t))
+    samples = np.repeat(tone[:, None], channels, axis=1).astype('<i2')
+    with wave.open(path, 'wb') as wav:
+        wav.setnchannels(channels)
+        wav.setsampwidth(2)
+        wav.setframerate(rate)
+        wav.writeframes(samples.tobytes())
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark batch transcription with a fake recognizer')
+    parser.add_argument('--files', type=int, default=24)
+    parser.add_argument('--seconds', type=float, nargs=2, default=[5, 30], help='range of recording lengths')
+    parser.add_argument('--final-latency-ms', type=float, default=200)
+    parser.add_argument('--runs', nargs='+', default=['1x1', '2x4', '4x8'], help='decoders x recognizers')
+    args = parser.parse_args()
+
+    source = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'time.wav')
+    create = fake_recognizer_factory('What time is it?', seconds_per_word=0.3,
+                                     final_latency=args.final_latency_ms / 1000)
+    transcriber = StreamingTranscriber(create=create)
+    rng = np.random.default_rng(1)
+
+    with tempfile.TemporaryDirectory() as folder:
+        for i in range(args.files):
+            path = os.path.join(folder, 'command-{:03d}.wav'.format(i))
+            if i % 4 == 0:
+                shutil.copyfile(source, path)
+            else:
+                write_wav(path, rng.uniform(*args.seconds), seed=i)
+        size = sum(os.path.getsize(path) for path in find_wavs(folder))
+        print('{} files, {:.0f} MB'.format(args.files, size / 1024 / 1024))
+
+        for run in args.runs:
+            decoders, recognizers = (int(value) for value in run.split('x'))
+            output = os.path.join(folder, 'transcripts-{}.jsonl'.format(run))
+            results = []
+
+            def collect(results_iter):
+                for result in results_iter:
+                    results.append(result)
+                    yield result
+
+            start = time.perf_counter()
+            count = write_jsonl(collect(transcribe_files(
+                find_wavs(folder), transcriber, decoders=decoders, recognizers=recognizers)), output)
+            elapsed = time.perf_counter() - start
+            audio = sum(result['audio_seconds'] or 0 for result in results)
+            errors = sum(1 for result in results if result['error'])
+            latencies = sorted(result['latency_ms'] for result in results)
+            print('{:>3} decoders x {:>2} recognizers: {:6.1f} files/s, RTF {:.4f}, '
+                  'median latency {:.0f} ms, {} errors'.format(
+                      decoders, recognizers, count / elapsed, elapsed / audio,
+                      latencies[len(latencies) // 2], errors))
+
+
+if __name__ == "__main__":
+    main()
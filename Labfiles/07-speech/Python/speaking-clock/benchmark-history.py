@@ -0,0 +1,66 @@
+import argparse
+import asyncio
+import json
+import time
+
+from conversation_history import ConversationHistory, make_token_counter
+
+# Replays a long chat session and compares the unbounded messages list TalkWithOpenAI
+# used to send (re-counting every message's tokens for each request) with
+# ConversationHistory (token budget, sliding window, cached per-message counts)
+
+SYSTEM = "# Context\n- I am a hiking enthusiast named Forest who helps people discover hikes in their area.\n" * 8
+USER = "Can you suggest a hike near Mount Rainier for turn {} with a lake and a view?"
+ASSISTANT = ('<prosody rate="medium" pitch="medium" volume="medium">Te recomiendo la ruta número {} '
+             'junto al lago, con vistas al glaciar y unos ocho kilómetros de recorrido.</prosody>') * 6
+
+
+async def summarize(summary, messages):
+    # Stand-in for the summary completion
+    return "Summary of the earlier conversation: {} earlier messages about hikes.".format(len(messages))
+
+
+async def run(turns, max_tokens, checkpoints):
+    count = make_token_counter()
+    unbounded = [{"role": "system", "content": SYSTEM}]
+    history = ConversationHistory(SYSTEM, max_tokens=max_tokens, max_turns=1000, count_tokens=count)
+    recount_seconds = incremental_seconds = 0.0
+
+    print('{:>6} {:>16} {:>16} {:>14} {:>14}'.format(
+        'turn', 'unbounded bytes', 'windowed bytes', 'unbounded tok', 'windowed tok'))
+    for turn in range(1, turns + 1):
+        unbounded.append({"role": "user", "content": USER.format(turn)})
+        start = time.perf_counter()
+        unbounded_tokens = sum(count(message["content"]) + 4 for message in unbounded) + 3
+        recount_seconds += time.perf_counter() - start
+
+        start = time.perf_counter()
+        history.add("user", USER.format(turn))
+        windowed_tokens = history.prompt_tokens()
+        incremental_seconds += time.perf_counter() - start
+
+        messages = history.messages()
+        if turn in checkpoints:
+            print('{:>6} {:>16} {:>16} {:>14} {:>14}'.format(
+                turn, len(json.dumps(unbounded, ensure_ascii=False).encode('utf8')),
+                len(json.dumps(messages, ensure_ascii=False).encode('utf8')), unbounded_tokens, windowed_tokens))
+
+        unbounded.append({"role": "assistant", "content": ASSISTANT.format(*[turn] * 6)})
+        history.add("assistant", ASSISTANT.format(*[turn] * 6))
+        await history.summarize(summarize)
+
+    print('token counting: {:.2f} ms re-counting the whole list, {:.2f} ms incremental'.format(
+        recount_seconds * 1000, incremental_seconds * 1000))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark conversation history windowing')
+    parser.add_argument('--turns', type=int, default=100)
+    parser.add_argument('--max-tokens', type=int, default=3000)
+    args = parser.parse_args()
+    checkpoints = {1, 5, 10, 25, 50, 100, args.turns}
+    asyncio.run(run(args.turns, args.max_tokens, checkpoints))
+
+
+if __name__ == "__main__":
+    main()
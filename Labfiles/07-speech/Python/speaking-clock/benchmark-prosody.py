@@ -0,0 +1,110 @@
+import argparse
+import random
+import time
+
+from prosody_segmenter import ProsodySegmenter
+
+# Compares the previous buffer-rescanning prosody detection with the incremental
+# ProsodySegmenter on a synthetic streamed response
+
+
+def split_by_prosody(buffer):
+    # Previous implementation, kept here for comparison
+    blocks = []
+    start = 0
+    while start < len(buffer):
+        open_tag = buffer.find("<prosody", start)
+        close_tag = buffer.find("</prosody>", start)
+        if open_tag != -1 and close_tag != -1:
+            blocks.append(buffer[open_tag:close_tag + 10])
+            start = close_tag + 10
+        else:
+            break
+    return blocks
+
+
+def detect_prosody(buffer):
+    # Previous implementation, kept here for comparison
+    is_opened = False
+    i = 0
+    while i < len(buffer):
+        if buffer[i:i+8] == "<prosody":
+            is_opened = True
+            i += 8
+        elif is_opened and buffer[i:i+10] == "</prosody>":
+            return True
+        else:
+            i += 1
+    return False
+
+
+def legacy(tokens):
+    blocks = []
+    buffer = ""
+    for token in tokens:
+        buffer += token
+        if detect_prosody(buffer):
+            blocks.extend(split_by_prosody(buffer))
+            buffer = ""
+    return blocks
+
+
+def incremental(tokens):
+    segmenter = ProsodySegmenter()
+    blocks = []
+    for token in tokens:
+        blocks.extend(segmenter.feed(token))
+    segmenter.flush()
+    return blocks
+
+
+def make_stream(tokens, words_per_block, seed=1):
+    # Tokens of a few characters each, as a chat completion stream delivers them
+    random.seed(seed)
+    words = ['Hola', 'sendero', 'Rainier', 'caminata', 'bosque', 'lago', 'vista', 'montaña', 'río']
+    text = []
+    length = 0
+    while length < tokens * 4:
+        block = '<prosody rate="medium" pitch="medium" volume="medium">\n{}\n</prosody>\n'.format(
+            ' '.join(random.choice(words) for _ in range(words_per_block)))
+        text.append(block)
+        length += len(block)
+    text = ''.join(text)
+    stream = []
+    i = 0
+    while i < len(text) and len(stream) < tokens:
+        size = random.randint(1, 7)
+        stream.append(text[i:i + size])
+        i += size
+    return stream
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark prosody block detection')
+    parser.add_argument('--tokens', type=int, default=10000)
+    parser.add_argument('--words-per-block', type=int, nargs='+', default=[15, 100, 500])
+    args = parser.parse_args()
+
+    print('{:>15} {:>8} {:>8} {:>12} {:>16} {:>8}'.format(
+        'words/block', 'blocks', 'lost', 'previous ms', 'incremental ms', 'speedup'))
+    for words in args.words_per_block:
+        stream = make_stream(args.tokens, words)
+        start = time.perf_counter()
+        expected = legacy(stream)
+        legacy_seconds = time.perf_counter() - start
+        start = time.perf_counter()
+        blocks = incremental(stream)
+        incremental_seconds = time.perf_counter() - start
+        # The previous code cleared its buffer after each block, losing the start of a
+        # block that arrived in the same chunk as the previous close tag (and emitting
+        # an empty block in its place)
+        expected = [block for block in expected if block]
+        missing = [block for block in expected if block not in blocks]
+        assert not missing, 'segmenter missed blocks the previous code found'
+        print('{:>15} {:>8} {:>8} {:>12.1f} {:>16.1f} {:>7.1f}x'.format(
+            words, len(blocks), len(blocks) - len(expected), legacy_seconds * 1000, incremental_seconds * 1000,
+            legacy_seconds / incremental_seconds))
+
+
+if __name__ == "__main__":
+    main()
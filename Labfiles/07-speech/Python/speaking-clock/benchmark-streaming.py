@@ -0,0 +1,74 @@
+import argparse
+import os
+import shutil
+import tempfile
+import time
+
+from fakes import fake_recognizer_factory
+from streaming_recognizer import StreamingTranscriber
+
+# Streams copies of time.wav through StreamingTranscriber with a fake recognizer and
+# reports when the command was detected from interim results versus when the final
+# result arrived (which is when recognize_once would have returned), how soon an action
+# on the detected command starts, and the throughput of the worker pool
+
+TRANSCRIPT = 'What time is it?'
+LONG_TRANSCRIPT = 'What time is it in Tokyo and what is the date there tomorrow?'
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark continuous recognition with a fake recognizer')
+    parser.add_argument('--files', type=int, default=8)
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 4, 8])
+    parser.add_argument('--chunk-ms', type=int, default=100)
+    parser.add_argument('--final-latency-ms', type=float, default=300)
+    args = parser.parse_args()
+
+    source = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'time.wav')
+    create = fake_recognizer_factory(TRANSCRIPT, seconds_per_word=0.3, final_latency=args.final_latency_ms / 1000)
+    detect = lambda text: 'what time' in text.lower()
+
+    with tempfile.TemporaryDirectory() as folder:
+        paths = []
+        for i in range(args.files):
+            paths.append(os.path.join(folder, 'time-{}.wav'.format(i)))
+            shutil.copyfile(source, paths[-1])
+
+        transcriber = StreamingTranscriber(create=create, chunk_ms=args.chunk_ms, realtime=True, detect=detect)
+        result = transcriber.transcribe(paths[0])
+        print('{:.2f} s of audio: first interim {:.0f} ms, command detected {:.0f} ms, final {:.0f} ms'.format(
+            result['audio_seconds'], result['first_interim_ms'], result['detected_ms'], result['final_ms']))
+        print('  text: {!r}'.format(result['text']))
+
+        # Acting on the detection: the action starts and the call returns without waiting
+        # for the rest of the audio or the final result
+        acted = []
+        early = StreamingTranscriber(create=create, chunk_ms=args.chunk_ms, realtime=True, detect=detect,
+                                     on_detect=lambda detected, text: acted.append(time.perf_counter()),
+                                     stop_on_detect=True)
+        start = time.perf_counter()
+        result = early.transcribe(paths[0])
+        print('stop_on_detect: action started {:.0f} ms, returned {:.0f} ms'.format(
+            (acted[0] - start) * 1000, result['final_ms']))
+        print('  text: {!r}'.format(result['text']))
+
+        # Without an action (stop_on_detect off, as TranscribeStream does without on_command),
+        # an utterance that goes on after the command is still transcribed in full
+        full = StreamingTranscriber(create=fake_recognizer_factory(LONG_TRANSCRIPT, seconds_per_word=0.05),
+                                    chunk_ms=args.chunk_ms, detect=detect)
+        result = full.transcribe(paths[0])
+        print('no action: command detected {:.0f} ms, full text kept: {}'.format(
+            result['detected_ms'], result['text'] == LONG_TRANSCRIPT))
+        print('  text: {!r}'.format(result['text']))
+
+        for workers in args.workers:
+            start = time.perf_counter()
+            results = list(transcriber.transcribe_many(paths, workers=workers))
+            elapsed = time.perf_counter() - start
+            audio = sum(result['audio_seconds'] for result in results)
+            print('{} files, {} workers: {:.2f} s, {:.1f}x real time'.format(
+                len(results), workers, elapsed, audio / elapsed))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from synthesizer_pool import SynthesizerPool, ssml_template
+
+# Compares creating a SpeechSynthesizer for every prosody block (as talk() used to)
+# with borrowing pre-connected synthesizers from a SynthesizerPool, using a fake
+# synthesizer whose construction and connection take --setup-ms
+
+
+class FakeResult:
+
+    def __init__(self, ssml):
+        self.audio_data = ssml.encode('utf8')
+
+
+class FakeFuture:
+
+    def __init__(self, result):
+        self.result = result
+
+    def get(self):
+        return self.result
+
+
+class FakeSynthesizer:
+
+    def __init__(self, setup_latency, speak_latency):
+        time.sleep(setup_latency)
+        self.speak_latency = speak_latency
+
+    def speak_ssml_async(self, ssml):
+        time.sleep(self.speak_latency)
+        return FakeFuture(FakeResult(ssml))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the synthesizer pool')
+    parser.add_argument('--blocks', type=int, default=40)
+    parser.add_argument('--setup-ms', type=float, default=150)
+    parser.add_argument('--speak-ms', type=float, default=20)
+    parser.add_argument('--concurrency', type=int, default=2)
+    args = parser.parse_args()
+
+    voice = 'es-ES-IsidoraMultilingualNeural'
+    blocks = ['<prosody rate="medium">Frase {}</prosody>'.format(i) for i in range(args.blocks)]
+
+    def create(voice):
+        return FakeSynthesizer(args.setup_ms / 1000, args.speak_ms / 1000)
+
+    def cold(block):
+        # A new synthesizer and SSML envelope per block
+        return create(voice).speak_ssml_async(ssml_template(voice, 'es-ES').format(block)).get()
+
+    pool = SynthesizerPool(None, create=create)
+    pool.prewarm(voice, count=args.concurrency)
+
+    with ThreadPoolExecutor(args.concurrency) as executor:
+        start = time.perf_counter()
+        list(executor.map(cold, blocks))
+        cold_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        list(executor.map(lambda block: pool.speak(voice, block), blocks))
+        warm_seconds = time.perf_counter() - start
+
+    print('{} blocks, {} at a time'.format(args.blocks, args.concurrency))
+    print('  new synthesizer per block: {:8.1f} ms/block'.format(cold_seconds / args.blocks * 1000))
+    print('  pooled synthesizers:       {:8.1f} ms/block'.format(warm_seconds / args.blocks * 1000))
+    metrics = pool.metrics()
+    print('  pool setup: {:.1f} ms cold, {:.3f} ms warm, {:.0f} ms saved'.format(
+        metrics['cold_setup_ms'], metrics['warm_setup_ms'], metrics['setup_saved_ms']))
+    print('  per call:   {:.1f} ms cold, {:.1f} ms warm, speedup {:.1f}x'.format(
+        metrics['cold_call_ms'], metrics['warm_call_ms'], metrics['speedup']))
+
+
+if __name__ == "__main__":
+    main()
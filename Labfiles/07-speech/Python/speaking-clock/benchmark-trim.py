@@ -0,0 +1,63 @@
+import argparse
+import os
+import time
+import wave
+
+import numpy as np
+
+from silence_trim import SilenceTrimmer
+
+# Trims time.wav and copies of it padded with long stretches of low-level noise, and
+# reports how much audio (recognition time and billed seconds) each file no longer
+# sends, and how long the trimming itself takes
+
+
+def read_wav(path):
+    with wave.open(path, 'rb') as wav:
+        return wav.readframes(wav.getnframes()), wav.getframerate(), wav.getnchannels()
+
+
+def pad_with_silence(pcm, rate, channels, lead, trail, noise_db=-55, seed=0):
+    rng = np.random.default_rng(seed)
+    level = 32768 * 10 ** (noise_db / 20)
+
+    def noise(seconds):
+        return rng.normal(0, level, (int(seconds * rate), channels)).astype('<i2').tobytes()
+
+    return noise(lead) + pcm + noise(trail)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark silence trimming')
+    parser.add_argument('--silence', type=float, nargs='+', default=[2, 10, 30, 120],
+                        help='seconds of silence before and after the speech')
+    parser.add_argument('--threshold-db', type=float, default=None)
+    parser.add_argument('--margin-db', type=float, default=15.0)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    source = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'time.wav')
+    pcm, rate, channels = read_wav(source)
+    samples = [('time.wav', pcm)]
+    for seconds in args.silence:
+        samples.append(('{:g} s + time.wav + {:g} s'.format(seconds, seconds),
+                        pad_with_silence(pcm, rate, channels, seconds, seconds)))
+
+    trimmer = SilenceTrimmer(threshold_db=args.threshold_db, margin_db=args.margin_db)
+    print('{:>30} {:>9} {:>9} {:>9} {:>10} {:>10}'.format('file', 'audio s', 'removed s', 'kept s', 'trim ms', 'x realtime'))
+    for name, data in samples:
+        audio = len(data) / (2 * channels) / rate
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            trimmed, removed = trimmer.trim(data, rate, 2, channels)
+        elapsed = (time.perf_counter() - start) / args.repeat
+        print('{:>30} {:>9.2f} {:>9.2f} {:>9.2f} {:>10.2f} {:>10.0f}'.format(
+            name, audio, removed, len(trimmed) / (2 * channels) / rate, elapsed * 1000, audio / elapsed))
+
+    stats = trimmer.stats()
+    print('removed {:.1f} of {:.1f} audio seconds ({:.0%})'.format(
+        stats['seconds_removed'] / args.repeat, stats['seconds_in'] / args.repeat, stats['removed_share']))
+
+
+if __name__ == "__main__":
+    main()
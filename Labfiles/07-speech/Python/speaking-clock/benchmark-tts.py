@@ -0,0 +1,115 @@
+import argparse
+import asyncio
+import time
+
+from tts_pipeline import TtsPipeline
+
+# Measures time to first audio and the gaps between sentences for a long streamed reply,
+# using a fake synthesizer whose latency grows with the length of the text and a fake
+# player. Three consumers are compared:
+# - whole reply: wait for the full response, then synthesize and play it in one go
+# - sequential: synthesize, then play, one prosody block at a time, blocking the event loop
+# - pipelined: TtsPipeline, synthesizing the next blocks while the current one plays
+# Time to first audio is counted from the start of the response stream. Splitting into
+# blocks is what lowers it (the first block is short and arrives early); the sequential and
+# pipelined consumers synthesize that first block the same way, so they match on it, and
+# the pipeline's gain is in the gaps between blocks.
+
+
+class FakeSpeech:
+
+    def __init__(self, base_latency, synthesis_per_char, playback_per_char):
+        self.base_latency = base_latency
+        self.synthesis_per_char = synthesis_per_char
+        self.playback_per_char = playback_per_char
+
+    def synthesize(self, block):
+        time.sleep(self.base_latency + len(block) * self.synthesis_per_char)
+        return block.encode('utf8')
+
+    def play(self, audio):
+        time.sleep(len(audio) * self.playback_per_char)
+
+
+async def produce(voice_queue, blocks, block_interval):
+    # Blocks arrive at the pace of the streamed response
+    for block in blocks:
+        await asyncio.sleep(block_interval)
+        await voice_queue.put(block)
+    await voice_queue.put(None)
+
+
+async def whole_reply(speech, blocks, block_interval):
+    voice_queue = asyncio.Queue()
+    started = time.perf_counter()
+    await produce(voice_queue, blocks, block_interval)
+    audio = speech.synthesize(''.join(blocks))
+    first = time.perf_counter() - started
+    speech.play(audio)
+    return first, 0.0
+
+
+async def sequential(speech, blocks, block_interval):
+    voice_queue = asyncio.Queue()
+    stats = {'first': None, 'gaps': []}
+    started = time.perf_counter()
+
+    async def consume():
+        last_end = None
+        while True:
+            block = await voice_queue.get()
+            if block is None:
+                break
+            # The previous talk() blocked the event loop for synthesis and playback
+            audio = speech.synthesize(block)
+            start = time.perf_counter()
+            if stats['first'] is None:
+                stats['first'] = start - started
+            if last_end is not None:
+                stats['gaps'].append(start - last_end)
+            speech.play(audio)
+            last_end = time.perf_counter()
+
+    await asyncio.gather(produce(voice_queue, blocks, block_interval), consume())
+    return stats['first'], sum(stats['gaps']) / len(stats['gaps'])
+
+
+async def pipelined(speech, blocks, block_interval, lookahead):
+    voice_queue = asyncio.Queue()
+    pipeline = TtsPipeline(speech.synthesize, speech.play, lookahead=lookahead)
+    started = time.perf_counter()
+    producer = asyncio.create_task(produce(voice_queue, blocks, block_interval))
+    await pipeline.run(voice_queue)
+    await producer
+    pipeline.close()
+    stats = pipeline.stats()
+    # The pipeline counts from the first block; count from the start of the stream instead
+    return stats['time_to_first_audio'] + (pipeline.started - started), stats['mean_gap']
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark pipelined text-to-speech')
+    parser.add_argument('--blocks', type=int, default=12, help='prosody blocks in the reply')
+    parser.add_argument('--synthesis-base-ms', type=float, default=80, help='synthesis latency per request')
+    parser.add_argument('--synthesis-ms-per-char', type=float, nargs='+', default=[1, 3, 6])
+    parser.add_argument('--playback-ms-per-char', type=float, default=5)
+    parser.add_argument('--block-ms', type=float, default=150, help='time between blocks from the stream')
+    parser.add_argument('--lookahead', type=int, default=2)
+    args = parser.parse_args()
+
+    blocks = ['<prosody rate="medium">Frase número {} de la respuesta.</prosody>'.format(i)
+              for i in range(args.blocks)]
+    print('{} blocks, {} characters'.format(len(blocks), sum(map(len, blocks))))
+    print('{:>14} {:<28} {:<23}'.format('synthesis', 'first audio ms (whole/seq/pipe)', 'mean gap ms (seq/pipe)'))
+    for per_char in args.synthesis_ms_per_char:
+        speech = FakeSpeech(args.synthesis_base_ms / 1000, per_char / 1000, args.playback_ms_per_char / 1000)
+        interval = args.block_ms / 1000
+        whole_first, _ = asyncio.run(whole_reply(speech, blocks, interval))
+        seq_first, seq_gap = asyncio.run(sequential(speech, blocks, interval))
+        pipe_first, pipe_gap = asyncio.run(pipelined(speech, blocks, interval, args.lookahead))
+        print('{:>7.0f} ms/char {:>6.0f} / {:>5.0f} / {:<12.0f} {:>5.0f} / {:<8.0f}'.format(
+            per_char, whole_first * 1000, seq_first * 1000, pipe_first * 1000, seq_gap * 1000, pipe_gap * 1000))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+import json
+import time
+from collections import deque
+
+# Bounded chat history for TalkWithOpenAI. The system message is always sent; after it
+# come an optional summary of older turns and a sliding window of the most recent turns
+# that fits in a prompt token budget. A turn is a user message and the reply to it; turns
+# leave the window whole, so a reply is never sent without its question. Each message's
+# token count is computed once, when it's added, and the window total is updated
+# incrementally.
+# Turns that fall out of the window can be compressed into the summary by an async
+# summarize(previous_summary, messages) callback (for example a short completion).
+# Token counts use tiktoken when it's installed; otherwise they are estimated from
+# the text length.
+
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None
+
+# Tokens the chat format adds per message, and to prime the reply
+MESSAGE_OVERHEAD = 4
+REPLY_OVERHEAD = 3
+
+
+def make_token_counter(encoding_name='cl100k_base'):
+    if tiktoken is not None:
+        encoding = tiktoken.get_encoding(encoding_name)
+        return lambda text: len(encoding.encode(text))
+    # Roughly four characters per token for English; SSML and Spanish are close to three
+    return lambda text: len(text) // 3 + 1
+
+
+class ConversationHistory:
+
+    def __init__(self, system_message, max_tokens=3000, max_turns=20, count_tokens=None):
+        # max_tokens bounds the prompt (leave room for the response's max_tokens within
+        # the model's context); max_turns bounds the number of recent turns kept
+        self.count_tokens = count_tokens or make_token_counter()
+        self.max_tokens = max_tokens
+        self.max_turns = max_turns
+        self.system = self.entry("system", system_message)
+        self.summary = None
+        self.window = deque()      # (message, tokens), oldest first
+        self.window_tokens = 0
+        self.window_turns = 0      # user messages in the window
+        self.evicted = []          # messages dropped from the window and not summarized yet
+        self.turns = []            # per-request metrics
+        self.current = None
+
+    def entry(self, role, content):
+        return {"role": role, "content": content}, self.count_tokens(content) + MESSAGE_OVERHEAD
+
+    def fixed_tokens(self):
+        return self.system[1] + (self.summary[1] if self.summary else 0) + REPLY_OVERHEAD
+
+    def add(self, role, content):
+        message, tokens = self.entry(role, content)
+        self.window.append((message, tokens))
+        self.window_tokens += tokens
+        if role == "user":
+            self.window_turns += 1
+        self.trim()
+
+    def trim(self):
+        # Drop the oldest turns until the window fits (the newest turn is always kept)
+        budget = self.max_tokens - self.fixed_tokens()
+        while self.window_turns > 1 and (self.window_turns > self.max_turns or self.window_tokens > budget):
+            self.evict_turn()
+
+    def evict_turn(self):
+        # The oldest message and the replies that follow it, up to the next user message
+        while True:
+            message, tokens = self.window.popleft()
+            self.window_tokens -= tokens
+            self.evicted.append(message)
+            if message["role"] == "user":
+                self.window_turns -= 1
+            if not self.window or self.window[0][0]["role"] == "user":
+                return
+
+    def messages(self):
+        messages = [self.system[0]]
+        if self.summary:
+            messages.append(self.summary[0])
+        messages.extend(message for message, _ in self.window)
+        return messages
+
+    def prompt_tokens(self):
+        return self.fixed_tokens() + self.window_tokens
+
+    async def summarize(self, summarize):
+        # Fold the evicted messages into the summary of the earlier conversation
+        if not self.evicted:
+            return
+        previous = self.summary[0]["content"] if self.summary else ""
+        text = await summarize(previous, self.evicted)
+        self.evicted = []
+        self.summary = self.entry("system", text)
+        self.trim()
+
+    def begin_request(self, messages):
+        payload = json.dumps(messages, ensure_ascii=False).encode('utf8')
+        self.current = {
+            'payload_bytes': len(payload),
+            'prompt_tokens': self.prompt_tokens(),
+            'messages': len(messages),
+            'started': time.perf_counter(),
+            'first_token_ms': None,
+        }
+
+    async def stream(self, response):
+        # Pass the streamed response through, recording when the first chunk arrives
+        async for chunk in response:
+            if self.current and self.current['first_token_ms'] is None:
+                self.current['first_token_ms'] = (time.perf_counter() - self.current['started']) * 1000
+            yield chunk
+
+    def end_request(self):
+        turn = self.current
+        turn['total_ms'] = (time.perf_counter() - turn.pop('started')) * 1000
+        self.turns.append(turn)
+        self.current = None
+        return turn
+
+    def metrics(self):
+        def mean(key):
+            values = [turn[key] for turn in self.turns if turn[key] is not None]
+            return sum(values) / len(values) if values else 0.0
+
+        return {
+            'turns': len(self.turns),
+            'window_turns': self.window_turns,
+            'window_messages': len(self.window),
+            'summarized': self.summary is not None,
+            'prompt_tokens': self.prompt_tokens(),
+            'mean_payload_bytes': mean('payload_bytes'),
+            'max_payload_bytes': max((turn['payload_bytes'] for turn in self.turns), default=0),
+            'mean_first_token_ms': mean('first_token_ms'),
+            'mean_total_ms': mean('total_ms'),
+        }
@@ -0,0 +1,86 @@
+import threading
+import time
+from types import SimpleNamespace
+
+import azure.cognitiveservices.speech as speech_sdk
+
+# Local stand-in for a continuous SpeechRecognizer fed through a push stream, so the
+# streaming code can be run and measured without a Speech resource.
+# One more word of the transcript is "recognized" for every `seconds_per_word` of audio
+# written; each word fires a `recognizing` event, and closing the stream fires
+# `recognized` (after `final_latency` seconds) and `session_stopped`.
+
+
+class FakeSignal:
+
+    def __init__(self):
+        self.handlers = []
+
+    def connect(self, handler):
+        self.handlers.append(handler)
+
+    def fire(self, evt):
+        for handler in self.handlers:
+            handler(evt)
+
+
+class FakeFuture:
+
+    def get(self):
+        return None
+
+
+class FakePushStream:
+
+    def __init__(self, recognizer, bytes_per_second):
+        self.recognizer = recognizer
+        self.bytes_per_second = bytes_per_second
+
+    def write(self, data):
+        self.recognizer.receive(len(data) / self.bytes_per_second)
+
+    def close(self):
+        threading.Thread(target=self.recognizer.finish).start()
+
+
+class FakeRecognizer:
+
+    def __init__(self, transcript, seconds_per_word=0.4, final_latency=0.2):
+        self.words = transcript.split()
+        self.seconds_per_word = seconds_per_word
+        self.final_latency = final_latency
+        self.seconds = 0.0
+        self.emitted = 0
+        self.recognizing = FakeSignal()
+        self.recognized = FakeSignal()
+        self.canceled = FakeSignal()
+        self.session_stopped = FakeSignal()
+
+    def start_continuous_recognition_async(self):
+        return FakeFuture()
+
+    def stop_continuous_recognition_async(self):
+        return FakeFuture()
+
+    def receive(self, seconds):
+        self.seconds += seconds
+        words = min(len(self.words), int(self.seconds / self.seconds_per_word))
+        while self.emitted < words:
+            self.emitted += 1
+            text = ' '.join(self.words[:self.emitted])
+            self.recognizing.fire(SimpleNamespace(result=SimpleNamespace(
+                text=text, reason=speech_sdk.ResultReason.RecognizingSpeech)))
+
+    def finish(self):
+        time.sleep(self.final_latency)
+        self.recognized.fire(SimpleNamespace(result=SimpleNamespace(
+            text=' '.join(self.words), reason=speech_sdk.ResultReason.RecognizedSpeech)))
+        self.session_stopped.fire(SimpleNamespace())
+
+
+def fake_recognizer_factory(transcript, seconds_per_word=0.4, final_latency=0.2):
+    # create() for StreamingTranscriber
+    def create(framerate, sampwidth, nchannels):
+        recognizer = FakeRecognizer(transcript, seconds_per_word, final_latency)
+        return FakePushStream(recognizer, framerate * sampwidth * nchannels), recognizer
+    return create
@@ -0,0 +1,59 @@
+OPEN_TAG = "<prosody"
+CLOSE_TAG = "</prosody>"
+
+
+class ProsodySegmenter:
+    # Splits a streamed SSML response into complete <prosody>...</prosody> blocks.
+    # feed() only scans the newly arrived text plus the last few characters of the
+    # previous chunk (in case a tag is split across chunks), so the total work is linear
+    # in the length of the response. Each block is returned as soon as its close tag
+    # arrives; text since the last block is kept and returned by flush().
+
+    def __init__(self):
+        self.outside = []   # text since the last block that isn't part of an open block
+        self.parts = None   # text of the block being received, None when no block is open
+        self.tail = ""      # last characters received, to find tags split across chunks
+
+    def feed(self, text):
+        blocks = []
+        while text:
+            search = self.tail + text
+
+            if self.parts is None:
+                start = search.find(OPEN_TAG)
+                if start < 0:
+                    self.outside.append(text)
+                    self.tail = search[-(len(OPEN_TAG) - 1):]
+                    return blocks
+                # The open tag may have started in an earlier chunk
+                before = "".join(self.outside) + text
+                cut = len(before) - (len(search) - start)
+                self.outside = [before[:cut]]
+                self.parts = []
+                self.tail = ""
+                text = before[cut:]
+                continue
+
+            end = search.find(CLOSE_TAG)
+            if end < 0:
+                self.parts.append(text)
+                self.tail = search[-(len(CLOSE_TAG) - 1):]
+                return blocks
+
+            end += len(CLOSE_TAG) - len(self.tail)
+            self.parts.append(text[:end])
+            blocks.append("".join(self.parts))
+            self.outside = []
+            self.parts = None
+            self.tail = ""
+            text = text[end:]
+
+        return blocks
+
+    def flush(self):
+        # Whatever is left at the end of the stream (text outside blocks, or an unclosed block)
+        leftover = "".join(self.outside) + "".join(self.parts or [])
+        self.outside = []
+        self.parts = None
+        self.tail = ""
+        return leftover
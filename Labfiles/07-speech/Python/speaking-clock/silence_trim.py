@@ -0,0 +1,89 @@
+import threading
+
+import numpy as np
+
+# Energy-based voice activity detection for 16-bit PCM audio, used to cut leading and
+# trailing silence before audio is sent for recognition (which is billed and paced by
+# audio time). The audio is split into frame_ms frames and each frame's RMS level is
+# computed in one vectorized pass. Frames above the threshold count as speech; runs of
+# speech shorter than min_speech_ms (clicks, pops) are ignored, and padding_ms is kept
+# on each side so word onsets and endings aren't clipped.
+# The threshold is either a fixed level in dBFS or, by default, margin_db above the
+# recording's noise floor (the noise_percentile quietest frames).
+
+
+class SilenceTrimmer:
+
+    def __init__(self, threshold_db=None, margin_db=15.0, noise_percentile=10, frame_ms=20,
+                 min_speech_ms=60, padding_ms=250):
+        self.threshold_db = threshold_db
+        self.margin_db = margin_db
+        self.noise_percentile = noise_percentile
+        self.frame_ms = frame_ms
+        self.min_speech_ms = min_speech_ms
+        self.padding_ms = padding_ms
+        self.lock = threading.Lock()
+        self.files = 0
+        self.seconds_in = 0.0
+        self.seconds_removed = 0.0
+
+    def frame_levels(self, mono, rate):
+        # RMS level of each complete frame, in dBFS
+        frame = max(1, rate * self.frame_ms // 1000)
+        count = len(mono) // frame
+        frames = mono[:count * frame].reshape(count, frame).astype(np.float32) / 32768.0
+        power = np.einsum('ij,ij->i', frames, frames) / frame
+        return 10 * np.log10(power + 1e-10), frame
+
+    def speech_bounds(self, mono, rate):
+        # (first sample, end sample) of the detected speech, or None if there is none
+        levels, frame = self.frame_levels(mono, rate)
+        if len(levels) == 0:
+            return None
+        if self.threshold_db is None:
+            threshold = np.percentile(levels, self.noise_percentile) + self.margin_db
+        else:
+            threshold = self.threshold_db
+        active = levels > threshold
+
+        # Keep only runs of active frames at least min_speech_ms long
+        min_frames = max(1, -(-self.min_speech_ms // self.frame_ms))
+        edges = np.flatnonzero(np.diff(np.concatenate(([0], active.view(np.int8), [0]))))
+        starts, ends = edges[0::2], edges[1::2]
+        long_runs = (ends - starts) >= min_frames
+        if not long_runs.any():
+            return None
+        first, last = starts[long_runs][0], ends[long_runs][-1]
+
+        padding = rate * self.padding_ms // 1000
+        return max(0, int(first) * frame - padding), min(len(mono), int(last) * frame + padding)
+
+    def trim(self, pcm, rate, sampwidth=2, nchannels=1):
+        # Returns (trimmed pcm bytes, seconds removed). Audio with no detected speech is
+        # returned unchanged, so the recognizer still gets to decide.
+        if sampwidth != 2:
+            raise ValueError('Only 16-bit PCM audio can be trimmed')
+        samples = np.frombuffer(pcm, dtype='<i2')
+        samples = samples[:len(samples) // nchannels * nchannels].reshape(-1, nchannels)
+        mono = samples[:, 0] if nchannels == 1 else samples.mean(axis=1)
+        total = len(samples)
+
+        bounds = self.speech_bounds(mono, rate)
+        start, end = bounds if bounds else (0, total)
+        frame_bytes = sampwidth * nchannels
+        trimmed = pcm[start * frame_bytes:end * frame_bytes]
+        removed = (total - (end - start)) / rate
+
+        with self.lock:
+            self.files += 1
+            self.seconds_in += total / rate
+            self.seconds_removed += removed
+        return trimmed, removed
+
+    def stats(self):
+        return {
+            'files': self.files,
+            'seconds_in': self.seconds_in,
+            'seconds_removed': self.seconds_removed,
+            'removed_share': self.seconds_removed / self.seconds_in if self.seconds_in else 0.0,
+        }
@@ -3,6 +3,7 @@ from dotenv import load_dotenv
 from datetime import datetime
 import os
 import asyncio
+import threading
 
 # Import namespaces
 import azure.cognitiveservices.speech as speech_sdk
@@ -11,9 +12,30 @@ from playsound import playsound
 # Add Azure OpenAI package
 from openai import AzureOpenAI, AsyncAzureOpenAI
 
+from prosody_segmenter import ProsodySegmenter
+from tts_pipeline import TtsPipeline
+from synthesizer_pool import SynthesizerPool
+from audio_cache import AudioCache, make_key
+from conversation_history import ConversationHistory
+from streaming_recognizer import StreamingTranscriber
+from silence_trim import SilenceTrimmer
+
+# Number of prosody blocks synthesized ahead of the one playing
+TTS_LOOKAHEAD = 2
+
+ASSISTANT_VOICE = 'es-ES-IsidoraMultilingualNeural'
+CLOCK_VOICE = 'en-GB-LibbyNeural'
+AUDIO_FORMAT = speech_sdk.SpeechSynthesisOutputFormat.Riff24Khz16BitMonoPcm
+AUDIO_CACHE_BYTES = 64 * 1024 * 1024
+
+# Prompt token budget for the conversation history (the response gets max_tokens on top)
+HISTORY_TOKENS = 3000
+HISTORY_TURNS = 10  # user/assistant exchanges
+SUMMARIZE_HISTORY = True
+
 def main():
     try:
-        global speech_config
+        global speech_config, audio_synthesizers, audio_cache
 
         # Get Configuration Settings
         load_dotenv()
@@ -22,16 +44,30 @@ def main():
 
         # Configure speech service
         speech_config = speech_sdk.SpeechConfig(ai_key, ai_region)
+        speech_config.set_speech_synthesis_output_format(AUDIO_FORMAT)
         print('Ready to use speech service in:', speech_config.region)
 
+        # Synthesizers are created and connected once per voice, then reused
+        audio_synthesizers = SynthesizerPool(speech_config)
+        audio_synthesizers.prewarm(ASSISTANT_VOICE, count=TTS_LOOKAHEAD)
+
+        # Audio of phrases already spoken is played from disk
+        audio_cache = AudioCache('audio-cache', max_bytes=AUDIO_CACHE_BYTES)
+
         # Get spoken input-expected
         # command = TranscribeCommand()
         # if command.lower() == 'what time is it?':
         #     TellTime()
+        # or stream the audio and tell the time as soon as the question is recognized:
+        # TranscribeCommand(continuous=True, on_command=TellTime)
 
         # Using openai
         asyncio.run(TalkWithOpenAI())
 
+        print('Synthesizer pool:', audio_synthesizers.metrics())
+        print('Audio cache:', audio_cache.stats())
+        audio_synthesizers.close()
+
     except Exception as ex:
         print(ex)
 
@@ -69,8 +105,8 @@ Me llamo Forest y soy un entusiasta del senderismo.
 </prosody>
 """
 
-    # Initialize messages array
-    messages_array = [{"role": "system", "content": system_message}]
+    # Initialize conversation history (system message + recent turns within a token budget)
+    history = ConversationHistory(system_message, max_tokens=HISTORY_TOKENS, max_turns=HISTORY_TURNS)
 
     while True:
         # Get input text
@@ -83,7 +119,9 @@ Me llamo Forest y soy un entusiasta del senderismo.
 
         # Add code to send request...
         
-        messages_array.append({"role": "user", "content": input_text})
+        history.add("user", input_text)
+        messages_array = history.messages()
+        history.begin_request(messages_array)
         
         # Send request to Azure OpenAI model
         response = await client.chat.completions.create(
@@ -96,7 +134,7 @@ Me llamo Forest y soy un entusiasta del senderismo.
 
         # Mostrar la respuesta en modo streaming
         print("Response: ", end="")
-        ai_message = await run_synthesis(response)
+        ai_message = await run_synthesis(history.stream(response))
         # ai_message = process_text_stream(response, text_callback, voice_callback)
 
         # for chunk in response:
@@ -107,14 +145,40 @@ Me llamo Forest y soy un entusiasta del senderismo.
         #             print(content, end="", flush=True)
         #             talk(content)  # Speak the content
         
-        messages_array.append({"role": "assistant", "content": ai_message})
+        history.add("assistant", ai_message)
+        turn = history.end_request()
         print("\n")
+        print('Turn: {} bytes, ~{} prompt tokens, first token {:.0f} ms'.format(
+            turn['payload_bytes'], turn['prompt_tokens'], turn['first_token_ms'] or 0), file=sys.stderr)
+
+        # Compress turns that no longer fit into a short summary
+        if SUMMARIZE_HISTORY:
+            await history.summarize(
+                lambda summary, messages: summarize_history(client, azure_oai_deployment, summary, messages))
+
+    print('History:', history.metrics())
+
+async def summarize_history(client, deployment, summary, messages):
+    # Short non-streamed completion that merges older turns into the running summary
+    transcript = "\n".join("{}: {}".format(message["role"], message["content"]) for message in messages)
+    response = await client.chat.completions.create(
+        model=deployment,
+        temperature=0,
+        max_tokens=150,
+        messages=[
+            {"role": "system", "content": "Summarize the conversation so far in under 100 words, keeping names, places and preferences."},
+            {"role": "user", "content": "Previous summary:\n{}\n\nNew turns:\n{}".format(summary, transcript)},
+        ]
+    )
+    return "Summary of the earlier conversation: " + response.choices[0].message.content
 
 async def run_synthesis(response):
     voice_queue = asyncio.Queue()
+    # Sintetizar el siguiente bloque mientras se reproduce el actual
+    pipeline = TtsPipeline(synthesize, play_audio, lookahead=TTS_LOOKAHEAD)
     # Crear tareas asincrónicas
     producer_task = asyncio.create_task(process_text_stream(response, text_callback, voice_queue))
-    consumer_task = asyncio.create_task(voice_consumer(voice_queue))
+    consumer_task = asyncio.create_task(pipeline.run(voice_queue))
     
     # Esperar a que el productor termine
     await producer_task
@@ -122,64 +186,32 @@ async def run_synthesis(response):
     # Señalar al consumidor que termine
     await voice_queue.put(None)
     await consumer_task
+    pipeline.close()
 
     return producer_task.result()  # Devolver el resultado del productor
 
 
 async def process_text_stream(response, text_callback, voice_queue):
     ai_message = ""
-    buffer = ""
+    segmenter = ProsodySegmenter()
     async for chunk in response:
         if len(chunk.choices) > 0:
             content = chunk.choices[0].delta.content
             if content:
                 # Callback para manejar el texto en tiempo real
                 text_callback(content)
-                
-                # Acumular texto en el buffer
-                buffer += content
-                
-                # Detectar etiquetas de prosodia o break
-                if detect_prosody(buffer):
-                    prosody_blocks = split_by_prosody(buffer)
-                    for block in prosody_blocks:
-                        await voice_queue.put(block.strip())
-                        ai_message += block.strip()  # Acumular en el mensaje final
-                    buffer = ""  # Limpiar el buffer
+
+                # Enviar cada bloque de prosodia en cuanto se cierra su etiqueta
+                for block in segmenter.feed(content):
+                    await voice_queue.put(block.strip())
+                    ai_message += block.strip()  # Acumular en el mensaje final
 
     # Enviar cualquier texto restante al finalizar
-    if buffer.strip():
-        await voice_queue.put(buffer.strip())
-    
-    return ai_message  # Devolver el mensaje completo
+    leftover = segmenter.flush()
+    if leftover.strip():
+        await voice_queue.put(leftover.strip())
 
-def split_by_prosody(buffer):
-    # Dividir el buffer en bloques delimitados por <prosody> y </prosody>
-    blocks = []
-    start = 0
-    while start < len(buffer):
-        open_tag = buffer.find("<prosody", start)
-        close_tag = buffer.find("</prosody>", start)
-        if open_tag != -1 and close_tag != -1:
-            blocks.append(buffer[open_tag:close_tag + 10])  # Incluir etiquetas
-            start = close_tag + 10
-        else:
-            break
-    return blocks
-
-def detect_prosody(buffer):
-    # Validar que las etiquetas <prosody> y </prosody> estén balanceadas
-    is_opened = False
-    i = 0
-    while i < len(buffer):
-        if buffer[i:i+8] == "<prosody":
-            is_opened = True
-            i += 8
-        elif is_opened and buffer[i:i+10] == "</prosody>":
-            return True
-        else:
-            i += 1
-    return False
+    return ai_message  # Devolver el mensaje completo
 
 # Callback para imprimir texto en tiempo real
 def text_callback(content):
@@ -189,46 +221,56 @@ def text_callback(content):
 def voice_callback(sentence):
     talk(sentence)
 
-async def voice_consumer(voice_queue):
-    while True:
-        # Esperar una frase del queue
-        sentence = await voice_queue.get()
-        if sentence is None:  # Señal para terminar
-            break
-        talk(sentence)  # Reproducir la frase
-        voice_queue.task_done()
-
-def talk(content: str):
-    # Configure speech synthesis
-    # speech_config.speech_synthesis_voice_name = 'en-GB-LibbyNeural' # change this
-    # En español
-    speech_config.speech_synthesis_voice_name = 'es-ES-IsidoraMultilingualNeural'
-    speech_synthesizer = speech_sdk.SpeechSynthesizer(speech_config)
+def synthesize(content: str, voice=ASSISTANT_VOICE):
+    # Synthesize to a cached WAV file (no audio output), so playback can overlap
+    # with the synthesis of the next block and repeated phrases aren't synthesized again
+    responseSsml = audio_synthesizers.ssml(voice, content)
+    key = make_key(responseSsml, voice, AUDIO_FORMAT)
+    audio_path = audio_cache.lookup(key)
+    if audio_path:
+        return audio_path
 
-    # Synthesize spoken output
-    responseSsml = " \
-    <speak version='1.0' xmlns='http://www.w3.org/2001/10/synthesis' xml:lang='es-ES'> \
-        <voice name='es-ES-IsidoraMultilingualNeural'> \
-            {} \
-        </voice> \
-    </speak>".format(content)
-    speak = speech_synthesizer.speak_ssml_async(responseSsml).get()
+    speak = audio_synthesizers.speak(voice, content)
     if speak.reason != speech_sdk.ResultReason.SynthesizingAudioCompleted:
         print(speak.reason)
+        return None
+    return audio_cache.put(key, speak.audio_data)
+
+def play_audio(audio_path):
+    # Play a synthesized WAV and return when it has finished
+    if audio_path:
+        playsound(audio_path)
+
+def talk(content: str):
+    # Synthesize spoken output
+    # (to change the voice, use another key of synthesizer_pool.VOICES, such as CLOCK_VOICE)
+    play_audio(synthesize(content, ASSISTANT_VOICE))
+
 
+def is_time_command(text):
+    # Early intent detection on interim results
+    return 'what time' in text.lower()
 
-def TranscribeCommand(with_microphone=False):
+
+def TranscribeCommand(with_microphone=False, continuous=False, on_command=None):
+    # With continuous=True, interim results are checked while the audio streams in, and
+    # on_command() (if given) is started as soon as the command is recognized
     command = ''
 
     # Configure speech recognition
     if not with_microphone:
         current_dir = os.getcwd()
-        audioFile = current_dir + '\\time.wav'
+        audioFile = os.path.join(current_dir, 'time.wav')
+        if continuous:
+            return TranscribeStream(audioFile, on_command)
         playsound(audioFile)
         audio_config = speech_sdk.AudioConfig(filename=audioFile)
         speech_recognizer = speech_sdk.SpeechRecognizer(speech_config, audio_config)
     else:
         # With microphone
+        if continuous:
+            print('Speak now...')
+            return TranscribeStream(None, on_command)
         audio_config = speech_sdk.AudioConfig(use_default_microphone=True)
         speech_recognizer = speech_sdk.SpeechRecognizer(speech_config, audio_config)
         print('Speak now...')
@@ -249,27 +291,38 @@ def TranscribeCommand(with_microphone=False):
     return command
 
 
+def TranscribeStream(audioFile=None, on_command=None):
+    # With on_command, recognition stops as soon as an interim result is a time command and
+    # on_command starts right away on its own thread; without it, the whole utterance is
+    # transcribed. Without a file, the microphone is used.
+    on_detect = (lambda detected, text: on_command()) if on_command else None
+    # Leading and trailing silence is cut before the audio is sent
+    transcriber = StreamingTranscriber(speech_config, realtime=True, detect=is_time_command, trimmer=SilenceTrimmer(),
+                                       on_detect=on_detect, stop_on_detect=on_command is not None)
+    if audioFile:
+        # Play the file while its audio is pushed to a continuous recognizer at the same pace
+        threading.Thread(target=playsound, args=(audioFile,), daemon=True).start()
+        result = transcriber.transcribe(audioFile)
+        print('Silence removed: {:.2f} s'.format(result['trimmed_seconds']))
+    else:
+        result = transcriber.listen()
+    if result['error']:
+        print(result['error'])
+    if result['detected']:
+        print('Command detected after {:.0f} ms'.format(result['detected_ms']))
+    print(result['text'])
+    return result['text']
+
+
 def TellTime():
     now = datetime.now()
     response_text = 'The time is {}:{:02d}'.format(now.hour,now.minute)
 
 
-    # Configure speech synthesis
-    speech_config.speech_synthesis_voice_name = 'en-GB-LibbyNeural' # change this
-    speech_synthesizer = speech_sdk.SpeechSynthesizer(speech_config)
-
     # Synthesize spoken output
-    responseSsml = " \
-    <speak version='1.0' xmlns='http://www.w3.org/2001/10/synthesis' xml:lang='en-US'> \
-        <voice name='en-GB-LibbyNeural'> \
-            {} \
-            <break strength='weak'/> \
-            Time to end this lab! \
-        </voice> \
-    </speak>".format(response_text)
-    speak = speech_synthesizer.speak_ssml_async(responseSsml).get()
-    if speak.reason != speech_sdk.ResultReason.SynthesizingAudioCompleted:
-        print(speak.reason)
+    # (the fixed sign-off is its own block, so its audio is cached once instead of every minute)
+    play_audio(synthesize(response_text, CLOCK_VOICE))
+    play_audio(synthesize("Time to end this lab!", CLOCK_VOICE))
 
     # Print the response
     print(response_text)
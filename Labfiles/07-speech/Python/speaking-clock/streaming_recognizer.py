@@ -0,0 +1,176 @@
+import threading
+import time
+import wave
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+import azure.cognitiveservices.speech as speech_sdk
+
+# Continuous speech recognition from WAV files. Audio is pushed to the recognizer in
+# small chunks through a PushAudioInputStream (optionally paced in real time, as a
+# microphone would deliver it), and interim `recognizing` results are checked as they
+# arrive, so a command can be acted on before the speaker has finished: on_detect is
+# called as soon as detect() matches, and with stop_on_detect the rest of the audio isn't
+# sent and the result is returned straight away.
+# listen() does the same with the default microphone, for a single command.
+# transcribe_many() runs several files at once on a pool of worker threads.
+# With a SilenceTrimmer, leading and trailing silence is cut before any audio is sent.
+
+
+def open_push_recognizer(speech_config, framerate, sampwidth, nchannels):
+    # (push stream, recognizer) for PCM audio in the given format
+    stream_format = speech_sdk.audio.AudioStreamFormat(
+        samples_per_second=framerate, bits_per_sample=sampwidth * 8, channels=nchannels)
+    push_stream = speech_sdk.audio.PushAudioInputStream(stream_format)
+    audio_config = speech_sdk.audio.AudioConfig(stream=push_stream)
+    recognizer = speech_sdk.SpeechRecognizer(speech_config, audio_config)
+    return push_stream, recognizer
+
+
+def open_microphone_recognizer(speech_config):
+    audio_config = speech_sdk.audio.AudioConfig(use_default_microphone=True)
+    return speech_sdk.SpeechRecognizer(speech_config, audio_config)
+
+
+class StreamingTranscriber:
+
+    def __init__(self, speech_config=None, create=None, chunk_ms=100, realtime=False, detect=None, timeout=60,
+                 trimmer=None, on_detect=None, stop_on_detect=False):
+        # create(framerate, sampwidth, nchannels) -> (push stream, recognizer) replaces the
+        # SDK (for a fake recognizer); detect(text) returns something truthy once the
+        # interim text is enough to act on, and on_detect(detected, text) is the action
+        self.speech_config = speech_config
+        self.create = create or partial(open_push_recognizer, speech_config)
+        self.trimmer = trimmer
+        self.chunk_ms = chunk_ms
+        self.realtime = realtime
+        self.detect = detect
+        self.timeout = timeout
+        self.on_detect = on_detect
+        self.stop_on_detect = stop_on_detect
+
+    def transcribe(self, path):
+        with wave.open(path, 'rb') as wav:
+            framerate, sampwidth, nchannels = wav.getframerate(), wav.getsampwidth(), wav.getnchannels()
+            if self.trimmer:
+                # The whole file is needed to find where the speech ends
+                return self.transcribe_pcm(wav.readframes(wav.getnframes()), framerate, sampwidth, nchannels, path)
+            frames_per_chunk = max(1, framerate * self.chunk_ms // 1000)
+            chunks = iter(lambda: wav.readframes(frames_per_chunk), b'')
+            return self.recognize(chunks, framerate, sampwidth, nchannels, wav.getnframes() / framerate, path)
+
+    def transcribe_pcm(self, pcm, framerate, sampwidth=2, nchannels=1, path=None):
+        # Already decoded PCM audio (bytes)
+        frame_bytes = sampwidth * nchannels
+        audio_seconds = len(pcm) / frame_bytes / framerate
+        trimmed_seconds = 0.0
+        if self.trimmer:
+            pcm, trimmed_seconds = self.trimmer.trim(pcm, framerate, sampwidth, nchannels)
+        chunk_bytes = max(1, framerate * self.chunk_ms // 1000) * frame_bytes
+        view = memoryview(pcm)
+        chunks = (view[offset:offset + chunk_bytes] for offset in range(0, len(view), chunk_bytes))
+        result = self.recognize(chunks, framerate, sampwidth, nchannels, audio_seconds, path)
+        result['trimmed_seconds'] = trimmed_seconds
+        return result
+
+    def recognize(self, chunks, framerate, sampwidth, nchannels, audio_seconds, path=None):
+        push_stream, recognizer = self.create(framerate, sampwidth, nchannels)
+
+        def push(start, stop):
+            # Push the audio chunk by chunk, then close the stream to end the session
+            # (with stop_on_detect, the rest of the audio isn't sent once a command is detected)
+            frame_bytes = sampwidth * nchannels
+            sent = 0
+            for chunk in chunks:
+                if stop.is_set():
+                    break
+                push_stream.write(bytes(chunk))
+                sent += len(chunk) // frame_bytes
+                if self.realtime:
+                    delay = start + sent / framerate - time.perf_counter()
+                    if delay > 0:
+                        time.sleep(delay)
+            push_stream.close()
+
+        return self.run(recognizer, push, path, audio_seconds)
+
+    def listen(self, recognizer=None):
+        # One command from the default microphone: returns after the first final result,
+        # or as soon as a command is detected with stop_on_detect
+        recognizer = recognizer or open_microphone_recognizer(self.speech_config)
+        return self.run(recognizer, None)
+
+    def run(self, recognizer, push, path=None, audio_seconds=None):
+        result = {
+            'path': path,
+            'text': '',
+            'audio_seconds': audio_seconds,
+            'interim': 0,
+            'first_interim_ms': None,
+            'detected': None,
+            'detected_ms': None,
+            'stopped_early': False,
+            'final_ms': None,
+            'trimmed_seconds': 0.0,
+            'error': None,
+        }
+        texts = []
+        interim = ['']
+        stop = threading.Event()
+        start = time.perf_counter()
+
+        def check(text):
+            if self.detect and result['detected'] is None:
+                detected = self.detect(text)
+                if detected:
+                    result['detected'] = detected
+                    result['detected_ms'] = (time.perf_counter() - start) * 1000
+                    if self.stop_on_detect:
+                        result['stopped_early'] = True
+                        stop.set()
+                    if self.on_detect:
+                        # The action gets its own thread, so it doesn't hold up the recognizer's events
+                        threading.Thread(target=self.on_detect, args=(detected, text)).start()
+
+        def recognizing(evt):
+            result['interim'] += 1
+            if result['first_interim_ms'] is None:
+                result['first_interim_ms'] = (time.perf_counter() - start) * 1000
+            interim[0] = evt.result.text
+            check(evt.result.text)
+
+        def recognized(evt):
+            if evt.result.reason == speech_sdk.ResultReason.RecognizedSpeech:
+                texts.append(evt.result.text)
+                interim[0] = ''
+                check(evt.result.text)
+                if push is None:
+                    stop.set()
+
+        def canceled(evt):
+            details = evt.cancellation_details
+            if details.reason == speech_sdk.CancellationReason.Error:
+                result['error'] = details.error_details
+            stop.set()
+
+        recognizer.recognizing.connect(recognizing)
+        recognizer.recognized.connect(recognized)
+        recognizer.canceled.connect(canceled)
+        recognizer.session_stopped.connect(lambda evt: stop.set())
+        recognizer.start_continuous_recognition_async().get()
+
+        if push:
+            push(start, stop)
+        if not stop.wait(self.timeout):
+            result['error'] = 'Timed out waiting for the recognition to finish'
+        recognizer.stop_continuous_recognition_async().get()
+        if result['stopped_early'] and interim[0]:
+            texts.append(interim[0])
+        result['text'] = ' '.join(texts)
+        result['final_ms'] = (time.perf_counter() - start) * 1000
+        return result
+
+    def transcribe_many(self, paths, workers=4):
+        # Results in the same order as paths
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            yield from executor.map(self.transcribe, paths)
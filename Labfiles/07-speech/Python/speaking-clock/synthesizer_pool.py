@@ -0,0 +1,123 @@
+import queue
+import threading
+import time
+from contextlib import contextmanager
+
+import azure.cognitiveservices.speech as speech_sdk
+
+# Pool of pre-connected SpeechSynthesizers keyed by voice.
+# The voice is set in each request's SSML, so the shared SpeechConfig is never changed
+# and synthesizers for different voices can be used from different threads at once.
+# A synthesizer is borrowed by one caller at a time and returned to the pool afterwards,
+# so only the first call for a voice (or a call while all its synthesizers are busy)
+# pays for creating the synthesizer and opening its connection.
+
+# Voice name -> xml:lang of the SSML envelope
+VOICES = {
+    'es-ES-IsidoraMultilingualNeural': 'es-ES',
+    'en-GB-LibbyNeural': 'en-US',
+}
+
+
+def ssml_template(voice, lang):
+    return ("<speak version='1.0' xmlns='http://www.w3.org/2001/10/synthesis' xml:lang='{}'>"
+            "<voice name='{}'>{{}}</voice></speak>").format(lang, voice)
+
+
+class SynthesizerPool:
+
+    def __init__(self, speech_config, speaker=False, voices=VOICES, create=None):
+        # speaker=True plays through the default speaker, otherwise audio is only returned
+        # in the result. create(voice) -> synthesizer replaces the SDK (for benchmarks).
+        self.speech_config = speech_config
+        self.speaker = speaker
+        self.create = create or self.connect
+        self.templates = {voice: ssml_template(voice, lang) for voice, lang in voices.items()}
+        self.idle = {voice: queue.SimpleQueue() for voice in voices}
+        self.connections = []
+        self.lock = threading.Lock()
+        # Seconds spent getting a synthesizer (cold: created, warm: reused) and whole calls
+        self.cold = []
+        self.warm = []
+        self.cold_calls = []
+        self.warm_calls = []
+
+    def connect(self, voice):
+        if self.speaker:
+            audio_config = speech_sdk.audio.AudioOutputConfig(use_default_speaker=True)
+        else:
+            audio_config = None
+        synthesizer = speech_sdk.SpeechSynthesizer(self.speech_config, audio_config=audio_config)
+        # Open the service connection now instead of on the first request
+        connection = speech_sdk.Connection.from_speech_synthesizer(synthesizer)
+        connection.open(True)
+        with self.lock:
+            self.connections.append(connection)
+        return synthesizer
+
+    def prewarm(self, voice, count=1):
+        # Create and connect `count` synthesizers for the voice before they're needed
+        for _ in range(count):
+            start = time.perf_counter()
+            synthesizer = self.create(voice)
+            with self.lock:
+                self.cold.append(time.perf_counter() - start)
+            self.idle[voice].put(synthesizer)
+
+    def borrow(self, voice):
+        # (synthesizer, True if it came from the pool)
+        start = time.perf_counter()
+        try:
+            synthesizer, warm = self.idle[voice].get_nowait(), True
+        except queue.Empty:
+            synthesizer, warm = self.create(voice), False
+        with self.lock:
+            (self.warm if warm else self.cold).append(time.perf_counter() - start)
+        return synthesizer, warm
+
+    @contextmanager
+    def acquire(self, voice):
+        synthesizer, _ = self.borrow(voice)
+        try:
+            yield synthesizer
+        finally:
+            self.idle[voice].put(synthesizer)
+
+    def ssml(self, voice, content):
+        return self.templates[voice].format(content)
+
+    def speak(self, voice, content):
+        # Synthesize an SSML fragment (the content of the <voice> element) and return the result
+        start = time.perf_counter()
+        synthesizer, warm = self.borrow(voice)
+        try:
+            return synthesizer.speak_ssml_async(self.ssml(voice, content)).get()
+        finally:
+            self.idle[voice].put(synthesizer)
+            with self.lock:
+                (self.warm_calls if warm else self.cold_calls).append(time.perf_counter() - start)
+
+    def metrics(self):
+        def mean(values):
+            return sum(values) / len(values) if values else 0.0
+
+        cold, warm = mean(self.cold), mean(self.warm)
+        warm_call = mean(self.warm_calls)
+        # A prewarmed pool may have no cold calls; estimate one as a warm call plus the cold setup
+        cold_call = mean(self.cold_calls) if self.cold_calls else warm_call + cold - warm
+        return {
+            'created': len(self.cold),
+            'reused': len(self.warm),
+            'cold_setup_ms': cold * 1000,
+            'warm_setup_ms': warm * 1000,
+            # Setup time the reused calls didn't spend creating and connecting a synthesizer
+            'setup_saved_ms': len(self.warm) * max(cold - warm, 0.0) * 1000,
+            'cold_call_ms': cold_call * 1000,
+            'warm_call_ms': warm_call * 1000,
+            'speedup': cold_call / warm_call if warm_call else 0.0,
+        }
+
+    def close(self):
+        for connection in self.connections:
+            connection.close()
+        self.connections = []
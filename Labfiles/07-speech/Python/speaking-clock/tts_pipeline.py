@@ -0,0 +1,74 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Two-stage text-to-speech pipeline: prosody blocks are synthesized to audio files (or found
+# in the audio cache) in worker threads, up to `lookahead` blocks ahead of playback, while an
+# ordered playback stage plays each block as soon as it (and every block before it) is ready.
+# Neither stage blocks the event loop, so the response stream keeps being read too.
+
+
+class TtsPipeline:
+
+    def __init__(self, synthesize, play, lookahead=2):
+        # synthesize(ssml_block) -> cached audio file path, play(path) -> returns when playback ends;
+        # both are blocking calls and run in executors
+        self.synthesize = synthesize
+        self.play = play
+        self.lookahead = lookahead
+        self.synthesis_executor = ThreadPoolExecutor(max_workers=lookahead, thread_name_prefix='tts-synthesis')
+        self.playback_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='tts-playback')
+        self.reset_stats()
+
+    def reset_stats(self):
+        self.started = None
+        self.first_audio = None
+        self.gaps = []
+        self.blocks = 0
+
+    async def run(self, voice_queue):
+        # Consume blocks from voice_queue until None is received
+        loop = asyncio.get_running_loop()
+        ready = asyncio.Queue(maxsize=self.lookahead)
+
+        async def synthesis_stage():
+            while True:
+                block = await voice_queue.get()
+                if block is None:
+                    await ready.put(None)
+                    break
+                if self.started is None:
+                    self.started = time.perf_counter()
+                future = loop.run_in_executor(self.synthesis_executor, self.synthesize, block)
+                # Waits here while `lookahead` blocks are already synthesizing or waiting to play
+                await ready.put(future)
+
+        async def playback_stage():
+            last_end = None
+            while True:
+                future = await ready.get()
+                if future is None:
+                    break
+                audio_path = await future
+                start = time.perf_counter()
+                if self.first_audio is None:
+                    self.first_audio = start - self.started
+                if last_end is not None:
+                    self.gaps.append(start - last_end)
+                await loop.run_in_executor(self.playback_executor, self.play, audio_path)
+                last_end = time.perf_counter()
+                self.blocks += 1
+
+        await asyncio.gather(synthesis_stage(), playback_stage())
+
+    def stats(self):
+        return {
+            'blocks': self.blocks,
+            'time_to_first_audio': self.first_audio or 0.0,
+            'mean_gap': sum(self.gaps) / len(self.gaps) if self.gaps else 0.0,
+            'max_gap': max(self.gaps, default=0.0),
+        }
+
+    def close(self):
+        self.synthesis_executor.shutdown()
+        self.playback_executor.shutdown()
@@ -0,0 +1,67 @@
+import argparse
+import time
+from types import SimpleNamespace
+
+import azure.cognitiveservices.speech as speech_sdk
+
+from synthesizer_pool import SynthesizerPool
+from translation_speaker import TranslationSpeaker
+
+# Speaks translated segments in fr, es and hi with a fake synthesizer and player,
+# comparing synthesizing the languages one after another with synthesizing them all at
+# once, and reports the mean time to first audio per language (when its playback starts)
+# and the time per segment
+
+VOICES = {"fr": "fr-FR-HenriNeural", "es": "es-ES-ElviraNeural", "hi": "hi-IN-MadhurNeural"}
+SEGMENTS = [
+    {'fr': 'Où est la gare ?', 'es': '¿Dónde está la estación?', 'hi': 'स्टेशन कहाँ है?'},
+    {'fr': 'Je dois prendre un train.', 'es': 'Necesito tomar un tren.', 'hi': 'मुझे ट्रेन पकड़नी है।'},
+    {'fr': 'Le prochain part dans dix minutes.', 'es': 'El próximo sale en diez minutos.',
+     'hi': 'अगली ट्रेन दस मिनट में जाती है।'},
+]
+
+
+class FakeSynthesizer:
+
+    def __init__(self, base_latency, latency_per_char):
+        self.base_latency = base_latency
+        self.latency_per_char = latency_per_char
+
+    def speak_ssml_async(self, ssml):
+        time.sleep(self.base_latency + len(ssml) * self.latency_per_char)
+        result = SimpleNamespace(reason=speech_sdk.ResultReason.SynthesizingAudioCompleted,
+                                 audio_data=ssml.encode('utf8'))
+        return SimpleNamespace(get=lambda: result)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark concurrent synthesis of translations')
+    parser.add_argument('--base-ms', type=float, default=150, help='synthesis latency per request')
+    parser.add_argument('--char-ms', type=float, default=1, help='synthesis latency per SSML character')
+    parser.add_argument('--play-ms', type=float, default=1500, help='simulated playback time per segment language')
+    args = parser.parse_args()
+
+    def create(voice):
+        return FakeSynthesizer(args.base_ms / 1000, args.char_ms / 1000)
+
+    def play(audio):
+        time.sleep(args.play_ms / 1000)
+
+    print('{:>12} {:>10} {:>10} {:>10} {:>14}'.format('', *VOICES, 'ms / segment'))
+    for name, concurrent in (('sequential', False), ('concurrent', True)):
+        pool = SynthesizerPool(None, create=create)
+        for voice in VOICES.values():
+            pool.prewarm(voice)
+        speaker = TranslationSpeaker(pool, VOICES, VOICES, play=play)
+        start = time.perf_counter()
+        for translations in SEGMENTS:
+            speaker.speak(translations, concurrent=concurrent)
+        elapsed = (time.perf_counter() - start) / len(SEGMENTS)
+        first_audio = speaker.metrics()
+        speaker.close()
+        print('{:>12} {:>10.0f} {:>10.0f} {:>10.0f} {:>14.0f}'.format(
+            name, *(first_audio[language] for language in VOICES), elapsed * 1000))
+
+
+if __name__ == "__main__":
+    main()
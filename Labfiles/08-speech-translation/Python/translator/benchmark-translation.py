@@ -0,0 +1,52 @@
+import argparse
+import os
+import time
+
+from continuous_translation import ContinuousTranslator
+from fakes import fake_translator_factory
+
+# Translates station.wav into fr, es and hi with a fake recognizer, comparing one
+# recognize-once session per language (the file is streamed three times, and each
+# result arrives only after the whole utterance) with a single continuous session that
+# delivers every language for each segment as it is recognized
+
+SCRIPT = [
+    ('Where is the station?', {'fr': 'Où est la gare ?', 'es': '¿Dónde está la estación?', 'hi': 'स्टेशन कहाँ है?'}),
+    ('I need to catch a train.', {'fr': 'Je dois prendre un train.', 'es': 'Necesito tomar un tren.',
+                                  'hi': 'मुझे ट्रेन पकड़नी है।'}),
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark continuous multi-target speech translation')
+    parser.add_argument('--final-latency-ms', type=float, default=300)
+    parser.add_argument('--seconds-per-word', type=float, default=0.25)
+    parser.add_argument('--no-realtime', action='store_true', help="don't pace the audio like a microphone")
+    args = parser.parse_args()
+
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'station.wav')
+    create = fake_translator_factory(SCRIPT, args.seconds_per_word, args.final_latency_ms / 1000)
+    languages = list(SCRIPT[0][1])
+
+    # One session per target language, each keeping only its own language
+    start = time.perf_counter()
+    for language in languages:
+        session = ContinuousTranslator(create=create, realtime=not args.no_realtime).translate_file(path)
+    sequential = time.perf_counter() - start
+
+    partials = []
+    translator = ContinuousTranslator(create=create, realtime=not args.no_realtime,
+                                      on_partial=lambda text, translations: partials.append(translations))
+    session = translator.translate_file(path)
+    print('{:.2f} s of audio, {} target languages'.format(session['audio_seconds'], len(languages)))
+    print('  one session per language: {:.2f} s'.format(sequential))
+    print('  one continuous session:   {:.2f} s, first partial after {:.0f} ms, {} partial events'.format(
+        session['total_ms'] / 1000, session['first_partial_ms'], session['partials']))
+    for segment in session['segments']:
+        print('  {:5.2f}-{:5.2f} s "{}": final {:.0f} ms after its audio, {}'.format(
+            segment['offset_seconds'], segment['end_seconds'], segment['text'], segment['latency_ms'],
+            ', '.join('{}={}'.format(language, text) for language, text in segment['translations'].items())))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+import bisect
+import threading
+import time
+import wave
+from functools import partial
+
+import azure.cognitiveservices.speech as speech_sdk
+
+# Continuous speech translation into every target language of the SpeechTranslationConfig
+# in a single TranslationRecognizer session. WAV audio is pushed in small chunks through
+# a PushAudioInputStream (optionally paced in real time, as a microphone would deliver it);
+# each `recognizing` event carries partial translations for all targets and each
+# `recognized` event the final ones for a segment.
+# A segment's latency is measured from the moment its last audio was pushed to the moment
+# its final translations arrived.
+
+TICKS_PER_SECOND = 10000000
+
+
+def open_push_translator(translation_config, framerate, sampwidth, nchannels):
+    # (push stream, recognizer) for PCM audio in the given format
+    stream_format = speech_sdk.audio.AudioStreamFormat(
+        samples_per_second=framerate, bits_per_sample=sampwidth * 8, channels=nchannels)
+    push_stream = speech_sdk.audio.PushAudioInputStream(stream_format)
+    audio_config = speech_sdk.audio.AudioConfig(stream=push_stream)
+    recognizer = speech_sdk.translation.TranslationRecognizer(translation_config, audio_config=audio_config)
+    return push_stream, recognizer
+
+
+class ContinuousTranslator:
+
+    def __init__(self, translation_config=None, create=None, chunk_ms=100, realtime=True,
+                 on_partial=None, on_final=None, timeout=60):
+        # create(framerate, sampwidth, nchannels) -> (push stream, recognizer) replaces the
+        # SDK (for a fake recognizer). on_partial(text, translations) and
+        # on_final(segment) are called from the recognizer's event threads.
+        self.create = create or partial(open_push_translator, translation_config)
+        self.chunk_ms = chunk_ms
+        self.realtime = realtime
+        self.on_partial = on_partial
+        self.on_final = on_final
+        self.timeout = timeout
+
+    def translate_file(self, path):
+        with wave.open(path, 'rb') as wav:
+            framerate, sampwidth, nchannels = wav.getframerate(), wav.getsampwidth(), wav.getnchannels()
+            push_stream, recognizer = self.create(framerate, sampwidth, nchannels)
+            session = {
+                'path': path,
+                'audio_seconds': wav.getnframes() / framerate,
+                'segments': [],
+                'partials': 0,
+                'first_partial_ms': None,
+                'error': None,
+            }
+            # Audio position (seconds) pushed by each wall clock time, to time segments
+            pushed_seconds = []
+            pushed_at = []
+            lock = threading.Lock()
+            done = threading.Event()
+            start = time.perf_counter()
+
+            def audio_pushed_at(seconds):
+                with lock:
+                    index = bisect.bisect_left(pushed_seconds, seconds - 1e-6)
+                    return pushed_at[min(index, len(pushed_at) - 1)] if pushed_at else start
+
+            def recognizing(evt):
+                now = time.perf_counter()
+                session['partials'] += 1
+                if session['first_partial_ms'] is None:
+                    session['first_partial_ms'] = (now - start) * 1000
+                if self.on_partial:
+                    self.on_partial(evt.result.text, dict(evt.result.translations))
+
+            def recognized(evt):
+                now = time.perf_counter()
+                result = evt.result
+                if result.reason != speech_sdk.ResultReason.TranslatedSpeech:
+                    return
+                end = (result.offset + result.duration) / TICKS_PER_SECOND
+                segment = {
+                    'text': result.text,
+                    'translations': dict(result.translations),
+                    'offset_seconds': result.offset / TICKS_PER_SECOND,
+                    'end_seconds': end,
+                    'latency_ms': (now - audio_pushed_at(end)) * 1000,
+                }
+                session['segments'].append(segment)
+                if self.on_final:
+                    self.on_final(segment)
+
+            def canceled(evt):
+                details = evt.cancellation_details
+                if details.reason == speech_sdk.CancellationReason.Error:
+                    session['error'] = details.error_details
+                done.set()
+
+            recognizer.recognizing.connect(recognizing)
+            recognizer.recognized.connect(recognized)
+            recognizer.canceled.connect(canceled)
+            recognizer.session_stopped.connect(lambda evt: done.set())
+            recognizer.start_continuous_recognition_async().get()
+
+            # Push the audio chunk by chunk, then close the stream to end the session
+            frames_per_chunk = max(1, framerate * self.chunk_ms // 1000)
+            sent = 0
+            while True:
+                frames = wav.readframes(frames_per_chunk)
+                if not frames:
+                    break
+                push_stream.write(frames)
+                sent += len(frames) // (sampwidth * nchannels)
+                with lock:
+                    pushed_seconds.append(sent / framerate)
+                    pushed_at.append(time.perf_counter())
+                if self.realtime:
+                    delay = start + sent / framerate - time.perf_counter()
+                    if delay > 0:
+                        time.sleep(delay)
+            push_stream.close()
+
+        if not done.wait(self.timeout):
+            session['error'] = 'Timed out waiting for the translation to finish'
+        recognizer.stop_continuous_recognition_async().get()
+        session['total_ms'] = (time.perf_counter() - start) * 1000
+        return session
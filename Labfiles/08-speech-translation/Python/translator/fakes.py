@@ -0,0 +1,117 @@
+import threading
+from types import SimpleNamespace
+
+import azure.cognitiveservices.speech as speech_sdk
+
+# Local stand-in for a continuous TranslationRecognizer fed through a push stream, so the
+# translation code can be run and measured without a Speech resource.
+# The script is a list of (text, {language: translation}) segments. One more word is
+# "recognized" for every `seconds_per_word` of audio written, firing a `recognizing` event
+# with partial text and partial translations for every language; when a segment's last
+# word arrives, `recognized` fires `final_latency` seconds later. Closing the stream
+# fires `session_stopped` once the pending final results have been delivered.
+
+TICKS_PER_SECOND = 10000000
+
+
+class FakeSignal:
+
+    def __init__(self):
+        self.handlers = []
+
+    def connect(self, handler):
+        self.handlers.append(handler)
+
+    def fire(self, evt):
+        for handler in self.handlers:
+            handler(evt)
+
+
+class FakeFuture:
+
+    def get(self):
+        return None
+
+
+class FakePushStream:
+
+    def __init__(self, recognizer, bytes_per_second):
+        self.recognizer = recognizer
+        self.bytes_per_second = bytes_per_second
+
+    def write(self, data):
+        self.recognizer.receive(len(data) / self.bytes_per_second)
+
+    def close(self):
+        self.recognizer.finish()
+
+
+def prefix(text, fraction):
+    words = text.split()
+    return ' '.join(words[:max(1, round(len(words) * fraction))])
+
+
+class FakeTranslationRecognizer:
+
+    def __init__(self, script, seconds_per_word=0.3, final_latency=0.2):
+        self.script = script
+        self.seconds_per_word = seconds_per_word
+        self.final_latency = final_latency
+        self.seconds = 0.0
+        self.segment = 0
+        self.words = 0
+        self.segment_start = 0.0
+        self.pending = []
+        self.recognizing = FakeSignal()
+        self.recognized = FakeSignal()
+        self.canceled = FakeSignal()
+        self.session_stopped = FakeSignal()
+
+    def start_continuous_recognition_async(self):
+        return FakeFuture()
+
+    def stop_continuous_recognition_async(self):
+        return FakeFuture()
+
+    def result(self, reason, text, translations, end):
+        return SimpleNamespace(result=SimpleNamespace(
+            reason=reason, text=text, translations=translations,
+            offset=int(self.segment_start * TICKS_PER_SECOND),
+            duration=int((end - self.segment_start) * TICKS_PER_SECOND)))
+
+    def receive(self, seconds):
+        self.seconds += seconds
+        while self.segment < len(self.script) and self.seconds + 1e-9 >= self.segment_start + (self.words + 1) * self.seconds_per_word:
+            text, translations = self.script[self.segment]
+            self.words += 1
+            total = len(text.split())
+            end = self.segment_start + self.words * self.seconds_per_word
+            fraction = self.words / total
+            self.recognizing.fire(self.result(
+                speech_sdk.ResultReason.TranslatingSpeech, prefix(text, fraction),
+                {language: prefix(translation, fraction) for language, translation in translations.items()}, end))
+            if self.words == total:
+                self.emit_final(self.result(speech_sdk.ResultReason.TranslatedSpeech, text, dict(translations), end))
+                self.segment += 1
+                self.words = 0
+                self.segment_start = end
+
+    def emit_final(self, evt):
+        timer = threading.Timer(self.final_latency, self.recognized.fire, (evt,))
+        timer.start()
+        self.pending.append(timer)
+
+    def finish(self):
+        def stop():
+            for timer in self.pending:
+                timer.join()
+            self.session_stopped.fire(SimpleNamespace())
+        threading.Thread(target=stop).start()
+
+
+def fake_translator_factory(script, seconds_per_word=0.3, final_latency=0.2):
+    # create() for ContinuousTranslator
+    def create(framerate, sampwidth, nchannels):
+        recognizer = FakeTranslationRecognizer(script, seconds_per_word, final_latency)
+        return FakePushStream(recognizer, framerate * sampwidth * nchannels), recognizer
+    return create
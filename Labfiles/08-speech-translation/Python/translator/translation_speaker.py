@@ -0,0 +1,82 @@
+import os
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from xml.sax.saxutils import escape
+
+import azure.cognitiveservices.speech as speech_sdk
+from playsound import playsound
+
+# Speaks (or saves) the translations of a segment in every target language.
+# All languages are synthesized at the same time into in-memory audio, each on a reusable
+# synthesizer for its voice, and the audio is then played or written in the order of
+# `languages`, so the output order doesn't depend on which synthesis finished first.
+# Time to first audio is measured per language from the start of speak() to when its
+# playback (or file write) starts, so it includes waiting for the languages before it.
+
+
+def play_wav(audio):
+    # Play WAV bytes and return when playback has finished
+    with tempfile.NamedTemporaryFile(suffix='.wav', delete=False) as audio_file:
+        audio_file.write(audio)
+    try:
+        playsound(audio_file.name)
+    finally:
+        os.remove(audio_file.name)
+
+
+class TranslationSpeaker:
+
+    def __init__(self, pool, voices, languages, play=play_wav, output_folder=None):
+        # pool is a SynthesizerPool (in-memory output); voices maps language -> voice name.
+        # With output_folder, audio is written to <folder>/<segment>-<language>.wav instead
+        # of being played.
+        self.pool = pool
+        self.voices = voices
+        self.languages = list(languages)
+        self.play = play
+        self.output_folder = output_folder
+        self.executor = ThreadPoolExecutor(max_workers=len(self.languages), thread_name_prefix='synthesis')
+        self.segments = 0
+        self.first_audio = {language: [] for language in self.languages}
+
+    def synthesize(self, language, text):
+        speak = self.pool.speak(self.voices[language], escape(text))
+        if speak.reason != speech_sdk.ResultReason.SynthesizingAudioCompleted:
+            print(speak.reason)
+            return b''
+        return speak.audio_data
+
+    def speak(self, translations, concurrent=True):
+        # translations: {language: text}. Returns [(language, seconds to first audio)] in output order.
+        start = time.perf_counter()
+        languages = [language for language in self.languages if translations.get(language)]
+        if concurrent:
+            futures = [self.executor.submit(self.synthesize, language, translations[language])
+                       for language in languages]
+            results = (future.result() for future in futures)
+        else:
+            results = (self.synthesize(language, translations[language]) for language in languages)
+
+        timings = []
+        for language, audio in zip(languages, results):
+            if not audio:
+                continue
+            first_audio = time.perf_counter() - start
+            self.first_audio[language].append(first_audio)
+            timings.append((language, first_audio))
+            if self.output_folder:
+                path = os.path.join(self.output_folder, '{:03d}-{}.wav'.format(self.segments, language))
+                with open(path, 'wb') as audio_file:
+                    audio_file.write(audio)
+            elif self.play:
+                self.play(audio)
+        self.segments += 1
+        return timings
+
+    def metrics(self):
+        return {language: sum(values) / len(values) * 1000 if values else 0.0
+                for language, values in self.first_audio.items()}
+
+    def close(self):
+        self.executor.shutdown()
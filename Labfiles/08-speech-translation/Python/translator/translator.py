@@ -1,14 +1,24 @@
 from dotenv import load_dotenv
 from datetime import datetime
 import os
+from concurrent.futures import ThreadPoolExecutor
 
 # Import namespaces
+import azure.cognitiveservices.speech as speech_sdk
+from playsound import playsound
+
+from continuous_translation import ContinuousTranslator
+from synthesizer_pool import SynthesizerPool
+from translation_speaker import TranslationSpeaker
+
+VOICES = {"fr": "fr-FR-HenriNeural", "es": "es-ES-ElviraNeural", "hi": "hi-IN-MadhurNeural"}
 
 
 def main():
     try:
         global speech_config
         global translation_config
+        global speaker
 
         # Get Configuration Settings
         load_dotenv()
@@ -16,19 +26,36 @@ def main():
         ai_region = os.getenv('SPEECH_REGION')
 
         # Configure translation
-
+        translation_config = speech_sdk.translation.SpeechTranslationConfig(ai_key, ai_region)
+        translation_config.speech_recognition_language = 'en-US'
+        translation_config.add_target_language('fr')
+        translation_config.add_target_language('es')
+        translation_config.add_target_language('hi')
+        print('Ready to translate from',translation_config.speech_recognition_language)
 
         # Configure speech
+        speech_config = speech_sdk.SpeechConfig(ai_key, ai_region)
+        speech_config.set_speech_synthesis_output_format(speech_sdk.SpeechSynthesisOutputFormat.Riff24Khz16BitMonoPcm)
 
+        # One reusable synthesizer per voice; every target language is synthesized at once
+        pool = SynthesizerPool(speech_config)
+        for voice in VOICES.values():
+            pool.prewarm(voice)
+        speaker = TranslationSpeaker(pool, VOICES, translation_config.target_languages)
 
         # Get user input
         targetLanguage = ''
         while targetLanguage != 'quit':
-            targetLanguage = input('\nEnter a target language\n fr = French\n es = Spanish\n hi = Hindi\n Enter anything else to stop\n').lower()
+            targetLanguage = input('\nEnter a target language\n fr = French\n es = Spanish\n hi = Hindi\n all = every language at once (continuous)\n Enter anything else to stop\n').lower()
             if targetLanguage in translation_config.target_languages:
                 Translate(targetLanguage)
+            elif targetLanguage == 'all':
+                TranslateContinuous()
             else:
                 targetLanguage = 'quit'
+
+        speaker.close()
+        pool.close()
                 
 
     except Exception as ex:
@@ -38,11 +65,43 @@ def Translate(targetLanguage):
     translation = ''
 
     # Translate speech
-
+    audioFile = os.path.join(os.getcwd(), 'station.wav')
+    playsound(audioFile)
+    audio_config = speech_sdk.AudioConfig(filename=audioFile)
+    translator = speech_sdk.translation.TranslationRecognizer(translation_config, audio_config=audio_config)
+    print("Getting speech from file...")
+    result = translator.recognize_once_async().get()
+    print('Translating "{}"'.format(result.text))
+    translation = result.translations[targetLanguage]
+    print(translation)
 
     # Synthesize translation
+    speaker.speak({targetLanguage: translation})
+
+def TranslateContinuous(audioFile='station.wav'):
+    # One session translates the whole file into every target language, segment by segment
+    # Segments are spoken one after another, without holding up the recognizer's events
+    speaking = ThreadPoolExecutor(max_workers=1)
+
+    def show_partial(text, translations):
+        print('\r... {}'.format(text), end='', flush=True)
+
+    def show_final(segment):
+        print('\r"{}" ({:.0f} ms)'.format(segment['text'], segment['latency_ms']))
+        for language, translation in segment['translations'].items():
+            print('  {}: {}'.format(language, translation))
+        speaking.submit(speaker.speak, segment['translations'])
 
+    translator = ContinuousTranslator(translation_config, on_partial=show_partial, on_final=show_final)
+    print("Getting speech from file...")
+    session = translator.translate_file(os.path.join(os.getcwd(), audioFile))
+    if session['error']:
+        print(session['error'])
+    speaking.shutdown()
+    print('Time to first audio (ms):', speaker.metrics())
+    return session
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    os.chdir(os.path.dirname(os.path.abspath(__file__)))
+    main()